@@ -5,24 +5,88 @@ Extracts word-level timestamps from audio file.
 """
 
 from dataclasses import dataclass
-from typing import List, Optional
-from faster_whisper import WhisperModel
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
 
+from audio_store import ALIGNMENT_SAMPLE_RATE, PCMStore
+from cache import AlignmentCache, LanguageCache, alignment_key
+from cascade import DEFAULT_THRESHOLD, CascadeReport, low_confidence_windows, splice
+from checkpoint import Checkpoint, CheckpointStore, segment_words
+from models import get_model
+from textalign import align_words
+from timings import WordTiming, WordTimings
 
-@dataclass
-class WordTiming:
-    """Single word with timing information."""
-    word: str
-    start: float  # seconds
-    end: float    # seconds
+# Decoding settings per speed profile, like the render --quality presets.
+# "accurate" keeps faster-whisper's defaults: beam search of 5, 5
+# samples per fallback temperature, six temperatures, and conditioning
+# on the previous text.
+SPEED_PROFILES = {
+    "draft": {
+        "beam_size": 1,
+        "best_of": 1,
+        "temperature": 0.0,
+        "condition_on_previous_text": False,
+    },
+    "balanced": {
+        "beam_size": 2,
+        "best_of": 2,
+        "temperature": [0.0, 0.4, 0.8],
+    },
+    "accurate": {},
+}
+
+DEFAULT_SPEED = "accurate"
+
+# Checkpointed segments given to Whisper as context when resuming
+RESUME_PROMPT_SEGMENTS = 3
 
 
 @dataclass 
 class AlignmentResult:
     """Result of audio-text alignment."""
-    words: List[WordTiming]
+    words: WordTimings
     duration: float
     transcript: str
+    from_cache: bool = False
+    cascade: Optional[CascadeReport] = None
+    language: Optional[str] = None
+    resumed_from: float = 0.0  # Where this run took over from a checkpoint (seconds)
+    
+    def to_dict(self) -> dict:
+        """Compact columnar form for caching."""
+        data = {
+            "duration": self.duration,
+            "transcript": self.transcript,
+            "words": self.words.texts(),
+            "starts": self.words.starts.tolist(),
+            "ends": self.words.ends.tolist(),
+        }
+        if self.words.probabilities is not None:
+            data["probabilities"] = [
+                None if p != p else round(p, 4)  # NaN = unknown
+                for p in self.words.probabilities.tolist()
+            ]
+        if self.cascade:
+            data["cascade"] = self.cascade.to_dict()
+        if self.language:
+            data["language"] = self.language
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "AlignmentResult":
+        """Rebuild a result from to_dict() output."""
+        return cls(
+            words=WordTimings.from_lists(
+                data["words"],
+                data["starts"],
+                data["ends"],
+                data.get("probabilities")
+            ),
+            duration=data["duration"],
+            transcript=data["transcript"],
+            cascade=CascadeReport(**data["cascade"]) if data.get("cascade") else None,
+            language=data.get("language")
+        )
 
 
 class AudioAligner:
@@ -35,7 +99,20 @@ class AudioAligner:
         self, 
         model_size: str = "base",
         device: str = "auto",
-        compute_type: str = "auto"
+        compute_type: str = "auto",
+        cache: Optional[AlignmentCache] = None,
+        workers: int = 1,
+        audio_store: Optional[PCMStore] = None,
+        cascade_model: Optional[str] = None,
+        cascade_threshold: float = DEFAULT_THRESHOLD,
+        batch_size: int = 0,
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        speed: str = DEFAULT_SPEED,
+        language: Optional[str] = None,
+        language_cache: Optional[LanguageCache] = None,
+        series: Optional[str] = None,
+        checkpoints: Optional[CheckpointStore] = None
     ):
         """
         Initialize the aligner.
@@ -44,13 +121,110 @@ class AudioAligner:
             model_size: Whisper model size (tiny, base, small, medium, large-v3)
             device: Device to use (auto, cpu, cuda)
             compute_type: Compute type (auto, int8, float16, float32)
+            cache: Optional alignment cache to reuse previous results
+            workers: Transcribe VAD-split chunks in this many processes
+                (1 = single sequential pass)
+            audio_store: Optional decode-once PCM store; Whisper then reads
+                memory-mapped samples instead of decoding the file itself
+            cascade_model: Optional larger model; stretches where the main
+                model's word probabilities fall below cascade_threshold
+                are re-transcribed with it (see cascade.py)
+            cascade_threshold: Word probability below which to escalate
+            batch_size: If > 0, transcribe with faster-whisper's batched
+                pipeline: VAD-split ~30 s pieces decoded this many at a
+                time (throughput mode; ignored when workers > 1)
+            cpu_threads: CTranslate2 threads per model, i.e. per worker
+                process when workers > 1 (0 = its default)
+            num_workers: Model workers for concurrent transcribe calls
+            speed: Decoding profile (draft, balanced, accurate), see
+                SPEED_PROFILES
+            language: Pin the spoken language (e.g. "en") and skip
+                language detection
+            language_cache: Optional per-series language cache; when no
+                language is pinned, the series' language is pinned once
+                known, so detection runs once per series
+            series: Series name for language_cache (default: the folder
+                the audio file is in)
+            checkpoints: Optional checkpoint store; a single-process pass
+                records each finished segment, and a rerun after a crash
+                resumes after the last one
+        
+        The Whisper model is loaded on first use and shared through the
+        process-wide model registry.
         """
-        self.model = WhisperModel(
-            model_size, 
-            device=device,
-            compute_type=compute_type
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.cache = cache
+        self.workers = workers
+        self.audio_store = audio_store
+        self.cascade_model = cascade_model
+        self.cascade_threshold = cascade_threshold
+        self.batch_size = batch_size
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        self.language_cache = language_cache
+        self.series = series
+        self.checkpoints = checkpoints
+        
+        if speed not in SPEED_PROFILES:
+            raise ValueError(
+                f"Unknown speed profile '{speed}' (choose from {', '.join(SPEED_PROFILES)})"
+            )
+        self.speed = speed
+        
+        # Options passed to model.transcribe (also part of the cache key)
+        self.transcribe_options = {
+            "word_timestamps": True,
+            "vad_filter": True,  # Filter out silence
+            **SPEED_PROFILES[speed],
+        }
+        if language:
+            self.transcribe_options["language"] = language
+    
+    @property
+    def model(self):
+        """Whisper model from the shared registry (loaded on first use)."""
+        return get_model(
+            self.model_size, self.device, self.compute_type, **self._load_options()
         )
     
+    def _load_options(self) -> dict:
+        """Non-default WhisperModel thread settings."""
+        options = {}
+        if self.cpu_threads:
+            options["cpu_threads"] = self.cpu_threads
+        if self.num_workers != 1:
+            options["num_workers"] = self.num_workers
+        return options
+    
+    def _series(self, audio_path: str) -> str:
+        """Language cache key: the series name, or the audio file's folder."""
+        return self.series or str(Path(audio_path).resolve().parent)
+    
+    def _options(self, audio_path: str) -> dict:
+        """Transcribe options, with the series' language pinned if known."""
+        if self.language_cache and not self.transcribe_options.get("language"):
+            language = self.language_cache.get(self._series(audio_path))
+            if language:
+                return {**self.transcribe_options, "language": language}
+        return self.transcribe_options
+    
+    def _remember_language(self, audio_path: str, options: dict, language: Optional[str]):
+        """Store a detected language for the series."""
+        if self.language_cache and language and not options.get("language"):
+            self.language_cache.put(self._series(audio_path), language)
+    
+    def _store(self, cache_key: str, audio_path: str, options: dict, result: AlignmentResult):
+        """Cache a fresh result, under the key later runs of its series will use."""
+        if self.language_cache and result.language and not options.get("language"):
+            # Later runs pin the detected language, which decodes the same
+            options = {**options, "language": result.language}
+            cache_key = self.cache.key(
+                audio_path, self.model_size, self._cache_params(options)
+            )
+        self.cache.put(cache_key, result.to_dict())
+    
     def align(
         self, 
         audio_path: str,
@@ -66,31 +240,315 @@ class AudioAligner:
         Returns:
             AlignmentResult with word timings
         """
+        options = self._options(audio_path)
+        key = self._key(audio_path, options)
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached:
+                result = AlignmentResult.from_dict(cached)
+                result.from_cache = True
+                self._remember_language(audio_path, options, result.language)
+                return result
+        
+        result = self._transcribe_all(audio_path, options, key)
+        self._remember_language(audio_path, options, result.language)
+        
+        if self.cache:
+            self._store(key, audio_path, options, result)
+        
+        return result
+    
+    def _key(self, audio_path: str, options: dict) -> Optional[str]:
+        """Alignment key for the cache and checkpoints (None if neither is used)."""
+        if not (self.cache or self.checkpoints):
+            return None
+        return alignment_key(audio_path, self.model_size, self._cache_params(options))
+    
+    def _checkpoint(self, key: Optional[str]) -> Optional[Checkpoint]:
+        return self.checkpoints.open(key) if self.checkpoints and key else None
+    
+    def _transcribe_all(
+        self,
+        audio_path: str,
+        options: dict,
+        key: Optional[str] = None
+    ) -> AlignmentResult:
+        """Full transcription: sequential or parallel pass, then the cascade."""
+        checkpoint = None
+        if self.workers > 1:
+            result = self._transcribe_parallel(audio_path, options)
+        else:
+            checkpoint = self._checkpoint(key)
+            result = self._transcribe(audio_path, options, checkpoint)
+        
+        if self.cascade_model:
+            result = self._escalate(audio_path, result, options)
+        
+        if checkpoint:
+            checkpoint.discard()
+        
+        return result
+    
+    def _cache_params(self, options: dict) -> dict:
+        """Parameters that affect transcription output."""
+        params = {
+            "compute_type": self.compute_type,
+            **options,
+        }
+        if self.cascade_model:
+            params["cascade"] = [self.cascade_model, self.cascade_threshold]
+        if self.batch_size and self.workers <= 1:
+            # Batched decoding splits the audio differently
+            params["batch_size"] = self.batch_size
+        return params
+    
+    def _audio_input(self, audio_path: str):
+        """What to hand to Whisper: the file, or its cached decoded samples."""
+        if self.audio_store:
+            return self.audio_store.decode(audio_path).samples()
+        return audio_path
+    
+    def _samples(self, audio_path: str):
+        """16 kHz mono samples of the audio."""
+        samples = self._audio_input(audio_path)
+        if isinstance(samples, str):
+            from faster_whisper.audio import decode_audio
+            
+            samples = decode_audio(samples, sampling_rate=ALIGNMENT_SAMPLE_RATE)
+        return samples
+    
+    def _run_whisper(self, audio, options: dict):
+        """Start transcription with the sequential or batched pipeline."""
+        if self.batch_size:
+            from faster_whisper import BatchedInferencePipeline
+            
+            return BatchedInferencePipeline(self.model).transcribe(
+                audio,
+                batch_size=self.batch_size,
+                **options
+            )
+        return self.model.transcribe(audio, **options)
+    
+    def _start_whisper(
+        self,
+        audio_path: str,
+        options: dict,
+        checkpoint: Optional[Checkpoint] = None
+    ) -> Tuple[float, Optional[str], float, Iterator[Tuple[str, List[WordTiming]]]]:
+        """
+        Start Whisper after the segments a checkpoint already holds.
+        
+        Each segment Whisper finishes is added to the checkpoint.
+        
+        Returns:
+            (duration, language, resumed from (seconds), iterator of
+            (segment text, words)), checkpointed segments first
+        """
+        header, done = checkpoint.load() if checkpoint else (None, [])
+        offset = done[-1]["end"] if done else 0.0
+        
+        if offset:
+            # Decode what's left in the language already detected, with the
+            # last finished text as context, as if Whisper had carried on
+            audio = self._samples(audio_path)[int(offset * ALIGNMENT_SAMPLE_RATE):]
+            options = {**options, "language": options.get("language") or header["language"]}
+            if options.get("condition_on_previous_text", True):
+                options["initial_prompt"] = " ".join(
+                    segment["text"].strip() for segment in done[-RESUME_PROMPT_SEGMENTS:]
+                )
+        else:
+            audio = self._audio_input(audio_path)
+        
+        segments, info = self._run_whisper(audio, options)
+        if header is None:
+            header = {"duration": info.duration, "language": info.language}
+            if checkpoint:
+                checkpoint.begin(**header)
+        
+        def decoded() -> Iterator[Tuple[str, List[WordTiming]]]:
+            for segment in done:
+                yield segment["text"], segment_words(segment)
+            for segment in segments:
+                words = _segment_words(segment, offset)
+                if checkpoint:
+                    checkpoint.add(segment.text, words, offset + segment.end)
+                yield segment.text, words
+        
+        return header["duration"], header["language"], offset, decoded()
+    
+    def _transcribe(
+        self,
+        audio_path: str,
+        options: dict,
+        checkpoint: Optional[Checkpoint] = None
+    ) -> AlignmentResult:
+        """Run Whisper over the whole file (or what a checkpoint lacks)."""
         # Transcribe with word timestamps
-        segments, info = self.model.transcribe(
-            audio_path,
-            word_timestamps=True,
-            vad_filter=True  # Filter out silence
+        duration, language, resumed_from, segments = self._start_whisper(
+            audio_path, options, checkpoint
         )
         
         words = []
         full_transcript = []
         
-        for segment in segments:
-            full_transcript.append(segment.text)
+        for text, segment_words in segments:
+            full_transcript.append(text)
+            words.extend(segment_words)
+        
+        return AlignmentResult(
+            words=WordTimings.from_words(words),
+            duration=duration,
+            transcript=" ".join(full_transcript),
+            language=language,
+            resumed_from=resumed_from
+        )
+    
+    def stream(self, audio_path: str) -> Tuple[float, Iterator[WordTiming]]:
+        """
+        Get word timings as Whisper decodes them.
+        
+        Words are yielded segment by segment, so callers can start work
+        on early audio while later audio is still being transcribed. A
+        cached result is replayed; a fresh one is cached once the
+        iterator is exhausted.
+        
+        Args:
+            audio_path: Path to audio file
+        
+        Returns:
+            (duration, iterator of WordTiming)
+        """
+        options = self._options(audio_path)
+        key = self._key(audio_path, options)
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached:
+                result = AlignmentResult.from_dict(cached)
+                self._remember_language(audio_path, options, result.language)
+                return result.duration, iter(result.words)
+        
+        if self.workers > 1 or self.cascade_model:
+            # Chunks finish out of order, and escalated stretches are only
+            # known once the first pass is done; only the whole result is usable
+            result = self._transcribe_all(audio_path, options, key)
+            self._remember_language(audio_path, options, result.language)
+            if self.cache:
+                self._store(key, audio_path, options, result)
+            return result.duration, iter(result.words)
+        
+        checkpoint = self._checkpoint(key)
+        duration, language, _, segments = self._start_whisper(
+            audio_path, options, checkpoint
+        )
+        
+        def words() -> Iterator[WordTiming]:
+            collected = []
+            texts = []
+            for text, segment_words in segments:
+                texts.append(text)
+                for word in segment_words:
+                    collected.append(word)
+                    yield word
+            
+            self._remember_language(audio_path, options, language)
+            if self.cache:
+                self._store(key, audio_path, options, AlignmentResult(
+                    words=WordTimings.from_words(collected),
+                    duration=duration,
+                    transcript=" ".join(texts),
+                    language=language
+                ))
+            if checkpoint:
+                checkpoint.discard()
+        
+        return duration, words()
+    
+    def _transcribe_parallel(self, audio_path: str, options: dict) -> AlignmentResult:
+        """Run Whisper over VAD-split chunks in a process pool."""
+        from parallel import transcribe_parallel
+        
+        texts, raw_words, duration, language = transcribe_parallel(
+            self._audio_input(audio_path),
+            self.model_size,
+            self.device,
+            self.compute_type,
+            options,
+            self.workers,
+            self.cpu_threads
+        )
+        
+        return AlignmentResult(
+            words=WordTimings.from_lists(*zip(*raw_words)) if raw_words else WordTimings.empty(),
+            duration=duration,
+            transcript=" ".join(texts),
+            language=language
+        )
+    
+    def _escalate(
+        self,
+        audio_path: str,
+        result: AlignmentResult,
+        options: dict
+    ) -> AlignmentResult:
+        """
+        Re-transcribe low-confidence stretches with the cascade model.
+        
+        Each window is cut out of the 16 kHz samples and transcribed on
+        its own, with the language pinned so short windows aren't
+        misdetected; its words replace the first pass's words there.
+        """
+        report = CascadeReport(
+            model=self.cascade_model,
+            threshold=self.cascade_threshold,
+            duration=result.duration
+        )
+        windows = low_confidence_windows(
+            result.words, result.duration, self.cascade_threshold
+        )
+        result.cascade = report
+        if not windows:
+            return result
+        
+        samples = self._samples(audio_path)
+        
+        options = dict(options)
+        if not options.get("language"):
+            language = result.language
+            if not language:
+                language, _, _ = self.model.detect_language(
+                    samples, vad_filter=options.get("vad_filter", False)
+                )
+            options["language"] = language
+        
+        model = get_model(
+            self.cascade_model, self.device, self.compute_type, **self._load_options()
+        )
+        replacements = []
+        for first, last, start, end in windows:
+            segments, _ = model.transcribe(
+                samples[int(start * ALIGNMENT_SAMPLE_RATE):int(end * ALIGNMENT_SAMPLE_RATE)],
+                **options
+            )
+            # Whisper may end a clip's last word past the clip; keep the
+            # words inside the window so they stay in order when spliced
+            words = WordTimings.from_words(
+                word for segment in segments for word in _segment_words(segment)
+            ).shifted(start).clipped(start, end)
+            replacements.append(words)
             
-            if segment.words:
-                for word_info in segment.words:
-                    words.append(WordTiming(
-                        word=word_info.word.strip(),
-                        start=word_info.start,
-                        end=word_info.end
-                    ))
+            if len(words):
+                report.windows += 1
+                report.escalated_seconds += end - start
+                report.words_replaced += last - first
+                report.words_inserted += len(words)
         
+        words = splice(result.words, windows, replacements)
         return AlignmentResult(
             words=words,
-            duration=info.duration,
-            transcript=" ".join(full_transcript)
+            duration=result.duration,
+            transcript=" ".join(words.texts()),
+            cascade=report,
+            language=result.language
         )
     
     def align_with_transcript(
@@ -114,32 +572,124 @@ class AudioAligner:
         # Get Whisper's word timings
         result = self.align(audio_path)
         
-        # If transcript provided, try to align words
-        if transcript:
-            transcript_words = transcript.split()
-            whisper_words = [w.word for w in result.words]
-            
-            # Simple alignment: use Whisper timings if word counts match roughly
-            # TODO: Implement fuzzy matching for better alignment
-            if abs(len(transcript_words) - len(whisper_words)) <= len(transcript_words) * 0.1:
-                # Close enough, use transcript words with Whisper timings
-                aligned_words = []
-                for i, timing in enumerate(result.words):
-                    if i < len(transcript_words):
-                        aligned_words.append(WordTiming(
-                            word=transcript_words[i],
-                            start=timing.start,
-                            end=timing.end
-                        ))
-                
-                return AlignmentResult(
-                    words=aligned_words,
-                    duration=result.duration,
-                    transcript=transcript
-                )
+        transcript_words = transcript.split() if transcript else []
+        if not transcript_words or not result.words:
+            # Nothing to map onto, fall back to Whisper's transcription
+            return result
         
-        # Fall back to Whisper's transcription
-        return result
+        pairs = align_words(transcript_words, result.words.texts())
+        
+        return AlignmentResult(
+            words=transfer_timings(
+                transcript_words, result.words, pairs, result.duration
+            ),
+            duration=result.duration,
+            transcript=transcript,
+            from_cache=result.from_cache,
+            cascade=result.cascade,
+            language=result.language,
+            resumed_from=result.resumed_from
+        )
+
+
+def _segment_words(segment, offset: float = 0.0) -> List[WordTiming]:
+    """Word timings of one faster-whisper segment (shifted by offset seconds)."""
+    return [
+        WordTiming(
+            word=word_info.word.strip(),
+            start=word_info.start + offset,
+            end=word_info.end + offset,
+            probability=word_info.probability
+        )
+        for word_info in segment.words or []
+    ]
+
+
+# Seconds allotted per word when a run of unmatched words has no room
+MIN_WORD_DURATION = 0.1
+
+
+def transfer_timings(
+    transcript_words: List[str],
+    whisper_words: WordTimings,
+    pairs: List[Optional[int]],
+    duration: float
+) -> WordTimings:
+    """
+    Put Whisper timings onto transcript words.
+    
+    Paired words take their Whisper word's timing. Runs of unpaired words
+    share the gap between their paired neighbours, split by word length.
+    When that gap is too short, the run also shares the preceding
+    word's time.
+    
+    Args:
+        transcript_words: Words of the known transcript
+        whisper_words: Whisper word timings
+        pairs: For each transcript word, the paired Whisper index or None
+        duration: Audio duration (bounds trailing words)
+    
+    Returns:
+        One timing per transcript word (probabilities carried over from
+        paired words)
+    """
+    starts = whisper_words.starts.tolist()
+    ends = whisper_words.ends.tolist()
+    spans: List[Optional[List[float]]] = [
+        [starts[j], ends[j]] if j is not None else None
+        for j in pairs
+    ]
+    
+    n = len(spans)
+    i = 0
+    while i < n:
+        if spans[i] is not None:
+            i += 1
+            continue
+        
+        # Run of unpaired words [i, k)
+        k = i
+        while k < n and spans[k] is None:
+            k += 1
+        count = k - i
+        
+        left = spans[i - 1][1] if i > 0 else None
+        right = spans[k][0] if k < n else None
+        if left is None and right is None:
+            left, right = 0.0, duration
+        elif left is None:
+            left = max(0.0, right - MIN_WORD_DURATION * 3 * count)
+        elif right is None:
+            right = min(duration, left + MIN_WORD_DURATION * 3 * count)
+            right = max(right, left)
+        
+        first = i
+        if right - left < MIN_WORD_DURATION * count and i > 0:
+            # Borrow time from the preceding word
+            first = i - 1
+            left = spans[first][0]
+        
+        weights = [max(1, len(transcript_words[t])) for t in range(first, k)]
+        total = sum(weights)
+        t0 = left
+        for t, weight in zip(range(first, k), weights):
+            t1 = t0 + (right - left) * weight / total
+            spans[t] = [t0, t1]
+            t0 = t1
+        
+        i = k
+    
+    probabilities = None
+    if whisper_words.probabilities is not None:
+        probs = whisper_words.probabilities.tolist()
+        probabilities = [probs[j] if j is not None else None for j in pairs]
+    
+    return WordTimings.from_lists(
+        transcript_words,
+        [span[0] for span in spans],
+        [span[1] for span in spans],
+        probabilities
+    )
 
 
 def get_aligner(model_size: str = "base") -> AudioAligner:
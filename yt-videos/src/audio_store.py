@@ -0,0 +1,316 @@
+"""
+Decode-Once PCM Audio Store
+
+Decodes each input file once with FFmpeg into 16 kHz mono float32 raw
+PCM for Whisper, exposed as a read-only memory-mapped NumPy array
+(pages are loaded on demand, so multi-hour inputs don't need to fit in
+memory).
+
+A PCM WAV at the original rate and channel layout is only written when
+something has to cut the samples themselves (silence compression); it
+is several times the size of the alignment track.
+
+Encoded audio for the final video is kept separately (AudioTrackStore):
+inputs that are already in the output codec are copied as they are,
+others are encoded once from the source and the track is stream-copied
+into every render of that audio.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from cache import default_cache_dir, evict_lru, file_digest
+
+ALIGNMENT_SAMPLE_RATE = 16000
+
+# Containers whose audio stream can be copied into an MP4 as it is
+PASSTHROUGH_FORMATS = {"mov,mp4,m4a,3gp,3g2,mj2", "aac"}
+
+
+@dataclass
+class DecodedAudio:
+    """Cached decoded track of one source file."""
+    source: str
+    alignment_path: str   # Raw float32 mono at 16 kHz
+    duration: float
+
+    def samples(self):
+        """16 kHz mono samples as a read-only memory-mapped float32 array."""
+        import numpy as np
+
+        return np.memmap(self.alignment_path, dtype=np.float32, mode="r")
+
+
+class PCMStore:
+    """
+    Cache of decoded audio tracks.
+
+    Entries are keyed by source path, size and modification time, so an
+    unchanged file is never decoded twice. The least recently used
+    entries are dropped once the store grows past max_size_mb.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_size_mb: float = 10240
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir() / "pcm"
+        self.max_size_mb = max_size_mb
+
+    def _key(self, audio_path: str) -> str:
+        st = os.stat(audio_path)
+        spec = f"{Path(audio_path).resolve()}|{st.st_size}|{st.st_mtime_ns}"
+        return hashlib.sha256(spec.encode("utf-8")).hexdigest()[:32]
+
+    def decode(self, audio_path: str) -> DecodedAudio:
+        """
+        Get the decoded alignment track for a file, decoding it if needed.
+
+        Args:
+            audio_path: Source audio (any format FFmpeg reads)
+
+        Returns:
+            DecodedAudio with the path to the cached track
+        """
+        entry = self.cache_dir / self._key(audio_path)
+
+        if (entry / "meta.json").exists():
+            # Mark as recently used
+            os.utime(entry)
+        else:
+            self._decode(audio_path, entry)
+
+        meta = json.loads((entry / "meta.json").read_text(encoding="utf-8"))
+        return DecodedAudio(
+            source=audio_path,
+            alignment_path=str(entry / "alignment.f32"),
+            duration=meta["duration"]
+        )
+
+    def playback(self, audio_path: str) -> str:
+        """
+        PCM WAV of a file at its original rate and channels, decoding it
+        into the file's entry on first use.
+
+        Args:
+            audio_path: Source audio (any format FFmpeg reads)
+
+        Returns:
+            Path to the cached 16-bit WAV
+        """
+        entry = self.cache_dir / self._key(audio_path)
+        path = entry / "playback.wav"
+        if path.exists():
+            os.utime(entry)
+            return str(path)
+
+        self.decode(audio_path)
+        fd, tmp = tempfile.mkstemp(dir=entry, prefix=".playback_", suffix=".wav")
+        os.close(fd)
+        try:
+            cmd = [
+                "ffmpeg",
+                "-y",
+                "-v", "error",
+                "-i", audio_path,
+                "-map", "0:a:0",
+                "-c:a", "pcm_s16le",
+                "-rf64", "auto",  # Allow > 4 GB
+                "-f", "wav",
+                tmp
+            ]
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"FFmpeg decode failed:\n{result.stderr[-2000:]}")
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+        self._evict()
+        return str(path)
+
+    def _decode(self, audio_path: str, entry: Path):
+        """Decode the alignment track into a new entry."""
+        if not shutil.which("ffmpeg"):
+            raise RuntimeError("FFmpeg not found; it is needed to decode audio.")
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(dir=self.cache_dir, prefix=".decode_"))
+        try:
+            alignment_path = tmp_dir / "alignment.f32"
+
+            cmd = [
+                "ffmpeg",
+                "-y",
+                "-v", "error",
+                "-i", audio_path,
+                "-map", "0:a:0",
+                "-ac", "1",
+                "-ar", str(ALIGNMENT_SAMPLE_RATE),
+                "-f", "f32le",
+                str(alignment_path),
+            ]
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"FFmpeg decode failed:\n{result.stderr[-2000:]}")
+
+            # float32 = 4 bytes per sample
+            duration = alignment_path.stat().st_size / 4 / ALIGNMENT_SAMPLE_RATE
+            (tmp_dir / "meta.json").write_text(
+                json.dumps({"source": audio_path, "duration": duration}),
+                encoding="utf-8"
+            )
+
+            try:
+                os.replace(tmp_dir, entry)
+            except OSError:
+                # Another process decoded the same file first
+                if not (entry / "meta.json").exists():
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self._evict()
+
+    def _evict(self):
+        evict_lru(
+            self.cache_dir,
+            "[0-9a-f]*",
+            max_bytes=self.max_size_mb * 1024 * 1024
+        )
+
+
+def probe_audio(audio_path: str) -> Optional[dict]:
+    """
+    Container and first audio stream of a file, via ffprobe.
+
+    Returns:
+        Dict with format_name, codec_name, sample_rate, channels and
+        bit_rate, or None if ffprobe is missing or can't read the file
+    """
+    if not shutil.which("ffprobe"):
+        return None
+
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v", "error",
+            "-select_streams", "a:0",
+            "-show_entries", "format=format_name:stream=codec_name,sample_rate,channels,bit_rate",
+            "-of", "json",
+            audio_path
+        ],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        return None
+    try:
+        data = json.loads(result.stdout)
+        stream = data["streams"][0]
+    except (ValueError, KeyError, IndexError):
+        return None
+
+    info = dict(stream)
+    info["format_name"] = data.get("format", {}).get("format_name")
+    return info
+
+
+class AudioTrackStore:
+    """
+    Encoded audio tracks for muxing into renders by stream copy.
+
+    An input whose first audio stream already uses the output codec in
+    an MP4-compatible container is used as it is. Anything else is
+    encoded once into a cache entry keyed by the input's content, codec
+    and bitrate, so later renders of the same recording (other formats,
+    colors, qualities) copy the track instead of encoding it again.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_size_mb: float = 2048
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir() / "tracks"
+        self.max_size_mb = max_size_mb
+
+    @staticmethod
+    def can_copy(audio_path: str, codec: str) -> bool:
+        """Whether the file's audio can be copied into an MP4 as codec."""
+        info = probe_audio(audio_path)
+        return bool(
+            info
+            and info.get("codec_name") == codec
+            and info.get("format_name") in PASSTHROUGH_FORMATS
+        )
+
+    def key(self, audio_path: str, codec: str, bitrate: str) -> str:
+        """Cache key from the input's content and the encoder settings."""
+        spec = f"{file_digest(audio_path)}|{codec}|{bitrate}"
+        return hashlib.sha256(spec.encode("utf-8")).hexdigest()[:32]
+
+    def track(self, audio_path: str, codec: str = "aac", bitrate: str = "192k") -> str:
+        """
+        Get a track to stream-copy into a render, encoding it if needed.
+
+        Args:
+            audio_path: Source audio (any format FFmpeg reads)
+            codec: Output audio codec (FFmpeg encoder name)
+            bitrate: Output bitrate (used when encoding)
+
+        Returns:
+            Path to the source itself or to the cached encoded track
+        """
+        if self.can_copy(audio_path, codec):
+            return audio_path
+
+        path = self.cache_dir / f"{self.key(audio_path, codec, bitrate)}.m4a"
+        if path.exists():
+            # Mark as recently used
+            os.utime(path)
+            return str(path)
+
+        self._encode(audio_path, path, codec, bitrate)
+        evict_lru(
+            self.cache_dir,
+            "*.m4a",
+            max_bytes=self.max_size_mb * 1024 * 1024
+        )
+        return str(path)
+
+    def _encode(self, audio_path: str, path: Path, codec: str, bitrate: str):
+        """Encode the first audio stream into path (atomically)."""
+        if not shutil.which("ffmpeg"):
+            raise RuntimeError("FFmpeg not found; it is needed to encode audio.")
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix=".encode_", suffix=".m4a")
+        os.close(fd)
+        try:
+            cmd = [
+                "ffmpeg",
+                "-y",
+                "-v", "error",
+                "-i", audio_path,
+                "-map", "0:a:0",
+                "-c:a", codec,
+                "-b:a", bitrate,
+                tmp
+            ]
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"FFmpeg audio encode failed:\n{result.stderr[-2000:]}")
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
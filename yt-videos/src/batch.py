@@ -0,0 +1,465 @@
+"""
+Batch Video Generation
+
+Runs many audio files through alignment and rendering in one process,
+so Whisper models are loaded once and FFmpeg renders overlap with
+transcription of the next files.
+
+Jobs come from a directory of audio files or a CSV/JSONL manifest with
+columns: audio, transcript, format, quality, color, output (plus
+optional font_size and model).
+"""
+
+import csv
+import json
+import shutil
+import tempfile
+import time
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from aligner import AlignmentResult, AudioAligner
+from audio_store import AudioTrackStore, PCMStore
+from cache import AlignmentCache
+from governor import RENDER_MEMORY_MB, ResourceGovernor, model_memory_mb
+from renderer import QUALITY_PRESETS, VideoFormat, VideoRenderer, create_render_config
+from silence import compress_silences, trim_audio
+from subtitle import SubtitleGenerator, create_subtitle_config
+
+AUDIO_EXTENSIONS = {".mp3", ".wav", ".m4a", ".aac", ".flac", ".ogg", ".opus"}
+
+# AudioAligner options that change the word timings, and so the output
+# (thread and worker counts only change how fast they are found)
+TIMING_OPTIONS = (
+    "speed",
+    "language",
+    "series",
+    "compute_type",
+    "batch_size",
+    "cascade_model",
+    "cascade_threshold",
+)
+
+
+@dataclass
+class BatchJob:
+    """One audio file to turn into a video."""
+    audio: str
+    output: str
+    transcript: Optional[str] = None
+    format: str = "short"
+    quality: str = "medium"
+    color: str = "yellow"
+    font_size: Optional[int] = None
+    model: str = "base"
+
+
+@dataclass
+class JobResult:
+    """Outcome of one batch job."""
+    audio: str
+    output: str
+    status: str                 # ok, skipped, failed
+    words: int = 0
+    duration: float = 0.0
+    align_seconds: float = 0.0
+    render_seconds: float = 0.0
+    total_seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def load_manifest(path: str, defaults: Optional[dict] = None) -> List[BatchJob]:
+    """
+    Read jobs from a CSV or JSONL manifest.
+
+    Relative paths are resolved against the manifest's directory. Empty
+    cells fall back to the given defaults.
+
+    Args:
+        path: Manifest file (.csv, .jsonl or .json lines)
+        defaults: Default values for missing columns
+
+    Returns:
+        List of BatchJob
+    """
+    manifest = Path(path)
+    base = manifest.parent
+
+    if manifest.suffix.lower() == ".csv":
+        with open(manifest, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    else:
+        rows = [
+            json.loads(line)
+            for line in manifest.read_text(encoding="utf-8").splitlines()
+            if line.strip()
+        ]
+
+    known = {f.name for f in fields(BatchJob)}
+    jobs = []
+    for number, row in enumerate(rows, start=1):
+        values = dict(defaults or {})
+        values.update({
+            k: v for k, v in row.items()
+            if k in known and v not in (None, "")
+        })
+        if "audio" not in values:
+            raise ValueError(f"{path}: row {number} has no 'audio'")
+
+        audio = base / values["audio"]
+        values["audio"] = str(audio)
+        values["output"] = str(base / values.get("output", audio.with_suffix(".mp4").name))
+        if values.get("transcript"):
+            values["transcript"] = str(base / values["transcript"])
+        if values.get("font_size") is not None:
+            try:
+                values["font_size"] = int(values["font_size"])
+            except (TypeError, ValueError):
+                raise ValueError(
+                    f"{path}: row {number} has font_size {values['font_size']!r}, "
+                    "expected a whole number"
+                )
+        for name, choices in (
+            ("format", [f.value for f in VideoFormat]),
+            ("quality", list(QUALITY_PRESETS)),
+        ):
+            if name in values and values[name] not in choices:
+                raise ValueError(
+                    f"{path}: row {number} has {name} {values[name]!r}, "
+                    f"expected one of {', '.join(choices)}"
+                )
+
+        jobs.append(BatchJob(**values))
+
+    return jobs
+
+
+def jobs_from_directory(
+    directory: str,
+    output_dir: Optional[str] = None,
+    defaults: Optional[dict] = None
+) -> List[BatchJob]:
+    """
+    One job per audio file in a directory.
+
+    A transcript named like the audio file (<name>.txt) is picked up
+    automatically. Outputs are <output_dir>/<name>.mp4.
+    """
+    source = Path(directory)
+    target = Path(output_dir) if output_dir else source
+
+    jobs = []
+    for audio in sorted(source.iterdir()):
+        if audio.suffix.lower() not in AUDIO_EXTENSIONS:
+            continue
+        transcript = audio.with_suffix(".txt")
+        jobs.append(BatchJob(
+            audio=str(audio),
+            output=str(target / f"{audio.stem}.mp4"),
+            transcript=str(transcript) if transcript.exists() else None,
+            **(defaults or {})
+        ))
+    return jobs
+
+
+def settings_path(job: BatchJob) -> Path:
+    """Sidecar recording the settings an output was rendered with."""
+    return Path(job.output).with_suffix(".job.json")
+
+
+def job_settings(job: BatchJob, **options) -> dict:
+    """Everything that shapes a job's output: its fields plus runner options."""
+    settings = asdict(job)
+    settings.update(options)
+    return settings
+
+
+def is_up_to_date(job: BatchJob, settings: Optional[dict] = None) -> bool:
+    """
+    True if the output exists, is newer than its inputs and was rendered
+    with the same settings (as recorded in its .job.json sidecar).
+    """
+    output = Path(job.output)
+    if not output.exists():
+        return False
+    try:
+        recorded = json.loads(settings_path(job).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    if recorded != json.loads(json.dumps(settings or job_settings(job))):
+        return False
+    built = output.stat().st_mtime
+    inputs = [job.audio] + ([job.transcript] if job.transcript else [])
+    return all(
+        Path(p).exists() and Path(p).stat().st_mtime <= built for p in inputs
+    )
+
+
+class BatchRunner:
+    """
+    Runs batch jobs with bounded alignment and render pools.
+
+    Alignment runs in its own pool (one aligner per model size, so each
+    model is loaded once). Each aligned job is handed to the render
+    pool, so FFmpeg encodes overlap with transcription of later files.
+    """
+
+    def __init__(
+        self,
+        align_workers: int = 1,
+        render_workers: int = 2,
+        cache: Optional[AlignmentCache] = None,
+        audio_store: Optional[PCMStore] = None,
+        audio_tracks: Optional[AudioTrackStore] = None,
+        aligner_options: Optional[dict] = None,
+        governor: Optional[ResourceGovernor] = None,
+        vfr: bool = False,
+        compress_silence: Optional[float] = None,
+        force: bool = False,
+        on_result: Optional[Callable[[JobResult], None]] = None
+    ):
+        """
+        Args:
+            align_workers: Concurrent Whisper transcriptions
+            render_workers: Concurrent FFmpeg renders
+            cache: Optional alignment cache
+            audio_store: Optional PCM store so each input is decoded once
+            audio_tracks: Optional track store so each input's audio is
+                encoded once (or copied) for all of its renders
+            aligner_options: Extra AudioAligner arguments (speed,
+                language, language_cache, series, checkpoints,
+                compute_type, batch_size, cpu_threads, num_workers)
+            governor: Optional resource governor; cores are split between
+                the alignment and render pools, and each job waits for
+                its lease (shared with other governed processes)
+            vfr: Render with a variable frame rate
+            compress_silence: Shorten pauses longer than this many seconds
+                to that length; the edit list is written next to each
+                output as .edits.json
+            force: Re-render outputs that are already up to date
+            on_result: Called as each job finishes
+        """
+        self.align_workers = align_workers
+        self.render_workers = render_workers
+        self.cache = cache
+        self.audio_store = audio_store
+        self.audio_tracks = audio_tracks
+        self.aligner_options = dict(aligner_options or {})
+        self.governor = governor
+        self.vfr = vfr
+        self.compress_silence = compress_silence
+        self.force = force
+        self.on_result = on_result
+        self._aligners: Dict[str, AudioAligner] = {}
+
+        # Fixed thread counts per job, so each model is loaded only once
+        self.align_threads = self.render_threads = 0
+        if governor:
+            self.align_threads, self.render_threads = governor.split(
+                align_workers, render_workers
+            )
+            if not self.aligner_options.get("cpu_threads"):
+                self.aligner_options["cpu_threads"] = self.align_threads
+            self.align_threads = self.aligner_options["cpu_threads"]
+
+    @contextmanager
+    def _lease(self, kind: str, cores: int, memory_mb: int):
+        """Governor lease for one job (None when not governed)."""
+        if not self.governor:
+            yield None
+            return
+        with self.governor.lease(kind, cores, memory_mb) as lease:
+            yield lease
+
+    def _settings(self, job: BatchJob) -> dict:
+        timing = {
+            name: self.aligner_options[name]
+            for name in TIMING_OPTIONS
+            if name in self.aligner_options
+        }
+        return job_settings(
+            job, vfr=self.vfr, compress_silence=self.compress_silence, **timing
+        )
+
+    def _aligner(self, model: str) -> AudioAligner:
+        if model not in self._aligners:
+            self._aligners[model] = AudioAligner(
+                model_size=model,
+                cache=self.cache,
+                audio_store=self.audio_store,
+                **self.aligner_options
+            )
+        return self._aligners[model]
+
+    def run(self, jobs: List[BatchJob]) -> List[JobResult]:
+        """
+        Run all jobs.
+
+        Returns:
+            One JobResult per job, in input order
+        """
+        work_dir = Path(tempfile.mkdtemp(prefix="ytvideo_batch_"))
+        results: List[Optional[JobResult]] = [None] * len(jobs)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.align_workers) as align_pool, \
+                    ThreadPoolExecutor(max_workers=self.render_workers) as render_pool:
+                render_futures: List[Future] = []
+
+                align_futures = []
+                for index, job in enumerate(jobs):
+                    if not self.force and is_up_to_date(job, self._settings(job)):
+                        self._finish(results, index, JobResult(
+                            audio=job.audio, output=job.output, status="skipped"
+                        ))
+                        continue
+                    align_futures.append((index, job, time.perf_counter(),
+                                          align_pool.submit(self._align, job)))
+
+                for index, job, started, future in align_futures:
+                    try:
+                        result, align_seconds = future.result()
+                    except Exception as e:
+                        self._finish(results, index, self._failed(job, e, started))
+                        continue
+
+                    render_futures.append(render_pool.submit(
+                        self._render, results, index, job, result,
+                        align_seconds, started, work_dir
+                    ))
+
+                for future in render_futures:
+                    future.result()
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        return results
+
+    def _align(self, job: BatchJob):
+        start = time.perf_counter()
+        aligner = self._aligner(job.model)
+        memory = model_memory_mb(job.model, aligner.compute_type)
+        with self._lease("align", self.align_threads, memory):
+            if job.transcript:
+                transcript = Path(job.transcript).read_text().strip()
+                result = aligner.align_with_transcript(job.audio, transcript)
+            else:
+                result = aligner.align(job.audio)
+        return result, time.perf_counter() - start
+
+    def _render(
+        self,
+        results: List[Optional[JobResult]],
+        index: int,
+        job: BatchJob,
+        alignment: AlignmentResult,
+        align_seconds: float,
+        started: float,
+        work_dir: Path
+    ):
+        try:
+            start = time.perf_counter()
+            subtitle_path = work_dir / f"job_{index:05d}.ass"
+
+            audio_path = job.audio
+            if self.compress_silence:
+                # Shorten long pauses in both the timings and the audio
+                words, edits = compress_silences(
+                    alignment.words, alignment.duration, self.compress_silence
+                )
+                store = self.audio_store or PCMStore(str(work_dir / "pcm"))
+                audio_path = trim_audio(
+                    store.playback(job.audio),
+                    edits,
+                    str(work_dir / f"job_{index:05d}.wav")
+                )
+                Path(job.output).parent.mkdir(parents=True, exist_ok=True)
+                edits.save(str(Path(job.output).with_suffix(".edits.json")))
+                alignment = replace(alignment, words=words, duration=edits.duration)
+
+            sub_config = create_subtitle_config(
+                format=job.format,
+                font_size=job.font_size,
+                highlight_color=job.color
+            )
+            generator = SubtitleGenerator(sub_config)
+            generator.generate(alignment.words, str(subtitle_path))
+
+            Path(job.output).parent.mkdir(parents=True, exist_ok=True)
+            config = create_render_config(job.format, job.quality, self.vfr)
+
+            with self._lease("render", self.render_threads, RENDER_MEMORY_MB) as lease:
+                if lease:
+                    config = replace(config, threads=lease.cores)
+                renderer = VideoRenderer(config, audio_tracks=self.audio_tracks)
+                renderer.render(
+                    audio_path=audio_path,
+                    subtitle_path=str(subtitle_path),
+                    output_path=job.output,
+                    duration=alignment.duration,
+                    timeline=generator.timeline(alignment.words) if self.vfr else None
+                )
+            settings_path(job).write_text(json.dumps(self._settings(job)), encoding="utf-8")
+
+            now = time.perf_counter()
+            self._finish(results, index, JobResult(
+                audio=job.audio,
+                output=job.output,
+                status="ok",
+                words=len(alignment.words),
+                duration=alignment.duration,
+                align_seconds=round(align_seconds, 3),
+                render_seconds=round(now - start, 3),
+                total_seconds=round(now - started, 3)
+            ))
+        except Exception as e:
+            result = self._failed(job, e, started)
+            result.align_seconds = round(align_seconds, 3)
+            self._finish(results, index, result)
+
+    def _failed(self, job: BatchJob, error: Exception, started: float) -> JobResult:
+        return JobResult(
+            audio=job.audio,
+            output=job.output,
+            status="failed",
+            total_seconds=round(time.perf_counter() - started, 3),
+            error="".join(traceback.format_exception_only(type(error), error)).strip()
+        )
+
+    def _finish(self, results: List[Optional[JobResult]], index: int, result: JobResult):
+        results[index] = result
+        if self.on_result:
+            self.on_result(result)
+
+
+def write_summary(results: List[JobResult], path: str) -> str:
+    """
+    Write per-job results as JSON (or CSV if path ends in .csv).
+
+    Returns:
+        Path to the summary file
+    """
+    rows = [asdict(r) for r in results]
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    if target.suffix.lower() == ".csv":
+        with open(target, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=[f.name for f in fields(JobResult)])
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        summary = {
+            "jobs": rows,
+            "totals": {
+                status: sum(1 for r in results if r.status == status)
+                for status in ("ok", "skipped", "failed")
+            },
+        }
+        target.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+    return str(target)
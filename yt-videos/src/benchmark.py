@@ -0,0 +1,621 @@
+#!/usr/bin/env python3
+"""
+Offline Benchmark Suite
+
+Measures throughput and real-time factor of each pipeline stage on a
+synthetic corpus, so it runs anywhere FFmpeg does (no microphone, TTS
+or Whisper weights needed):
+
+- subtitles: SubtitleGenerator on 100 to 100k synthetic word timings
+- decode: PCMStore decode of FFmpeg lavfi sine/noise audio
+- align / align_transcript: AudioAligner plumbing with a stub model
+  (no inference), with and without transcript matching
+- render: VideoRenderer per format and quality preset
+- whisper (optional, needs model weights and a speech recording):
+  real-time factor of each transcription speed profile and of batched
+  inference, with the share of words each run agrees on
+
+Results can be saved as a baseline; later runs fail when a stage gets
+slower than the baseline by more than a threshold.
+
+Usage:
+    python src/benchmark.py --save-baseline
+    python src/benchmark.py                       # compare to baseline
+    python src/benchmark.py --preset full --threshold 0.15
+    python src/benchmark.py --stages whisper --whisper-audio talk.mp3 --compute-type int8
+"""
+
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, List, Optional
+
+import click
+import numpy as np
+
+from aligner import DEFAULT_SPEED, SPEED_PROFILES, AudioAligner
+from audio_store import ALIGNMENT_SAMPLE_RATE, PCMStore
+from cache import default_cache_dir
+from models import get_registry
+from renderer import VideoRenderer, create_render_config
+from subtitle import SubtitleGenerator, create_subtitle_config
+from textalign import align_words
+from timings import WordTimings
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent.parent / "benchmarks" / "baseline.json"
+
+# Model size under which the stub model is registered
+STUB_MODEL = "benchmark-stub"
+
+# Average speaking rate of the synthetic corpus
+WORDS_PER_SECOND = 2.5
+
+# Slowdowns smaller than this are timer noise, whatever the ratio
+MIN_REGRESSION_SECONDS = 0.05
+
+PRESETS = {
+    "quick": {
+        "sizes": [100, 1000, 10000, 100000],
+        "align_minutes": [1, 10],
+        "render_minutes": [1],
+        "formats": ["short"],
+        "qualities": ["fast"],
+    },
+    "full": {
+        "sizes": [100, 1000, 10000, 100000],
+        "align_minutes": [1, 10, 60],
+        "render_minutes": [1, 10, 60],
+        "formats": ["short", "long"],
+        "qualities": ["fast", "medium", "high"],
+    },
+}
+
+VOCABULARY = [
+    "the", "best", "part", "is", "no", "part.", "we", "build", "videos",
+    "from", "audio,", "word", "by", "word", "and", "every", "line", "counts.",
+]
+
+
+@dataclass
+class BenchResult:
+    """Best-of-N timing of one stage on one input."""
+    stage: str
+    case: str
+    seconds: float
+    units: float    # Amount of work: words, or seconds of audio
+    unit: str       # "words" or "audio_seconds"
+    agreement: Optional[float] = None  # Share of reference words reproduced (whisper)
+
+    @property
+    def key(self) -> str:
+        return f"{self.stage}/{self.case}"
+
+    @property
+    def throughput(self) -> float:
+        """Units per wall-clock second."""
+        return self.units / self.seconds if self.seconds else float("inf")
+
+    @property
+    def real_time_factor(self) -> Optional[float]:
+        """Wall seconds per audio second (audio stages only)."""
+        if self.unit != "audio_seconds":
+            return None
+        return self.seconds / self.units
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["throughput"] = round(self.throughput, 3)
+        rtf = self.real_time_factor
+        data["real_time_factor"] = None if rtf is None else round(rtf, 5)
+        return data
+
+
+# Synthetic corpus
+
+def synthetic_words(count: int, seed: int = 0) -> WordTimings:
+    """
+    Word timings that look like speech: 0.12-0.5 s words, mostly short
+    gaps, with occasional sentence pauses.
+    """
+    rng = np.random.default_rng(seed)
+    durations = rng.uniform(0.12, 0.5, count)
+    gaps = rng.choice(
+        [0.03, 0.06, 0.1, 0.25, 0.7, 1.2],
+        size=count,
+        p=[0.35, 0.3, 0.15, 0.1, 0.06, 0.04]
+    )
+    starts = np.cumsum(gaps) + np.concatenate([[0.0], np.cumsum(durations)[:-1]])
+    starts = np.round(starts, 3)
+    ends = np.round(starts + durations, 3)
+    words = [VOCABULARY[i] for i in rng.integers(0, len(VOCABULARY), count)]
+    return WordTimings.from_lists(words, starts, ends)
+
+
+def words_for_duration(seconds: float, seed: int = 0) -> WordTimings:
+    """Synthetic words filling about the given length of audio."""
+    words = synthetic_words(max(1, int(seconds * WORDS_PER_SECOND)), seed)
+    return words.between(0.0, seconds)
+
+
+def synthetic_audio(seconds: float, kind: str, corpus_dir: Path) -> str:
+    """
+    Generate (or reuse) a 44.1 kHz mono WAV with FFmpeg's lavfi sources.
+
+    Args:
+        seconds: Length
+        kind: "sine" (220 Hz tone) or "noise" (pink noise)
+        corpus_dir: Where generated files are kept between runs
+
+    Returns:
+        Path to the file
+    """
+    sources = {
+        "sine": f"sine=frequency=220:sample_rate=44100:duration={seconds}",
+        "noise": f"anoisesrc=color=pink:sample_rate=44100:amplitude=0.1:duration={seconds}",
+    }
+    path = corpus_dir / f"{kind}_{seconds:g}s.wav"
+    if not path.exists():
+        corpus_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp.wav")
+        subprocess.run(
+            ["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", sources[kind],
+             "-ac", "1", "-c:a", "pcm_s16le", str(tmp)],
+            check=True
+        )
+        os.replace(tmp, path)
+    return str(path)
+
+
+class StubWhisperModel:
+    """
+    Stands in for faster_whisper.WhisperModel without running inference.
+
+    Emits synthetic words over the audio length in ~10 s segments, so
+    benchmarks measure everything around Whisper: audio loading, word
+    conversion, transcript matching and caching.
+    """
+
+    def __init__(self, store: PCMStore, seed: int = 0):
+        """
+        Args:
+            store: PCM store for audio passed by path (keep it in the
+                benchmark's work directory, not the user cache)
+            seed: Seed for the synthetic words
+        """
+        self.store = store
+        self.seed = seed
+
+    def transcribe(self, audio, **options):
+        if isinstance(audio, str):
+            samples = self.store.decode(audio).samples()
+        else:
+            samples = audio
+        duration = len(samples) / ALIGNMENT_SAMPLE_RATE
+        words = words_for_duration(duration, self.seed)
+
+        def segments():
+            starts = words.starts
+            for first in range(0, len(words), 25):
+                chunk = words[first:first + 25]
+                yield SimpleNamespace(
+                    text=" ".join(chunk.texts()),
+                    start=float(starts[first]),
+                    end=float(chunk.ends[-1]),
+                    words=[
+                        SimpleNamespace(
+                            word=" " + w.word,
+                            start=w.start,
+                            end=w.end,
+                            probability=0.9
+                        )
+                        for w in chunk
+                    ]
+                )
+
+        info = SimpleNamespace(duration=duration, language="en", language_probability=1.0)
+        return segments(), info
+
+
+# Stages
+
+def _best_of(repeat: int, run: Callable[[], None], setup: Optional[Callable[[], None]] = None) -> float:
+    """Minimum wall time over repeat runs (setup is not timed)."""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_subtitles(sizes: List[int], work_dir: Path, repeat: int) -> List[BenchResult]:
+    """SubtitleGenerator.generate on synthetic word sets."""
+    results = []
+    generator = SubtitleGenerator(create_subtitle_config("short"))
+    for size in sizes:
+        words = synthetic_words(size)
+        path = str(work_dir / f"bench_{size}.ass")
+        seconds = _best_of(repeat, lambda: generator.generate(words, path))
+        results.append(BenchResult("subtitles", f"{size} words", seconds, size, "words"))
+    return results
+
+
+def bench_align(
+    minutes: List[float],
+    kind: str,
+    corpus_dir: Path,
+    work_dir: Path,
+    repeat: int
+) -> List[BenchResult]:
+    """Audio decode and stub-model alignment plumbing."""
+    get_registry().register(StubWhisperModel(PCMStore(str(work_dir / "pcm_stub"))), STUB_MODEL)
+    results = []
+
+    for length in minutes:
+        seconds = length * 60
+        audio = synthetic_audio(seconds, kind, corpus_dir)
+        case = f"{kind} {length:g} min"
+        store_dir = work_dir / f"pcm_{length:g}"
+
+        def clear_store():
+            shutil.rmtree(store_dir, ignore_errors=True)
+
+        store = PCMStore(str(store_dir))
+        decode = _best_of(repeat, lambda: store.decode(audio), setup=clear_store)
+        results.append(BenchResult("decode", case, decode, seconds, "audio_seconds"))
+
+        aligner = AudioAligner(model_size=STUB_MODEL, audio_store=store)
+        align = _best_of(repeat, lambda: aligner.align(audio))
+        results.append(BenchResult("align", case, align, seconds, "audio_seconds"))
+
+        # Script with a few edits, so matching isn't a trivial diagonal
+        script = words_for_duration(seconds).texts()
+        del script[::50]
+        transcript = " ".join(script)
+        matched = _best_of(repeat, lambda: aligner.align_with_transcript(audio, transcript))
+        results.append(BenchResult("align_transcript", case, matched, seconds, "audio_seconds"))
+
+    return results
+
+
+def bench_render(
+    minutes: List[float],
+    formats: List[str],
+    qualities: List[str],
+    kind: str,
+    corpus_dir: Path,
+    work_dir: Path,
+    repeat: int
+) -> List[BenchResult]:
+    """VideoRenderer.render per length, format and quality preset."""
+    results = []
+    store = PCMStore(str(work_dir / "pcm_render"))
+
+    for length in minutes:
+        seconds = length * 60
+        audio = synthetic_audio(seconds, kind, corpus_dir)
+        duration = store.decode(audio).duration
+        words = words_for_duration(seconds)
+
+        for format in formats:
+            subtitle_path = str(work_dir / f"render_{format}_{length:g}.ass")
+            SubtitleGenerator(create_subtitle_config(format)).generate(words, subtitle_path)
+
+            for quality in qualities:
+                renderer = VideoRenderer(create_render_config(format, quality))
+                output = str(work_dir / f"render_{format}_{quality}.mp4")
+                elapsed = _best_of(repeat, lambda: renderer.render(
+                    audio, subtitle_path, output, duration=duration
+                ))
+                results.append(BenchResult(
+                    "render", f"{format}/{quality} {length:g} min",
+                    elapsed, seconds, "audio_seconds"
+                ))
+
+    return results
+
+
+def bench_whisper(
+    audio: str,
+    model_size: str,
+    compute_type: str,
+    speeds: List[str],
+    batch_sizes: List[int],
+    language: Optional[str],
+    cpu_threads: int,
+    work_dir: Path,
+    repeat: int
+) -> List[BenchResult]:
+    """
+    Real Whisper transcription per speed profile and batch size.
+
+    Every speed profile runs on the sequential path, then each batch
+    size with the default profile. The model is loaded before timing.
+    Each run is compared word by word with the default profile's
+    sequential transcript.
+    """
+    store = PCMStore(str(work_dir / "pcm_whisper"))
+    duration = store.decode(audio).duration
+    cases = [(DEFAULT_SPEED, 0)]
+    cases += [(speed, 0) for speed in speeds if speed != DEFAULT_SPEED]
+    cases += [(DEFAULT_SPEED, batch_size) for batch_size in batch_sizes]
+
+    results = []
+    reference = None
+    for speed, batch_size in cases:
+        aligner = AudioAligner(
+            model_size=model_size,
+            compute_type=compute_type,
+            audio_store=store,
+            speed=speed,
+            language=language,
+            batch_size=batch_size,
+            cpu_threads=cpu_threads
+        )
+        aligner.model
+        runs = []
+        seconds = _best_of(repeat, lambda: runs.append(aligner.align(audio)))
+        words = runs[-1].words.texts()
+
+        agreement = None
+        if reference is None:
+            reference = words
+        elif reference:
+            pairs = align_words(reference, words)
+            agreement = sum(p is not None for p in pairs) / len(reference)
+
+        case = f"{model_size}/{compute_type} {speed}"
+        if batch_size:
+            case += f" batched {batch_size}"
+        results.append(BenchResult(
+            "whisper", case, seconds, duration, "audio_seconds", agreement
+        ))
+
+    return results
+
+
+# Baselines
+
+def machine_info() -> dict:
+    return {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_baseline(results: List[BenchResult], path: Path):
+    """Write results as the new baseline."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": machine_info(),
+        "results": {r.key: r.to_dict() for r in results},
+    }
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+def compare(
+    results: List[BenchResult],
+    baseline: dict,
+    threshold: float
+) -> List[dict]:
+    """
+    Stages slower than baseline by more than threshold (a fraction).
+
+    Returns:
+        One dict per regression: key, baseline and current seconds, ratio
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get("results", {}).get(result.key)
+        if not base:
+            continue
+        ratio = result.seconds / base["seconds"] if base["seconds"] else float("inf")
+        slower_by = result.seconds - base["seconds"]
+        if ratio > 1 + threshold and slower_by > MIN_REGRESSION_SECONDS:
+            regressions.append({
+                "key": result.key,
+                "baseline_seconds": base["seconds"],
+                "seconds": result.seconds,
+                "ratio": round(ratio, 3),
+            })
+    return regressions
+
+
+def _number_list(cast):
+    def parse(ctx, param, value):
+        if value is None:
+            return None
+        try:
+            return [cast(v) for v in value.split(",") if v.strip()]
+        except ValueError:
+            raise click.BadParameter("expected a comma-separated list of numbers")
+    return parse
+
+
+def _name_list(ctx, param, value):
+    return None if value is None else [v.strip() for v in value.split(",") if v.strip()]
+
+
+@click.command()
+@click.option(
+    '--preset',
+    type=click.Choice(sorted(PRESETS)),
+    default='quick',
+    help='Input sizes to run (quick: ~1 min, full: long renders)'
+)
+@click.option('--sizes', callback=_number_list(int), help='Word counts for subtitles, e.g. 100,10000')
+@click.option('--align-minutes', callback=_number_list(float), help='Audio lengths for decode/align')
+@click.option('--render-minutes', callback=_number_list(float), help='Audio lengths for render')
+@click.option('--formats', callback=_name_list, help='Render formats, e.g. short,long')
+@click.option('--qualities', callback=_name_list, help='Render presets, e.g. fast,high')
+@click.option(
+    '--stages',
+    callback=_name_list,
+    default='subtitles,align,render',
+    help='Stages to run'
+)
+@click.option(
+    '--audio',
+    type=click.Choice(['sine', 'noise']),
+    default='noise',
+    help='Synthetic audio source'
+)
+@click.option('--whisper-audio', type=click.Path(exists=True), help='Speech recording for the whisper stage')
+@click.option('--whisper-model', default='base', help='Model for the whisper stage')
+@click.option(
+    '--compute-type',
+    default='int8',
+    help='Whisper compute type for the whisper stage'
+)
+@click.option(
+    '--speeds',
+    callback=_name_list,
+    default=','.join(SPEED_PROFILES),
+    help='Speed profiles for the whisper stage'
+)
+@click.option(
+    '--batch-sizes',
+    callback=_number_list(int),
+    default='8,16',
+    help='Batch sizes compared with the sequential path'
+)
+@click.option('--language', default=None, help='Pin the whisper stage language (e.g. en)')
+@click.option('--cpu-threads', type=click.IntRange(min=0), default=0, help='Whisper CPU threads')
+@click.option('--repeat', type=click.IntRange(min=1), default=3, help='Runs per case (best is kept)')
+@click.option(
+    '--baseline',
+    type=click.Path(dir_okay=False),
+    default=str(DEFAULT_BASELINE),
+    help='Baseline file'
+)
+@click.option('--save-baseline', is_flag=True, help='Store these results as the baseline')
+@click.option(
+    '--threshold',
+    type=float,
+    default=0.25,
+    help='Allowed slowdown vs baseline (0.25 = 25%)'
+)
+@click.option(
+    '--output',
+    type=click.Path(dir_okay=False),
+    default=None,
+    help='Also write results to this JSON file'
+)
+def main(
+    preset: str,
+    sizes: Optional[List[int]],
+    align_minutes: Optional[List[float]],
+    render_minutes: Optional[List[float]],
+    formats: Optional[List[str]],
+    qualities: Optional[List[str]],
+    stages: List[str],
+    audio: str,
+    whisper_audio: Optional[str],
+    whisper_model: str,
+    compute_type: str,
+    speeds: List[str],
+    batch_sizes: List[int],
+    language: Optional[str],
+    cpu_threads: int,
+    repeat: int,
+    baseline: str,
+    save_baseline: bool,
+    threshold: float,
+    output: Optional[str]
+):
+    """Run the offline benchmarks and check them against a baseline."""
+    if "whisper" in stages and not whisper_audio:
+        raise click.UsageError("the whisper stage needs --whisper-audio")
+    unknown = set(speeds) - set(SPEED_PROFILES)
+    if unknown:
+        raise click.UsageError(f"unknown speed profiles: {', '.join(sorted(unknown))}")
+
+    plan = dict(PRESETS[preset])
+    for name, value in [
+        ("sizes", sizes), ("align_minutes", align_minutes),
+        ("render_minutes", render_minutes), ("formats", formats),
+        ("qualities", qualities),
+    ]:
+        if value:
+            plan[name] = value
+
+    corpus_dir = default_cache_dir() / "bench"
+    work_dir = Path(tempfile.mkdtemp(prefix="ytvideo_bench_"))
+    results: List[BenchResult] = []
+
+    def report(new: List[BenchResult]):
+        for r in new:
+            rtf = r.real_time_factor
+            speed = f"RTF {rtf:.4f}" if rtf is not None else f"{r.throughput:,.0f} words/s"
+            if r.agreement is not None:
+                speed += f"   agreement {r.agreement:.1%}"
+            click.echo(f"   {r.key:<40} {r.seconds:9.3f}s   {speed}")
+        results.extend(new)
+
+    try:
+        click.echo(f"Benchmark ({preset}, best of {repeat})")
+        if "subtitles" in stages:
+            report(bench_subtitles(plan["sizes"], work_dir, repeat))
+        if "align" in stages:
+            report(bench_align(plan["align_minutes"], audio, corpus_dir, work_dir, repeat))
+        if "render" in stages:
+            report(bench_render(
+                plan["render_minutes"], plan["formats"], plan["qualities"],
+                audio, corpus_dir, work_dir, repeat
+            ))
+        if "whisper" in stages:
+            report(bench_whisper(
+                whisper_audio, whisper_model, compute_type, speeds,
+                batch_sizes, language, cpu_threads, work_dir, repeat
+            ))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if output:
+        Path(output).write_text(json.dumps({
+            "machine": machine_info(),
+            "results": [r.to_dict() for r in results],
+        }, indent=2), encoding="utf-8")
+
+    baseline_path = Path(baseline)
+    if save_baseline:
+        write_baseline(results, baseline_path)
+        click.echo(f"\n📌 Baseline saved: {baseline_path}")
+        return
+
+    if not baseline_path.exists():
+        click.echo(f"\nNo baseline at {baseline_path} (run with --save-baseline)")
+        return
+
+    stored = json.loads(baseline_path.read_text(encoding="utf-8"))
+    if stored.get("machine", {}).get("cpu_count") != os.cpu_count():
+        click.echo("⚠️  Baseline was recorded on a different machine; timings may not compare")
+
+    regressions = compare(results, stored, threshold)
+    if regressions:
+        click.echo(f"\n❌ {len(regressions)} regression(s) over {threshold:.0%}:", err=True)
+        for r in regressions:
+            click.echo(
+                f"   {r['key']}: {r['baseline_seconds']:.3f}s -> {r['seconds']:.3f}s "
+                f"(x{r['ratio']:.2f})",
+                err=True
+            )
+        sys.exit(1)
+
+    click.echo(f"\n✅ No regressions over {threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+On-Disk Caches
+
+Content-addressed caches so re-rendering the same recording skips work
+that has been done before: the Whisper pass (keyed by audio content
+hash, model size and transcription parameters) and encoded video
+segments (keyed by their subtitles and encoder settings). The spoken
+language is also remembered per series, so Whisper's language detection
+runs once per series rather than once per file.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+
+
+def default_cache_dir() -> Path:
+    """Base cache directory (respects $YTV_CACHE_DIR and $XDG_CACHE_HOME)."""
+    if os.environ.get("YTV_CACHE_DIR"):
+        return Path(os.environ["YTV_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "yt-videos"
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """Write a file atomically (temp file + rename)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def evict_lru(
+    directory: Path,
+    pattern: str,
+    max_bytes: float,
+    max_age_seconds: Optional[float] = None
+):
+    """
+    Trim cache entries matching pattern in directory.
+
+    Entries are files or directories of files. Those older than
+    max_age_seconds (by mtime) are removed, then the least recently used
+    until the total size fits max_bytes. Readers should touch entries
+    they use so mtime tracks last use.
+    """
+    if not directory.exists():
+        return
+
+    def remove(path: Path):
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            path.unlink(missing_ok=True)
+
+    now = time.time()
+    entries = []
+    for path in directory.glob(pattern):
+        try:
+            st = path.stat()
+            size = (
+                sum(f.stat().st_size for f in path.iterdir())
+                if path.is_dir() else st.st_size
+            )
+        except OSError:
+            continue
+        if max_age_seconds is not None and now - st.st_mtime > max_age_seconds:
+            remove(path)
+        else:
+            entries.append((st.st_mtime, size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        remove(path)
+        total -= size
+
+
+def alignment_key(audio_path: str, model_size: str, params: Optional[dict] = None) -> str:
+    """
+    Identify an alignment by everything that determines its words.
+
+    Args:
+        audio_path: Audio file (hashed by content, not path)
+        model_size: Whisper model size
+        params: Transcription parameters that affect the result
+
+    Returns:
+        Hex digest identifying the alignment
+    """
+    spec = json.dumps(
+        {
+            "audio": file_digest(audio_path),
+            "model": model_size,
+            "params": params or {},
+        },
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(spec.encode("utf-8")).hexdigest()
+
+
+class AlignmentCache:
+    """
+    Persistent cache of alignment results.
+
+    Entries are gzipped JSON with columnar word data. Entries older than
+    max_age_days are dropped, and the least recently used entries are
+    dropped once the cache grows past max_size_mb.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_size_mb: float = 500,
+        max_age_days: float = 30
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir() / "alignments"
+        self.max_size_mb = max_size_mb
+        self.max_age_days = max_age_days
+
+    def key(self, audio_path: str, model_size: str, params: Optional[dict] = None) -> str:
+        """Build a cache key (see alignment_key)."""
+        return alignment_key(audio_path, model_size, params)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json.gz"
+
+    def get(self, key: str) -> Optional[dict]:
+        """Load a cached entry, or None if missing/expired/corrupt."""
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.max_age_days * 86400:
+                path.unlink()
+                return None
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Mark as recently used (the entry may have just been evicted by
+        # another process; the data is already read)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: dict):
+        """Store an entry and evict old ones."""
+        payload = gzip.compress(
+            json.dumps(data, separators=(",", ":")).encode("utf-8")
+        )
+        atomic_write_bytes(self._path(key), payload)
+        self.evict()
+
+    def evict(self):
+        """Drop expired entries, then LRU entries above the size budget."""
+        evict_lru(
+            self.cache_dir,
+            "*.json.gz",
+            max_bytes=self.max_size_mb * 1024 * 1024,
+            max_age_seconds=self.max_age_days * 86400
+        )
+
+    def clear(self):
+        """Remove all entries."""
+        for path in self.cache_dir.glob("*.json.gz"):
+            path.unlink(missing_ok=True)
+
+
+class SegmentCache:
+    """
+    Persistent cache of encoded video-only segments.
+
+    A segment is identified by everything that determines its pixels:
+    the ASS slice it burns (events and styles), the render settings and
+    the time range it covers. Unchanged stretches of a re-rendered
+    video are then copied from the cache instead of encoded again.
+    Every store trims the cache back to its size budget.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_size_mb: float = 2048,
+        max_age_days: float = 30
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir() / "segments"
+        self.max_size_mb = max_size_mb
+        self.max_age_days = max_age_days
+
+    def key(self, subtitle_path: str, config, start: float, end: float) -> str:
+        """
+        Build a cache key.
+
+        Args:
+            subtitle_path: ASS slice of the segment
+            config: RenderConfig the segment is encoded with
+            start: Segment start in the full timeline (seconds)
+            end: Segment end (seconds)
+
+        Returns:
+            Hex digest identifying the segment
+        """
+        settings = asdict(config)
+        # Thread count changes the encoder's work split, not the picture
+        settings.pop("threads", None)
+        spec = json.dumps(
+            {
+                "subtitles": file_digest(subtitle_path),
+                "config": settings,
+                "range": [round(start, 6), round(end, 6)],
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(spec.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.mp4"
+
+    def get(self, key: str) -> Optional[str]:
+        """Path of a cached segment, or None if missing/expired."""
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.max_age_days * 86400:
+                path.unlink()
+                return None
+            # Mark as recently used
+            os.utime(path)
+        except OSError:
+            return None
+        return str(path)
+
+    def put(self, key: str, segment_path: str) -> str:
+        """
+        Store a rendered segment (the file is moved into the cache),
+        then evict down to the size budget.
+
+        Returns:
+            Path of the cached segment
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp_", suffix=".mp4")
+        os.close(fd)
+        try:
+            shutil.move(segment_path, tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        self.evict()
+        return str(path)
+
+    def evict(self):
+        """Drop expired entries, then LRU entries above the size budget."""
+        evict_lru(
+            self.cache_dir,
+            "*.mp4",
+            max_bytes=self.max_size_mb * 1024 * 1024,
+            max_age_seconds=self.max_age_days * 86400
+        )
+
+    def clear(self):
+        """Remove all entries."""
+        for path in self.cache_dir.glob("*.mp4"):
+            path.unlink(missing_ok=True)
+
+
+class LanguageCache:
+    """
+    Spoken language per series of recordings.
+
+    A series is any name that groups recordings in one language (a
+    show, a channel); by default the aligner uses the folder an audio
+    file lives in. Entries are kept in a single small JSON file.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else default_cache_dir() / "languages.json"
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self, series: str) -> Optional[str]:
+        """Language code of a series, or None if not known yet."""
+        return self._load().get(series)
+
+    def put(self, series: str, language: str):
+        """Remember the language of a series."""
+        with self._lock:
+            data = self._load()
+            if data.get(series) == language:
+                return
+            data[series] = language
+            atomic_write_bytes(
+                self.path,
+                json.dumps(data, indent=2, sort_keys=True).encode("utf-8")
+            )
+
+    def clear(self):
+        """Forget all series."""
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,141 @@
+"""
+Confidence Cascade
+
+Transcribe with a small model, then re-transcribe only the stretches
+where it was unsure with a larger one. Words the small model decoded
+with a probability below a threshold are grouped into windows (with
+some context on either side, cut in the gaps between words), the larger
+model transcribes just those windows, and its words replace the small
+model's words inside them.
+"""
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from timings import WordTimings
+
+# Words below this probability are re-transcribed
+DEFAULT_THRESHOLD = 0.5
+
+# Context kept around unsure words so the larger model sees whole phrases (seconds)
+CONTEXT_SECONDS = 1.5
+
+# Windows closer than this are merged into one (seconds)
+MERGE_GAP_SECONDS = 2.0
+
+
+@dataclass
+class CascadeReport:
+    """How much of a recording was escalated to the larger model."""
+    model: str
+    threshold: float
+    windows: int = 0
+    escalated_seconds: float = 0.0
+    duration: float = 0.0
+    words_replaced: int = 0     # Small-model words inside the windows
+    words_inserted: int = 0     # Larger-model words that took their place
+
+    @property
+    def escalated_fraction(self) -> float:
+        return self.escalated_seconds / self.duration if self.duration else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "model": self.model,
+            "threshold": self.threshold,
+            "windows": self.windows,
+            "escalated_seconds": round(self.escalated_seconds, 3),
+            "duration": self.duration,
+            "words_replaced": self.words_replaced,
+            "words_inserted": self.words_inserted,
+        }
+
+
+def low_confidence_windows(
+    words: WordTimings,
+    duration: float,
+    threshold: float = DEFAULT_THRESHOLD,
+    context: float = CONTEXT_SECONDS,
+    merge_gap: float = MERGE_GAP_SECONDS
+) -> List[Tuple[int, int, float, float]]:
+    """
+    Find stretches around words decoded with low probability.
+
+    Words without a probability count as confident. Each unsure word is
+    widened by context seconds, overlapping or nearby windows are
+    merged, and each window is grown to whole words with its edges in
+    the middle of the gaps next to them.
+
+    Args:
+        words: First-pass word timings (with probabilities)
+        duration: Audio duration in seconds
+        threshold: Words below this probability are escalated
+        context: Seconds of context on each side
+        merge_gap: Merge windows separated by less than this
+
+    Returns:
+        (first word, end word (exclusive), start, end) per window
+    """
+    if words.probabilities is None or not len(words):
+        return []
+
+    # NaN (unknown) compares False, so it never escalates
+    unsure = np.flatnonzero(words.probabilities < threshold)
+    if not len(unsure):
+        return []
+
+    starts, ends = words.starts, words.ends
+    lo = np.maximum(starts[unsure] - context, 0.0)
+    hi = np.minimum(ends[unsure] + context, duration)
+
+    # Merge: a new window begins where the gap to everything before it is large
+    reach = np.maximum.accumulate(hi)
+    begins = np.flatnonzero(np.r_[True, lo[1:] - reach[:-1] >= merge_gap])
+    finishes = np.r_[begins[1:] - 1, len(unsure) - 1]
+
+    windows = []
+    for lo_t, hi_t in zip(lo[begins].tolist(), reach[finishes].tolist()):
+        # Whole words overlapping the window
+        first, last = words.range_indices(lo_t, hi_t)
+        if windows and first < windows[-1][1]:
+            first = windows[-1][1]
+        if first >= last:
+            continue
+
+        start = (ends[first - 1] + starts[first]) / 2 if first > 0 else 0.0
+        end = (ends[last - 1] + starts[last]) / 2 if last < len(words) else duration
+        windows.append((first, last, float(start), float(max(end, ends[last - 1]))))
+
+    return windows
+
+
+def splice(
+    words: WordTimings,
+    windows: List[Tuple[int, int, float, float]],
+    replacements: List[WordTimings]
+) -> WordTimings:
+    """
+    Replace the words of each window with the re-transcribed words.
+
+    A window whose replacement is empty keeps its original words.
+
+    Args:
+        words: First-pass word timings
+        windows: From low_confidence_windows
+        replacements: Words per window, in absolute time
+
+    Returns:
+        Combined word timings, in order
+    """
+    parts = []
+    position = 0
+    for (first, last, _, _), replacement in zip(windows, replacements):
+        if not len(replacement):
+            continue
+        parts.append(words[position:first])
+        parts.append(replacement)
+        position = last
+    parts.append(words[position:])
+    return WordTimings.concat([part for part in parts if len(part)])
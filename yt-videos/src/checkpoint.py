@@ -0,0 +1,112 @@
+"""
+Transcription Checkpoints
+
+A long Whisper pass writes the words of each finished segment to a
+checkpoint file as it goes. If the run crashes or is killed, a rerun on
+the same audio with the same settings reads those segments back and
+transcribes only the audio after the last one, instead of starting
+over. The checkpoint is deleted once the alignment completes.
+
+Files are JSON lines under the cache directory: a header with the
+duration and language, then one line per segment. A line cut short by
+the crash is dropped on load.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from cache import default_cache_dir, evict_lru
+from timings import WordTiming
+
+# Checkpoints of runs that were never resumed are dropped after this long
+CHECKPOINT_MAX_AGE_DAYS = 7
+
+
+class Checkpoint:
+    """Finished segments of one transcription in progress."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def load(self) -> Tuple[Optional[dict], List[dict]]:
+        """
+        Read the checkpoint back.
+
+        Returns:
+            (header, segments) with header None if there is no usable
+            checkpoint; segments have text, words and end
+        """
+        try:
+            data = self.path.read_bytes()
+        except OSError:
+            return None, []
+
+        # Drop a line the crash cut short, so appends start on a fresh line
+        complete = data[:data.rfind(b"\n") + 1]
+        if len(complete) < len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(len(complete))
+
+        try:
+            lines = [json.loads(line) for line in complete.splitlines()]
+        except ValueError:
+            self.discard()
+            return None, []
+        if not lines or "duration" not in lines[0]:
+            return None, []
+        return lines[0], lines[1:]
+
+    def begin(self, duration: float, language: Optional[str]):
+        """Start a new checkpoint."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"duration": duration, "language": language}) + "\n")
+
+    def add(self, text: str, words: List[WordTiming], end: float):
+        """Record a finished segment (in absolute time)."""
+        line = json.dumps({
+            "text": text,
+            "words": [[w.word, w.start, w.end, w.probability] for w in words],
+            "end": end,
+        }, separators=(",", ":"))
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def discard(self):
+        """Delete the checkpoint (the alignment is complete)."""
+        self.path.unlink(missing_ok=True)
+
+
+def segment_words(segment: dict) -> List[WordTiming]:
+    """Word timings of a checkpointed segment."""
+    return [WordTiming(*word) for word in segment["words"]]
+
+
+class CheckpointStore:
+    """Directory of transcription checkpoints, keyed like the alignment cache."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_age_days: float = CHECKPOINT_MAX_AGE_DAYS
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir() / "checkpoints"
+        self.max_age_days = max_age_days
+
+    def open(self, key: str) -> Checkpoint:
+        """Checkpoint for an alignment key (see cache.alignment_key)."""
+        self.evict()
+        return Checkpoint(self.cache_dir / f"{key}.jsonl")
+
+    def evict(self):
+        """Drop checkpoints that are too old to be resumed."""
+        evict_lru(
+            self.cache_dir,
+            "*.jsonl",
+            max_bytes=float("inf"),
+            max_age_seconds=self.max_age_days * 86400
+        )
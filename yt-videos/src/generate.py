@@ -9,13 +9,29 @@ Usage:
 """
 
 import click
+from contextlib import contextmanager
+from dataclasses import replace
 from pathlib import Path
 import tempfile
 import shutil
+import time
 
-from aligner import AudioAligner, WordTiming
+from aligner import DEFAULT_SPEED, SPEED_PROFILES, AudioAligner, WordTiming
+from audio_store import AudioTrackStore, PCMStore
+from cache import AlignmentCache, LanguageCache, SegmentCache
+from cascade import DEFAULT_THRESHOLD
+from checkpoint import CheckpointStore
+from governor import RENDER_MAX_THREADS, RENDER_MEMORY_MB, ResourceGovernor, model_memory_mb
+from models import get_registry
+from profiling import Profiler
+from silence import compress_silences, trim_audio
+from snapshot import SnapshotRenderer
 from subtitle import SubtitleGenerator, create_subtitle_config
-from renderer import VideoRenderer, create_render_config
+from renderer import RenderProgress, RenderVariant, VideoRenderer, create_render_config
+from pipeline import (
+    STREAM_RENDER_WORKERS, render_incremental, render_segmented, render_streaming
+)
+from batch import BatchRunner, JobResult, jobs_from_directory, load_manifest, write_summary
 
 
 @click.command()
@@ -64,11 +80,132 @@ from renderer import VideoRenderer, create_render_config
     default='base',
     help='Whisper model size (larger = more accurate, slower)'
 )
+@click.option(
+    '--workers', '-w',
+    type=click.IntRange(min=1),
+    default=1,
+    help='Transcribe silence-split chunks in parallel processes'
+)
+@click.option(
+    '--speed',
+    type=click.Choice(list(SPEED_PROFILES)),
+    default=DEFAULT_SPEED,
+    help='Transcription speed profile (draft decodes greedily, accurate keeps faster-whisper defaults)'
+)
+@click.option(
+    '--language',
+    default=None,
+    help='Spoken language code, e.g. en (default: detect once per series)'
+)
+@click.option(
+    '--series',
+    default=None,
+    help="Series name whose language is remembered (default: the audio file's folder)"
+)
+@click.option(
+    '--compute-type',
+    type=click.Choice(['auto', 'int8', 'int8_float32', 'float16', 'float32']),
+    default='auto',
+    help='Whisper weight precision (int8 is fastest on CPU)'
+)
+@click.option(
+    '--batch-size',
+    type=click.IntRange(min=0),
+    default=0,
+    help='Batched Whisper inference with this many pieces at once (0 = off)'
+)
+@click.option(
+    '--cpu-threads',
+    type=click.IntRange(min=0),
+    default=0,
+    help='Whisper CPU threads (0 = library default)'
+)
+@click.option(
+    '--model-workers',
+    type=click.IntRange(min=1),
+    default=1,
+    help='Whisper model workers (parallel transcribe calls, e.g. batch jobs)'
+)
+@click.option(
+    '--cascade',
+    type=click.Choice(['small', 'medium', 'large-v3']),
+    default=None,
+    help='Re-transcribe low-confidence stretches with this larger model'
+)
+@click.option(
+    '--cascade-threshold',
+    type=click.FloatRange(0.0, 1.0),
+    default=DEFAULT_THRESHOLD,
+    show_default=True,
+    help='Word probability below which --cascade escalates'
+)
+@click.option(
+    '--compress-silence',
+    type=click.FloatRange(min=0.1),
+    default=None,
+    metavar='SECONDS',
+    help='Shorten pauses longer than this to this length (writes <output>.edits.json)'
+)
+@click.option(
+    '--stream',
+    is_flag=True,
+    help='Render finished segments while Whisper is still transcribing'
+)
+@click.option(
+    '--vfr',
+    is_flag=True,
+    help='Variable frame rate: only encode frames where the subtitles change'
+)
+@click.option(
+    '--render-workers',
+    type=click.IntRange(min=1),
+    default=1,
+    help='Render N segments in parallel FFmpeg processes (constant frame rate)'
+)
+@click.option(
+    '--proxy',
+    is_flag=True,
+    help='Fast low-resolution review render (quarter size, 10 fps)'
+)
+@click.option(
+    '--incremental',
+    is_flag=True,
+    help='Reuse unchanged segments of earlier renders; only re-encode edited ones'
+)
+@click.option(
+    '--variant', 'variants',
+    multiple=True,
+    metavar='FORMAT[:COLOR[:QUALITY]]',
+    callback=lambda ctx, param, values: _parse_variants(values),
+    help='Render this variant (repeatable), e.g. --variant short --variant long:cyan:high'
+)
+@click.option(
+    '--governor', 'governed',
+    is_flag=True,
+    help='Share cores and memory with other governed runs on this host'
+)
+@click.option(
+    '--profile',
+    type=click.Path(dir_okay=False),
+    default=None,
+    help='Write per-stage time, CPU and memory stats to this JSON file'
+)
+@click.option(
+    '--cprofile-dir',
+    type=click.Path(file_okay=False),
+    default=None,
+    help='Also dump a cProfile file per stage into this directory'
+)
 @click.option(
     '--keep-temp',
     is_flag=True,
     help='Keep temporary files (for debugging)'
 )
+@click.option(
+    '--no-cache',
+    is_flag=True,
+    help='Ignore cached word timings and re-run Whisper'
+)
 def generate(
     audio: str,
     transcript: str,
@@ -78,7 +215,28 @@ def generate(
     font_size: int,
     highlight_color: str,
     model: str,
-    keep_temp: bool
+    workers: int,
+    speed: str,
+    language: str,
+    series: str,
+    compute_type: str,
+    batch_size: int,
+    cpu_threads: int,
+    model_workers: int,
+    cascade: str,
+    cascade_threshold: float,
+    compress_silence: float,
+    stream: bool,
+    vfr: bool,
+    render_workers: int,
+    proxy: bool,
+    incremental: bool,
+    variants: list,
+    governed: bool,
+    profile: str,
+    cprofile_dir: str,
+    keep_temp: bool,
+    no_cache: bool
 ):
     """
     Generate a video with word-by-word highlighting from audio.
@@ -88,6 +246,23 @@ def generate(
     as it's spoken.
     """
     
+    if batch_size and workers > 1:
+        raise click.UsageError("--batch-size is for a single process; drop --workers")
+    
+    if compress_silence and stream:
+        raise click.UsageError("--compress-silence needs all word timings first; drop --stream")
+    
+    if variants and (stream or incremental or render_workers > 1):
+        raise click.UsageError(
+            "--variant can't be combined with --stream, --incremental or --render-workers"
+        )
+    
+    if vfr and (stream or incremental or render_workers > 1):
+        raise click.UsageError(
+            "--vfr renders in one pass; it can't be combined with --stream, "
+            "--incremental or --render-workers"
+        )
+    
     click.echo("=" * 50)
     click.echo("YT-Videos Generator")
     click.echo("=" * 50)
@@ -95,13 +270,47 @@ def generate(
     # Create temp directory
     temp_dir = Path(tempfile.mkdtemp(prefix="ytvideo_"))
     subtitle_path = temp_dir / "subtitles.ass"
+    profiler = Profiler(cprofile_dir, reset_peak_rss=bool(profile or cprofile_dir))
+    governor = ResourceGovernor() if governed else None
     
     try:
         # Step 1: Align audio to get word timestamps
         click.echo(f"\n📝 Step 1/3: Extracting word timestamps...")
         click.echo(f"   Loading Whisper model '{model}'...")
         
-        aligner = AudioAligner(model_size=model)
+        # Decode Whisper's 16 kHz track once; renders read the source itself
+        audio_store = PCMStore(str(temp_dir / "pcm") if no_cache else None)
+        
+        # Encode the audio track once (or copy it) for every render
+        audio_tracks = AudioTrackStore(str(temp_dir / "tracks") if no_cache else None)
+        
+        # Finished video segments, kept across runs only with --incremental
+        # (which also lets segmented or streamed renders resume after a failure)
+        segment_cache = None
+        if incremental:
+            segment_cache = SegmentCache(str(temp_dir / "segment_cache") if no_cache else None)
+        
+        with profiler.stage("aligner_init"):
+            aligner = AudioAligner(
+                model_size=model,
+                cache=None if no_cache else AlignmentCache(),
+                workers=workers,
+                audio_store=audio_store,
+                cascade_model=cascade,
+                cascade_threshold=cascade_threshold,
+                speed=speed,
+                language=language,
+                language_cache=None if no_cache else LanguageCache(),
+                series=series,
+                checkpoints=None if no_cache else CheckpointStore(),
+                compute_type=compute_type,
+                batch_size=batch_size,
+                cpu_threads=cpu_threads,
+                num_workers=model_workers
+            )
+        
+        with profiler.stage("decode") as stats:
+            stats.audio_seconds = audio_store.decode(audio).duration
         
         # Load transcript if provided
         transcript_text = None
@@ -109,13 +318,52 @@ def generate(
             transcript_text = Path(transcript).read_text().strip()
             click.echo(f"   Using provided transcript ({len(transcript_text)} chars)")
         
+        if stream:
+            with profiler.stage("stream", audio_seconds=stats.audio_seconds):
+                result = _generate_streaming(
+                    aligner, audio, transcript_text, output, temp_dir,
+                    format, quality, font_size, highlight_color, proxy, audio_tracks,
+                    segment_cache, governor
+                )
+            click.echo(f"   ✓ Rendered {len(result.words)} words "
+                       f"({result.duration:.1f} seconds)")
+            _echo_done(output)
+            return
+        
         # Align
         click.echo(f"   Processing audio: {audio}")
-        if transcript_text:
-            result = aligner.align_with_transcript(audio, transcript_text)
-        else:
-            result = aligner.align(audio)
+        registry = get_registry()
+        per_worker = cpu_threads or (governor.split(workers, 0)[0] if governor else 0)
+        with _lease(
+            governor, "align", per_worker * workers,
+            memory_mb=_align_memory(model, compute_type, workers, cascade),
+            min_cores=per_worker * workers if cpu_threads else workers
+        ) as lease, profiler.stage("align") as stats:
+            if lease:
+                aligner.cpu_threads = max(1, lease.cores // workers)
+            load_seconds = registry.load_seconds
+            if transcript_text:
+                result = aligner.align_with_transcript(audio, transcript_text)
+            else:
+                result = aligner.align(audio)
+            stats.audio_seconds = result.duration
+            stats.extra["model_load_seconds"] = registry.load_seconds - load_seconds
+            stats.extra["words"] = len(result.words)
+            stats.extra["from_cache"] = result.from_cache
+            if result.cascade:
+                stats.extra["cascade"] = result.cascade.to_dict()
         
+        if result.from_cache:
+            click.echo(f"   ✓ Using cached word timings")
+        if result.resumed_from:
+            click.echo(f"   ✓ Resumed from checkpoint at {result.resumed_from:.1f}s")
+        if result.cascade:
+            report = result.cascade
+            click.echo(f"   ✓ Escalated {report.escalated_seconds:.1f}s "
+                       f"({report.escalated_fraction:.1%}) in {report.windows} windows "
+                       f"to '{report.model}'")
+        if result.language:
+            click.echo(f"   ✓ Language: {result.language}")
         click.echo(f"   ✓ Found {len(result.words)} words")
         click.echo(f"   ✓ Duration: {result.duration:.1f} seconds")
         
@@ -125,6 +373,37 @@ def generate(
             preview_text = " ".join(w.word for w in preview)
             click.echo(f"   Preview: \"{preview_text}...\"")
         
+        # Shorten long pauses: the words move onto the compressed timeline
+        # and the trimmed audio is rendered in place of the source
+        render_audio = audio
+        if compress_silence:
+            with profiler.stage("compress_silence", audio_seconds=result.duration) as stats:
+                words, edits = compress_silences(result.words, result.duration, compress_silence)
+                render_audio = trim_audio(
+                    audio_store.playback(audio),
+                    edits,
+                    str(temp_dir / "compressed.wav")
+                )
+                stats.extra["removed_seconds"] = round(edits.removed, 3)
+            edit_list = edits.save(str(Path(output).with_suffix(".edits.json")))
+            click.echo(f"   ✓ Cut {edits.removed:.1f}s of silence "
+                       f"({result.duration:.1f}s → {edits.duration:.1f}s)")
+            click.echo(f"   ✓ Edit list: {edit_list}")
+            result = replace(result, words=words, duration=edits.duration)
+        
+        if variants:
+            outputs = _render_variants(
+                result, variants, render_audio, output, temp_dir, font_size,
+                highlight_color, quality, proxy, audio_tracks, profiler, governor
+            )
+            click.echo("\n" + "=" * 50)
+            click.echo(f"✅ Done! {len(outputs)} videos saved:")
+            click.echo("=" * 50)
+            for path in outputs:
+                size = Path(path).stat().st_size / (1024 * 1024)
+                click.echo(f"   {path} ({size:.1f} MB)")
+            return
+        
         # Step 2: Generate subtitles
         click.echo(f"\n📄 Step 2/3: Generating subtitles...")
         
@@ -135,41 +414,108 @@ def generate(
         )
         
         generator = SubtitleGenerator(sub_config)
-        generator.generate(result.words, str(subtitle_path))
+        with profiler.stage("subtitles", audio_seconds=result.duration):
+            generator.generate(result.words, str(subtitle_path))
         
         click.echo(f"   ✓ Subtitle file created")
         
         # Step 3: Render video
+        render_config = create_render_config(
+            format=format, quality=quality, vfr=vfr, proxy=proxy
+        )
+        
         click.echo(f"\n🎬 Step 3/3: Rendering video...")
-        click.echo(f"   Format: {format} ({'1080x1920' if format == 'short' else '1920x1080'})")
-        click.echo(f"   Quality: {quality}")
+        click.echo(f"   Format: {format} ({render_config.width}x{render_config.height})")
+        click.echo(f"   Quality: {'proxy' if proxy else quality}")
         
-        render_config = create_render_config(format=format, quality=quality)
-        renderer = VideoRenderer(render_config)
-        
-        renderer.render(
-            audio_path=audio,
-            subtitle_path=str(subtitle_path),
-            output_path=output,
-            duration=result.duration
-        )
+        with _lease(
+            governor, "render", RENDER_MAX_THREADS * render_workers,
+            memory_mb=RENDER_MEMORY_MB * render_workers, min_cores=render_workers
+        ) as lease, profiler.stage("render", audio_seconds=result.duration) as stats:
+            # FFmpeg processes the leased cores are split between
+            processes = render_workers
+            if lease and incremental and render_workers == 1:
+                processes = lease.cores
+            if lease:
+                render_config = replace(render_config, threads=max(1, lease.cores // processes))
+            
+            if incremental:
+                rendered = render_incremental(
+                    generator,
+                    VideoRenderer(render_config, audio_tracks=audio_tracks),
+                    result.words,
+                    duration=result.duration,
+                    audio_path=render_audio,
+                    output_path=output,
+                    work_dir=str(temp_dir / "segments"),
+                    cache=segment_cache,
+                    workers=processes if lease or render_workers > 1 else None
+                )
+                stats.extra["segments"] = rendered.segments
+                stats.extra["segments_rendered"] = rendered.rendered
+                click.echo(f"   ✓ Re-encoded {rendered.rendered} of {rendered.segments} segments "
+                           f"({rendered.reused} unchanged)")
+            elif render_workers > 1:
+                click.echo(f"   Segments: {render_workers} parallel renders")
+                render_segmented(
+                    generator,
+                    VideoRenderer(render_config, audio_tracks=audio_tracks),
+                    result.words,
+                    duration=result.duration,
+                    audio_path=render_audio,
+                    output_path=output,
+                    work_dir=str(temp_dir / "segments"),
+                    workers=render_workers,
+                    cache=segment_cache
+                )
+            else:
+                with _encode_progress(result.duration) as on_progress:
+                    renderer = VideoRenderer(
+                        render_config,
+                        on_progress=on_progress,
+                        audio_tracks=audio_tracks
+                    )
+                    renderer.render(
+                        audio_path=render_audio,
+                        subtitle_path=str(subtitle_path),
+                        output_path=output,
+                        duration=result.duration,
+                        timeline=generator.timeline(result.words) if vfr else None
+                    )
         
         click.echo(f"   ✓ Video rendered")
         
-        # Done
-        click.echo("\n" + "=" * 50)
-        click.echo(f"✅ Done! Video saved to: {output}")
-        click.echo("=" * 50)
-        
-        # Show file info
-        output_size = Path(output).stat().st_size / (1024 * 1024)
-        click.echo(f"\n📊 Output: {output_size:.1f} MB")
+        _echo_done(output)
         
     except Exception as e:
         click.echo(f"\n❌ Error: {e}", err=True)
         raise click.Abort()
     
     finally:
+        if profile:
+            profiler.write_json(
+                profile,
+                audio=audio,
+                model=model,
+                speed=speed,
+                language=language,
+                compute_type=compute_type,
+                batch_size=batch_size,
+                cascade=cascade,
+                format=format,
+                quality=quality,
+                workers=workers,
+                render_workers=render_workers,
+                compress_silence=compress_silence,
+                stream=stream,
+                vfr=vfr,
+                proxy=proxy,
+                incremental=incremental,
+                variants=[":".join(filter(None, v)) for v in variants],
+                governed=governed
+            )
+            click.echo(f"\n⏱️  Profile written to: {profile}")
+        
         # Cleanup temp files
         if not keep_temp:
             shutil.rmtree(temp_dir, ignore_errors=True)
@@ -177,21 +523,270 @@ def generate(
             click.echo(f"\n🗂️  Temp files kept at: {temp_dir}")
 
 
+def _generate_streaming(
+    aligner: AudioAligner,
+    audio: str,
+    transcript_text: str,
+    output: str,
+    temp_dir: Path,
+    format: str,
+    quality: str,
+    font_size: int,
+    highlight_color: str,
+    proxy: bool,
+    audio_tracks: AudioTrackStore,
+    segment_cache: SegmentCache,
+    governor: ResourceGovernor = None
+):
+    """Transcribe and render with the stages overlapped (--stream)."""
+    click.echo(f"\n⚡ Streaming: rendering segments while transcribing...")
+    click.echo(f"   Processing audio: {audio}")
+    
+    sub_config = create_subtitle_config(
+        format=format,
+        font_size=font_size,
+        highlight_color=highlight_color
+    )
+    render_config = create_render_config(format=format, quality=quality, proxy=proxy)
+    
+    # Whisper and the segment renders run at the same time, under one
+    # lease (two leases taken one after the other could deadlock
+    # between processes)
+    render_workers = STREAM_RENDER_WORKERS
+    align_threads, render_threads = (
+        governor.split(1, render_workers) if governor else (0, 0)
+    )
+    align_threads = aligner.cpu_threads or align_threads
+    wanted = align_threads + render_threads * render_workers
+    with _lease(
+        governor, "stream", wanted,
+        memory_mb=RENDER_MEMORY_MB * render_workers + _align_memory(
+            aligner.model_size, aligner.compute_type, 1, aligner.cascade_model
+        ),
+        min_cores=1 + render_workers
+    ) as lease:
+        if lease:
+            # Fewer cores than wanted: shrink both sides in proportion
+            aligner.cpu_threads = max(1, lease.cores * align_threads // wanted)
+            render_config = replace(render_config, threads=max(
+                1, (lease.cores - aligner.cpu_threads) // render_workers
+            ))
+        
+        return render_streaming(
+            aligner,
+            SubtitleGenerator(sub_config),
+            VideoRenderer(render_config, audio_tracks=audio_tracks),
+            audio_path=audio,
+            output_path=output,
+            work_dir=str(temp_dir / "segments"),
+            transcript=transcript_text,
+            render_workers=render_workers,
+            cache=segment_cache,
+            on_segment=lambda i, start, end: click.echo(
+                f"   ✓ Segment {i + 1}: {start:.1f}s - {end:.1f}s"
+            )
+        )
+
+
+@contextmanager
+def _lease(
+    governor: ResourceGovernor,
+    kind: str,
+    cores: int,
+    memory_mb: int = 0,
+    min_cores: int = None
+):
+    """Governor lease for a stage (None when not governed)."""
+    if governor is None:
+        yield None
+        return
+    
+    with governor.lease(
+        kind, cores, memory_mb, min_cores=min_cores,
+        on_wait=lambda: click.echo(f"   ⏳ Waiting for free cores ({kind})...")
+    ) as lease:
+        click.echo(f"   ⚖️  {kind.capitalize()}: {lease.cores} of {governor.cores} cores")
+        yield lease
+
+
+def _align_memory(model: str, compute_type: str, workers: int, cascade: str = None) -> int:
+    """Estimated memory of an alignment: a model per worker, plus the cascade model."""
+    memory = model_memory_mb(model, compute_type) * workers
+    if cascade:
+        memory += model_memory_mb(cascade, compute_type)
+    return memory
+
+
+@contextmanager
+def _encode_progress(duration: float):
+    """Progress bar (position, encode speed, ETA) for an FFmpeg render."""
+    with click.progressbar(
+        length=max(1, int(duration * 1000)),
+        label="   Encoding",
+        show_eta=True,
+        item_show_func=lambda p: f"{p.speed:.1f}x" if p else None
+    ) as bar:
+        def update(progress: RenderProgress):
+            bar.update(max(0, int(progress.out_time * 1000) - bar.pos), progress)
+        
+        yield update
+
+
+def _parse_variants(specs) -> list:
+    """Split each FORMAT[:COLOR[:QUALITY]] into (format, color, quality)."""
+    variants = []
+    for spec in specs:
+        parts = spec.split(":")
+        if len(parts) > 3 or parts[0] not in ("short", "long"):
+            raise click.BadParameter(
+                f"'{spec}' is not FORMAT[:COLOR[:QUALITY]] with FORMAT short or long"
+            )
+        format, color, quality = (parts + [None, None])[:3]
+        if quality and quality not in ("fast", "medium", "high"):
+            raise click.BadParameter(f"'{spec}': quality must be fast, medium or high")
+        variant = (format, color or None, quality or None)
+        if variant in variants:
+            raise click.BadParameter(f"'{spec}' is given twice")
+        variants.append(variant)
+    return variants
+
+
+def _render_variants(
+    result,
+    variants: list,
+    audio: str,
+    output: str,
+    temp_dir: Path,
+    font_size: int,
+    highlight_color: str,
+    quality: str,
+    proxy: bool,
+    audio_tracks: AudioTrackStore,
+    profiler: Profiler,
+    governor: ResourceGovernor = None
+) -> list:
+    """
+    Build one subtitle file per variant and render all of them at once (--variant).
+    
+    Outputs are named after the variant: -o video.mp4 --variant long:cyan
+    gives video_long_cyan.mp4.
+    """
+    base = Path(output)
+    targets = []
+    
+    click.echo(f"\n📄 Step 2/3: Generating subtitles ({len(variants)} variants)...")
+    with profiler.stage("subtitles", audio_seconds=result.duration):
+        for index, (format, color, variant_quality) in enumerate(variants):
+            name = "_".join(filter(None, (format, color, variant_quality)))
+            subtitle_path = temp_dir / f"subtitles_{index}.ass"
+            SubtitleGenerator(create_subtitle_config(
+                format=format,
+                font_size=font_size,
+                highlight_color=color or highlight_color
+            )).generate(result.words, str(subtitle_path))
+            
+            targets.append(RenderVariant(
+                config=create_render_config(
+                    format=format, quality=variant_quality or quality, proxy=proxy
+                ),
+                subtitle_path=str(subtitle_path),
+                output_path=str(base.with_name(f"{base.stem}_{name}{base.suffix}"))
+            ))
+    
+    click.echo(f"   ✓ Subtitle files created")
+    click.echo(f"\n🎬 Step 3/3: Rendering {len(targets)} variants in one pass...")
+    for target in targets:
+        c = target.config
+        click.echo(f"   {Path(target.output_path).name}: {c.width}x{c.height}, "
+                   f"{'proxy' if proxy else c.preset}")
+    
+    with _lease(
+        governor, "render", RENDER_MAX_THREADS,
+        memory_mb=RENDER_MEMORY_MB * len(targets), min_cores=1
+    ) as lease, profiler.stage("render", audio_seconds=result.duration):
+        if lease:
+            # One FFmpeg process, its cores split between the encoders
+            threads = max(1, lease.cores // len(targets))
+            targets = [replace(t, config=replace(t.config, threads=threads)) for t in targets]
+        with _encode_progress(result.duration) as on_progress:
+            renderer = VideoRenderer(on_progress=on_progress, audio_tracks=audio_tracks)
+            outputs = renderer.render_variants(audio, targets, result.duration)
+    
+    click.echo(f"   ✓ Videos rendered")
+    return outputs
+
+
+def _echo_done(output: str):
+    """Print the final summary."""
+    click.echo("\n" + "=" * 50)
+    click.echo(f"✅ Done! Video saved to: {output}")
+    click.echo("=" * 50)
+    
+    # Show file info
+    output_size = Path(output).stat().st_size / (1024 * 1024)
+    click.echo(f"\n📊 Output: {output_size:.1f} MB")
+
+
 @click.command()
 @click.argument('audio', type=click.Path(exists=True))
-def preview(audio: str):
+@click.option(
+    '--workers', '-w',
+    type=click.IntRange(min=1),
+    default=1,
+    help='Transcribe silence-split chunks in parallel processes'
+)
+@click.option(
+    '--speed',
+    type=click.Choice(list(SPEED_PROFILES)),
+    default=DEFAULT_SPEED,
+    help='Transcription speed profile (draft decodes greedily, accurate keeps faster-whisper defaults)'
+)
+@click.option(
+    '--language',
+    default=None,
+    help='Spoken language code, e.g. en (default: detect once per series)'
+)
+@click.option(
+    '--series',
+    default=None,
+    help="Series name whose language is remembered (default: the audio file's folder)"
+)
+@click.option(
+    '--no-cache',
+    is_flag=True,
+    help='Ignore cached word timings and re-run Whisper'
+)
+def preview(
+    audio: str,
+    workers: int,
+    speed: str,
+    language: str,
+    series: str,
+    no_cache: bool
+):
     """
     Preview word timestamps without generating video.
     
     Useful for checking alignment before full render.
     """
     click.echo(f"Loading Whisper model...")
-    aligner = AudioAligner(model_size="base")
+    aligner = AudioAligner(
+        model_size="base",
+        cache=None if no_cache else AlignmentCache(),
+        workers=workers,
+        speed=speed,
+        language=language,
+        language_cache=None if no_cache else LanguageCache(),
+        series=series,
+        checkpoints=None if no_cache else CheckpointStore()
+    )
     
     click.echo(f"Processing: {audio}")
     result = aligner.align(audio)
     
     click.echo(f"\nDuration: {result.duration:.2f}s")
+    if result.language:
+        click.echo(f"Language: {result.language}")
     click.echo(f"Words: {len(result.words)}")
     click.echo(f"\nTimestamps:")
     click.echo("-" * 40)
@@ -200,6 +795,394 @@ def preview(audio: str):
         click.echo(f"{word.start:6.2f}s - {word.end:6.2f}s : {word.word}")
 
 
+@click.command()
+@click.argument('source', type=click.Path(exists=True))
+@click.option(
+    '--output-dir', '-o',
+    type=click.Path(file_okay=False),
+    default=None,
+    help='Output directory (directory input; defaults to the input directory)'
+)
+@click.option(
+    '--format', '-f',
+    type=click.Choice(['short', 'long']),
+    default='short',
+    help='Default video format'
+)
+@click.option(
+    '--quality', '-q',
+    type=click.Choice(['fast', 'medium', 'high']),
+    default='medium',
+    help='Default render quality'
+)
+@click.option(
+    '--highlight-color',
+    default='yellow',
+    help='Default highlight color'
+)
+@click.option(
+    '--model',
+    type=click.Choice(['tiny', 'base', 'small', 'medium', 'large-v3']),
+    default='base',
+    help='Default Whisper model size'
+)
+@click.option(
+    '--speed',
+    type=click.Choice(list(SPEED_PROFILES)),
+    default=DEFAULT_SPEED,
+    help='Transcription speed profile (draft decodes greedily, accurate keeps faster-whisper defaults)'
+)
+@click.option(
+    '--language',
+    default=None,
+    help='Spoken language code, e.g. en (default: detect once per series)'
+)
+@click.option(
+    '--series',
+    default=None,
+    help="Series name whose language is remembered (default: the audio file's folder)"
+)
+@click.option(
+    '--compute-type',
+    type=click.Choice(['auto', 'int8', 'int8_float32', 'float16', 'float32']),
+    default='auto',
+    help='Whisper weight precision (int8 is fastest on CPU)'
+)
+@click.option(
+    '--batch-size',
+    type=click.IntRange(min=0),
+    default=0,
+    help='Batched Whisper inference with this many pieces at once (0 = off)'
+)
+@click.option(
+    '--cpu-threads',
+    type=click.IntRange(min=0),
+    default=0,
+    help='Whisper CPU threads (0 = library default)'
+)
+@click.option(
+    '--model-workers',
+    type=click.IntRange(min=1),
+    default=1,
+    help='Whisper model workers (parallel transcribe calls, e.g. batch jobs)'
+)
+@click.option(
+    '--align-workers',
+    type=click.IntRange(min=1),
+    default=1,
+    help='Concurrent Whisper transcriptions'
+)
+@click.option(
+    '--render-workers',
+    type=click.IntRange(min=1),
+    default=2,
+    help='Concurrent FFmpeg renders'
+)
+@click.option(
+    '--compress-silence',
+    type=click.FloatRange(min=0.1),
+    default=None,
+    metavar='SECONDS',
+    help='Shorten pauses longer than this to this length (writes <output>.edits.json)'
+)
+@click.option(
+    '--vfr',
+    is_flag=True,
+    help='Variable frame rate: only encode frames where the subtitles change'
+)
+@click.option(
+    '--governor', 'governed',
+    is_flag=True,
+    help='Share cores and memory with other governed runs on this host'
+)
+@click.option(
+    '--force',
+    is_flag=True,
+    help='Re-render outputs that are already up to date'
+)
+@click.option(
+    '--no-cache',
+    is_flag=True,
+    help='Ignore cached word timings and re-run Whisper'
+)
+@click.option(
+    '--summary',
+    type=click.Path(dir_okay=False),
+    default=None,
+    help='Per-job summary file (.json or .csv, default: batch_summary.json)'
+)
+def generate_batch(
+    source: str,
+    output_dir: str,
+    format: str,
+    quality: str,
+    highlight_color: str,
+    model: str,
+    speed: str,
+    language: str,
+    series: str,
+    compute_type: str,
+    batch_size: int,
+    cpu_threads: int,
+    model_workers: int,
+    align_workers: int,
+    render_workers: int,
+    compress_silence: float,
+    vfr: bool,
+    governed: bool,
+    force: bool,
+    no_cache: bool,
+    summary: str
+):
+    """
+    Generate videos for many audio files in one run.
+    
+    SOURCE is a directory of audio files (with optional <name>.txt
+    transcripts) or a CSV/JSONL manifest with columns audio, transcript,
+    format, quality, color and output. Models are loaded once, and
+    outputs already rendered from the same inputs and settings are
+    skipped.
+    """
+    defaults = {
+        "format": format,
+        "quality": quality,
+        "color": highlight_color,
+        "model": model,
+    }
+    
+    if Path(source).is_dir():
+        jobs = jobs_from_directory(source, output_dir, defaults)
+        summary_dir = Path(output_dir or source)
+    else:
+        try:
+            jobs = load_manifest(source, defaults)
+        except ValueError as e:
+            raise click.UsageError(str(e))
+        summary_dir = Path(source).parent
+    
+    click.echo(f"Batch: {len(jobs)} jobs")
+    
+    def report(result: JobResult):
+        name = Path(result.output).name
+        if result.status == "ok":
+            click.echo(f"   ✓ {name} ({result.total_seconds:.1f}s)")
+        elif result.status == "skipped":
+            click.echo(f"   ↷ {name} (up to date)")
+        else:
+            click.echo(f"   ✗ {name}: {result.error}", err=True)
+    
+    runner = BatchRunner(
+        align_workers=align_workers,
+        render_workers=render_workers,
+        cache=None if no_cache else AlignmentCache(),
+        audio_store=None if no_cache else PCMStore(),
+        audio_tracks=None if no_cache else AudioTrackStore(),
+        aligner_options={
+            "speed": speed,
+            "language": language,
+            "language_cache": None if no_cache else LanguageCache(),
+            "series": series,
+            "checkpoints": None if no_cache else CheckpointStore(),
+            "compute_type": compute_type,
+            "batch_size": batch_size,
+            "cpu_threads": cpu_threads,
+            "num_workers": model_workers,
+        },
+        governor=ResourceGovernor() if governed else None,
+        vfr=vfr,
+        compress_silence=compress_silence,
+        force=force,
+        on_result=report
+    )
+    results = runner.run(jobs)
+    
+    summary_path = write_summary(
+        results, summary or str(summary_dir / "batch_summary.json")
+    )
+    
+    failed = sum(1 for r in results if r.status == "failed")
+    click.echo(f"\n📊 {len(results) - failed}/{len(results)} succeeded, "
+               f"summary: {summary_path}")
+    if failed:
+        raise SystemExit(1)
+
+
+@click.command()
+@click.argument('audio', type=click.Path(exists=True))
+@click.option(
+    '--time', '-t', 'times',
+    type=click.FloatRange(min=0),
+    multiple=True,
+    required=True,
+    help='Position in seconds (repeat for a contact sheet)'
+)
+@click.option(
+    '--transcript',
+    type=click.Path(exists=True),
+    help='Path to transcript file (as used for the video)'
+)
+@click.option(
+    '--output', '-o',
+    default='snapshot.png',
+    help='Output image path (.png or .jpg)'
+)
+@click.option(
+    '--format', '-f',
+    type=click.Choice(['short', 'long']),
+    default='short',
+    help='Video format: short (9:16) or long (16:9)'
+)
+@click.option(
+    '--font-size',
+    type=int,
+    default=None,
+    help='Font size override'
+)
+@click.option(
+    '--highlight-color',
+    default='yellow',
+    help='Highlight color (yellow, cyan, green, red, white)'
+)
+@click.option(
+    '--model',
+    type=click.Choice(['tiny', 'base', 'small', 'medium', 'large-v3']),
+    default='base',
+    help='Whisper model size (use the one the video was made with)'
+)
+@click.option(
+    '--speed',
+    type=click.Choice(list(SPEED_PROFILES)),
+    default=DEFAULT_SPEED,
+    help='Transcription speed profile (use the one the video was made with)'
+)
+@click.option(
+    '--language',
+    default=None,
+    help='Spoken language code, e.g. en (default: detect once per series)'
+)
+@click.option(
+    '--series',
+    default=None,
+    help="Series name whose language is remembered (default: the audio file's folder)"
+)
+@click.option(
+    '--compute-type',
+    type=click.Choice(['auto', 'int8', 'int8_float32', 'float16', 'float32']),
+    default='auto',
+    help='Whisper weight precision (use the one the video was made with)'
+)
+@click.option(
+    '--batch-size',
+    type=click.IntRange(min=0),
+    default=0,
+    help='Batched Whisper inference (use the one the video was made with)'
+)
+@click.option(
+    '--cascade',
+    type=click.Choice(['small', 'medium', 'large-v3']),
+    default=None,
+    help='Cascade model the video was made with'
+)
+@click.option(
+    '--cascade-threshold',
+    type=click.FloatRange(0.0, 1.0),
+    default=DEFAULT_THRESHOLD,
+    show_default=True,
+    help='Cascade threshold the video was made with'
+)
+@click.option(
+    '--compress-silence',
+    type=click.FloatRange(min=0.1),
+    default=None,
+    metavar='SECONDS',
+    help='Pause limit the video was made with (times are on its shortened timeline)'
+)
+@click.option(
+    '--columns',
+    type=click.IntRange(min=1),
+    default=4,
+    help='Contact sheet frames per row'
+)
+@click.option(
+    '--scale',
+    type=click.FloatRange(min=0.05, max=1.0),
+    default=0.25,
+    help='Contact sheet frame size relative to the video'
+)
+def snapshot(
+    audio: str,
+    times: tuple,
+    transcript: str,
+    output: str,
+    format: str,
+    font_size: int,
+    highlight_color: str,
+    model: str,
+    speed: str,
+    language: str,
+    series: str,
+    compute_type: str,
+    batch_size: int,
+    cascade: str,
+    cascade_threshold: float,
+    compress_silence: float,
+    columns: int,
+    scale: float
+):
+    """
+    Render the frame shown at a time, without rendering the video.
+    
+    Several --time values give a contact sheet. Word timings come from
+    the alignment cache, so after the first run a snapshot takes well
+    under a second. Pass the transcription and --compress-silence
+    options the video was made with, so the timings match it.
+    """
+    start = time.perf_counter()
+    
+    aligner = AudioAligner(
+        model_size=model,
+        compute_type=compute_type,
+        cache=AlignmentCache(),
+        cascade_model=cascade,
+        cascade_threshold=cascade_threshold,
+        batch_size=batch_size,
+        speed=speed,
+        language=language,
+        language_cache=LanguageCache(),
+        series=series,
+        checkpoints=CheckpointStore()
+    )
+    if transcript:
+        result = aligner.align_with_transcript(audio, Path(transcript).read_text().strip())
+    else:
+        result = aligner.align(audio)
+    if not result.from_cache:
+        click.echo(f"✓ Aligned {len(result.words)} words ({result.duration:.1f}s)")
+    
+    words = result.words
+    if compress_silence:
+        words, _ = compress_silences(words, result.duration, compress_silence)
+    
+    generator = SubtitleGenerator(create_subtitle_config(
+        format=format,
+        font_size=font_size,
+        highlight_color=highlight_color
+    ))
+    snapshots = SnapshotRenderer(
+        generator, words, create_render_config(format=format)
+    )
+    
+    if len(times) == 1:
+        snapshots.frame(times[0], output)
+    else:
+        snapshots.contact_sheet(list(times), output, columns=columns, scale=scale)
+        for index, at in enumerate(times):
+            row, column = divmod(index, min(columns, len(times)))
+            click.echo(f"   {at:8.2f}s → row {row + 1}, column {column + 1}")
+    
+    click.echo(f"📸 {output} ({time.perf_counter() - start:.2f}s)")
+
+
 # CLI group
 @click.group()
 def cli():
@@ -209,6 +1192,8 @@ def cli():
 
 cli.add_command(generate, name='generate')
 cli.add_command(preview, name='preview')
+cli.add_command(generate_batch, name='generate-batch')
+cli.add_command(snapshot, name='snapshot')
 
 
 # Allow running generate directly
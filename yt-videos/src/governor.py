@@ -0,0 +1,269 @@
+"""
+Resource Governor
+
+Shares the host's cores and memory between Whisper alignment and FFmpeg
+encoding jobs, across threads and across processes. CTranslate2 and
+libx264 each size their thread pools as if they owned the machine, so
+several runs side by side oversubscribe the CPU and finish later than
+they would one after another.
+
+Every job takes a lease (a number of cores and an amount of memory)
+before it starts and returns it when it finishes. The job then runs
+with exactly that many threads (Whisper cpu_threads, FFmpeg -threads).
+A job is admitted only when its lease fits in what is left, otherwise
+it waits. Leases live in a small JSON ledger under the cache directory,
+guarded by a file lock, so separate generate processes on one host
+share a single budget. Leases of processes that died are dropped.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from cache import atomic_write_bytes, default_cache_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows: leases are shared between threads only
+    fcntl = None
+
+# Whisper stops speeding up past this many threads per model
+ALIGN_MAX_THREADS = 8
+
+# libx264 stops speeding up past this many threads per encode
+RENDER_MAX_THREADS = 16
+
+# Share of physical memory leases may add up to
+MEMORY_FRACTION = 0.8
+
+# Working memory of a loaded Whisper model at float32 (MB); int8 about halves it
+MODEL_MEMORY_MB = {
+    "tiny": 400,
+    "base": 600,
+    "small": 1200,
+    "medium": 2800,
+    "large-v3": 5000,
+}
+
+# Working memory of one FFmpeg render (MB)
+RENDER_MEMORY_MB = 400
+
+# How often a waiting job checks the ledger again (seconds)
+POLL_SECONDS = 0.5
+
+
+def host_cores() -> int:
+    """Cores this process may run on (respects CPU affinity)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def host_memory_mb() -> Optional[int]:
+    """Physical memory in MB, or None if unknown."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def model_memory_mb(model_size: str, compute_type: str = "auto") -> int:
+    """Estimated working memory of a Whisper model."""
+    memory = MODEL_MEMORY_MB.get(model_size, MODEL_MEMORY_MB["large-v3"])
+    return memory // 2 if compute_type.startswith("int8") else memory
+
+
+@dataclass
+class Lease:
+    """Cores and memory held by one running job."""
+    id: str
+    kind: str           # "align" or "render"
+    cores: int
+    memory_mb: int
+    pid: int
+    since: float
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ResourceGovernor:
+    """
+    Admission control for CPU- and memory-heavy jobs on one host.
+    """
+
+    def __init__(
+        self,
+        cores: Optional[int] = None,
+        memory_mb: Optional[int] = None,
+        ledger_path: Optional[str] = None
+    ):
+        """
+        Args:
+            cores: Cores to share (default: all this process may use)
+            memory_mb: Memory to share (default: MEMORY_FRACTION of RAM;
+                unlimited if RAM size is unknown)
+            ledger_path: Shared lease ledger (default: in the cache
+                directory, so every governed process on the host uses it)
+        """
+        self.cores = cores or host_cores()
+        total = host_memory_mb()
+        self.memory_mb = memory_mb or (int(total * MEMORY_FRACTION) if total else None)
+        self.ledger_path = (
+            Path(ledger_path) if ledger_path else default_cache_dir() / "governor.json"
+        )
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _ledger(self) -> Iterator[List[dict]]:
+        """Locked, mutable list of live leases (written back on exit)."""
+        with self._lock:
+            self.ledger_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.ledger_path.with_suffix(".lock"), "a") as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    try:
+                        leases = json.loads(self.ledger_path.read_text())
+                    except (OSError, ValueError):
+                        leases = []
+                    leases = [lease for lease in leases if _alive(lease["pid"])]
+                    before = list(leases)
+
+                    yield leases
+
+                    if leases != before or not self.ledger_path.exists():
+                        atomic_write_bytes(
+                            self.ledger_path,
+                            json.dumps(leases, indent=2).encode("utf-8")
+                        )
+                finally:
+                    if fcntl:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def usage(self) -> Tuple[int, int]:
+        """Cores and memory (MB) currently leased on the host."""
+        with self._ledger() as leases:
+            return (
+                sum(lease["cores"] for lease in leases),
+                sum(lease["memory_mb"] for lease in leases),
+            )
+
+    def try_acquire(
+        self,
+        kind: str,
+        cores: int,
+        memory_mb: int = 0,
+        min_cores: Optional[int] = None
+    ) -> Optional[Lease]:
+        """
+        Take a lease if the budget allows, without waiting.
+
+        Args:
+            kind: Job kind, for the ledger ("align", "render")
+            cores: Cores wanted (capped at the governor's total)
+            memory_mb: Memory needed (capped at the governor's total)
+            min_cores: Accept fewer cores, down to this many, rather than
+                wait (default: exactly cores)
+
+        Returns:
+            The lease, or None if it doesn't fit yet
+        """
+        cores = max(1, min(cores, self.cores))
+        min_cores = max(1, min(min_cores or cores, cores))
+        if self.memory_mb is not None:
+            memory_mb = min(memory_mb, self.memory_mb)
+
+        with self._ledger() as leases:
+            free_cores = self.cores - sum(lease["cores"] for lease in leases)
+            used_memory = sum(lease["memory_mb"] for lease in leases)
+            if free_cores < min_cores:
+                return None
+            if self.memory_mb is not None and used_memory + memory_mb > self.memory_mb:
+                return None
+
+            lease = Lease(
+                id=uuid.uuid4().hex,
+                kind=kind,
+                cores=min(cores, free_cores),
+                memory_mb=memory_mb,
+                pid=os.getpid(),
+                since=time.time()
+            )
+            leases.append(asdict(lease))
+            return lease
+
+    def release(self, lease: Lease):
+        """Return a lease to the budget."""
+        with self._ledger() as leases:
+            leases[:] = [entry for entry in leases if entry["id"] != lease.id]
+
+    @contextmanager
+    def lease(
+        self,
+        kind: str,
+        cores: int,
+        memory_mb: int = 0,
+        min_cores: Optional[int] = None,
+        timeout: Optional[float] = None,
+        on_wait: Optional[Callable[[], None]] = None
+    ) -> Iterator[Lease]:
+        """
+        Hold a lease for the duration of a with block, waiting for it.
+
+        Arguments are as for try_acquire; on_wait is called once if the
+        job has to wait.
+
+        Raises:
+            TimeoutError: If the lease wasn't granted within timeout seconds
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            granted = self.try_acquire(kind, cores, memory_mb, min_cores)
+            if granted:
+                break
+            if on_wait:
+                on_wait()
+                on_wait = None
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(
+                    f"no {cores} cores / {memory_mb} MB free for {kind} job "
+                    f"after {timeout:g}s"
+                )
+            time.sleep(POLL_SECONDS)
+
+        try:
+            yield granted
+        finally:
+            self.release(granted)
+
+    def split(self, align_jobs: int, render_jobs: int) -> Tuple[int, int]:
+        """
+        Threads per alignment job and per render job when both run at once.
+
+        Cores are shared evenly per job. Alignment is capped at
+        ALIGN_MAX_THREADS and what it can't use goes to encoding.
+
+        Returns:
+            (threads per alignment job, threads per render job)
+        """
+        if not render_jobs:
+            return min(ALIGN_MAX_THREADS, max(1, self.cores // max(1, align_jobs))), 0
+
+        per_job = max(1, self.cores // (align_jobs + render_jobs))
+        align = min(ALIGN_MAX_THREADS, per_job) if align_jobs else 0
+        render = max(1, (self.cores - align * align_jobs) // render_jobs)
+        return align, min(RENDER_MAX_THREADS, render)
@@ -0,0 +1,205 @@
+"""
+Whisper Model Registry
+
+Process-wide cache of loaded Whisper models, so repeated jobs reuse
+the same weights instead of reloading them for every AudioAligner.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+# Approximate parameter counts (millions) per model size
+MODEL_PARAMS_M = {
+    "tiny": 39,
+    "base": 74,
+    "small": 244,
+    "medium": 769,
+    "large-v3": 1550,
+}
+
+# Bytes per parameter for each compute type ("auto" assumes a mixed type)
+COMPUTE_BYTES = {
+    "int8": 1,
+    "int8_float16": 1,
+    "int8_float32": 1,
+    "float16": 2,
+    "bfloat16": 2,
+    "float32": 4,
+    "auto": 2,
+}
+
+DEFAULT_MEMORY_BUDGET_MB = 4096
+
+# (model_size, device, compute_type, load options)
+ModelKey = Tuple[str, str, str, Tuple[Tuple[str, Any], ...]]
+
+
+def _model_key(model_size: str, device: str, compute_type: str, options: dict) -> ModelKey:
+    return (model_size, device, compute_type, tuple(sorted(options.items())))
+
+
+def estimate_model_mb(model_size: str, compute_type: str = "auto") -> int:
+    """
+    Rough resident size of a loaded model in megabytes.
+
+    Unknown sizes (e.g. custom model paths) are treated like large-v3.
+    """
+    params = MODEL_PARAMS_M.get(model_size, MODEL_PARAMS_M["large-v3"])
+    return params * COMPUTE_BYTES.get(compute_type, 2)
+
+
+def _load_whisper_model(model_size: str, device: str, compute_type: str, **kwargs):
+    """Import faster_whisper on demand and load a model."""
+    from faster_whisper import WhisperModel
+
+    return WhisperModel(
+        model_size,
+        device=device,
+        compute_type=compute_type,
+        **kwargs
+    )
+
+
+class ModelRegistry:
+    """
+    LRU cache of loaded Whisper models keyed by (model_size, device,
+    compute_type) plus any load options (cpu_threads, num_workers), so a
+    model loaded with other thread settings is not silently reused.
+
+    Models are loaded on first use. When the estimated total size of
+    loaded models exceeds the memory budget, the least recently used
+    models are dropped (the model currently being requested is always kept).
+    """
+
+    def __init__(self, memory_budget_mb: Optional[int] = None):
+        if memory_budget_mb is None:
+            memory_budget_mb = int(
+                os.environ.get("YTV_MODEL_MEMORY_MB", DEFAULT_MEMORY_BUDGET_MB)
+            )
+        self.memory_budget_mb = memory_budget_mb
+        self._models: "OrderedDict[ModelKey, Any]" = OrderedDict()
+        self._sizes: Dict[ModelKey, int] = {}
+        self._lock = threading.Lock()
+        self._loading: Dict[ModelKey, threading.Lock] = {}  # Loads in progress
+        self.load_seconds = 0.0  # Total time spent loading models
+
+    def get(
+        self,
+        model_size: str = "base",
+        device: str = "auto",
+        compute_type: str = "auto",
+        **kwargs
+    ):
+        """
+        Get a loaded model, loading it if needed.
+
+        Args:
+            model_size: Whisper model size (tiny, base, small, medium, large-v3)
+            device: Device to use (auto, cpu, cuda)
+            compute_type: Compute type (auto, int8, float16, float32)
+            **kwargs: Extra WhisperModel arguments (cpu_threads,
+                num_workers, ...), part of the key
+
+        Returns:
+            faster_whisper.WhisperModel
+        """
+        key = _model_key(model_size, device, compute_type, kwargs)
+
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key]
+            loading = self._loading.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock, so cache hits and other models
+        # aren't held up; threads asking for the same model wait here
+        with loading:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    return self._models[key]
+
+            try:
+                start = time.perf_counter()
+                model = _load_whisper_model(model_size, device, compute_type, **kwargs)
+                elapsed = time.perf_counter() - start
+            except BaseException:
+                with self._lock:
+                    self._loading.pop(key, None)
+                raise
+
+            # Publish the model and retire its load lock together, so a
+            # thread arriving now finds one or the other, never neither
+            with self._lock:
+                self.load_seconds += elapsed
+                self._models[key] = model
+                self._sizes[key] = estimate_model_mb(model_size, compute_type)
+                self._loading.pop(key, None)
+                self._evict(keep=key)
+            return model
+
+    def register(
+        self,
+        model,
+        model_size: str,
+        device: str = "auto",
+        compute_type: str = "auto",
+        **kwargs
+    ):
+        """
+        Add an already constructed model (e.g. a custom or stub model)
+        under a key, so get() returns it instead of loading one.
+        """
+        key = _model_key(model_size, device, compute_type, kwargs)
+        with self._lock:
+            self._models[key] = model
+            self._models.move_to_end(key)
+            self._sizes[key] = 0
+
+    def _evict(self, keep: ModelKey):
+        """Drop least recently used models until within budget."""
+        while self.memory_mb > self.memory_budget_mb and len(self._models) > 1:
+            oldest = next(iter(self._models))
+            if oldest == keep:
+                break
+            del self._models[oldest]
+            del self._sizes[oldest]
+
+    @property
+    def memory_mb(self) -> int:
+        """Estimated memory held by loaded models."""
+        return sum(self._sizes.values())
+
+    def loaded(self) -> list:
+        """Keys of loaded models, least recently used first."""
+        with self._lock:
+            return list(self._models)
+
+    def clear(self):
+        """Unload all models."""
+        with self._lock:
+            self._models.clear()
+            self._sizes.clear()
+
+
+# Process-wide registry
+_registry = ModelRegistry()
+
+
+def get_registry() -> ModelRegistry:
+    """Return the process-wide model registry."""
+    return _registry
+
+
+def get_model(
+    model_size: str = "base",
+    device: str = "auto",
+    compute_type: str = "auto",
+    **kwargs
+):
+    """Get a Whisper model from the process-wide registry."""
+    return _registry.get(model_size, device, compute_type, **kwargs)
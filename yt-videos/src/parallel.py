@@ -0,0 +1,185 @@
+"""
+Parallel Chunked Transcription
+
+Splits audio at silence boundaries (Silero VAD, the same detector used
+by vad_filter=True) into chunks with balanced amounts of speech, then
+transcribes them in a process pool and stitches the word timestamps
+back to absolute time.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from audio_store import ALIGNMENT_SAMPLE_RATE
+
+# Chunks shorter than this are merged with their neighbours (seconds)
+MIN_CHUNK_SECONDS = 30.0
+
+# More chunks than workers evens out the tail of the pool
+CHUNKS_PER_WORKER = 2
+
+# (word, start, end, probability)
+RawWord = Tuple[str, float, float, float]
+
+
+def plan_chunks(
+    speech: List[Tuple[float, float]],
+    duration: float,
+    n_chunks: int,
+    min_chunk: float = MIN_CHUNK_SECONDS
+) -> List[Tuple[float, float]]:
+    """
+    Split [0, duration] into chunks cut in the middle of silences.
+
+    Args:
+        speech: Speech regions (start, end) in seconds, in order
+        duration: Total audio duration in seconds
+        n_chunks: Desired number of chunks
+        min_chunk: Minimum chunk length in seconds
+
+    Returns:
+        Contiguous (start, end) chunks covering the whole audio, each
+        holding roughly the same amount of speech
+    """
+    n_chunks = max(1, min(n_chunks, int(duration // min_chunk) or 1))
+    if n_chunks == 1 or len(speech) < 2:
+        return [(0.0, duration)]
+
+    total_speech = sum(end - start for start, end in speech)
+    target = total_speech / n_chunks
+
+    cuts = []
+    spoken = 0.0
+    last_cut = 0.0
+    for (start, end), (next_start, _) in zip(speech, speech[1:]):
+        spoken += end - start
+        if len(cuts) == n_chunks - 1:
+            break
+        cut = (end + next_start) / 2
+        if spoken >= target * (len(cuts) + 1) and cut - last_cut >= min_chunk:
+            cuts.append(cut)
+            last_cut = cut
+
+    if cuts and duration - cuts[-1] < min_chunk:
+        cuts.pop()
+
+    bounds = [0.0] + cuts + [duration]
+    return list(zip(bounds, bounds[1:]))
+
+
+def detect_speech(audio, vad_parameters: Optional[dict] = None) -> List[Tuple[float, float]]:
+    """Speech regions (seconds) of 16 kHz mono audio using Silero VAD."""
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    options = VadOptions(**(vad_parameters or {}))
+    return [
+        (ts["start"] / ALIGNMENT_SAMPLE_RATE, ts["end"] / ALIGNMENT_SAMPLE_RATE)
+        for ts in get_speech_timestamps(audio, options)
+    ]
+
+
+# Per-process model, loaded once by the pool initializer
+_worker_model = None
+
+
+def _init_worker(model_size: str, device: str, compute_type: str, cpu_threads: int):
+    global _worker_model
+    from models import get_model
+
+    _worker_model = get_model(
+        model_size, device, compute_type, cpu_threads=cpu_threads
+    )
+
+
+def _detect_language(audio, vad_filter: bool) -> str:
+    """Detect the spoken language of a chunk."""
+    language, _, _ = _worker_model.detect_language(audio, vad_filter=vad_filter)
+    return language
+
+
+def _transcribe_chunk(audio, offset: float, options: dict):
+    """Transcribe one chunk; returns (segment texts, words)."""
+    segments, _ = _worker_model.transcribe(audio, **options)
+
+    texts = []
+    words: List[RawWord] = []
+    for segment in segments:
+        texts.append(segment.text)
+        for w in segment.words or []:
+            words.append((
+                w.word.strip(),
+                w.start + offset,
+                w.end + offset,
+                w.probability,
+            ))
+    return texts, words
+
+
+def transcribe_parallel(
+    audio,
+    model_size: str,
+    device: str,
+    compute_type: str,
+    options: dict,
+    workers: int,
+    cpu_threads: int = 0
+) -> Tuple[List[str], List[RawWord], float, str]:
+    """
+    Transcribe audio in parallel chunks.
+
+    Each worker process loads the model once and reuses it for all of
+    its chunks. CPU threads are split evenly between workers. If no
+    language is pinned, it is detected once on the first chunk (like
+    the sequential path does) and pinned for all chunks.
+
+    Args:
+        audio: Path to audio file, or 16 kHz mono samples
+        model_size: Whisper model size
+        device: Device to use
+        compute_type: Compute type
+        options: Options for model.transcribe
+        workers: Number of worker processes
+        cpu_threads: CPU threads per worker (0 = CPU count split evenly)
+
+    Returns:
+        (segment texts, words with absolute timings, duration, language)
+    """
+    if isinstance(audio, str):
+        from faster_whisper.audio import decode_audio
+
+        audio = decode_audio(audio, sampling_rate=ALIGNMENT_SAMPLE_RATE)
+    duration = len(audio) / ALIGNMENT_SAMPLE_RATE
+
+    speech = detect_speech(audio, options.get("vad_parameters"))
+    chunks = plan_chunks(speech, duration, workers * CHUNKS_PER_WORKER)
+
+    cpu_threads = cpu_threads or max(1, (os.cpu_count() or 1) // workers)
+    options = dict(options)
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks)),
+        initializer=_init_worker,
+        initargs=(model_size, device, compute_type, cpu_threads)
+    ) as pool:
+        def submit(start: float, end: float):
+            piece = audio[int(start * ALIGNMENT_SAMPLE_RATE):int(end * ALIGNMENT_SAMPLE_RATE)]
+            return pool.submit(_transcribe_chunk, piece, start, options)
+
+        if not options.get("language"):
+            start, end = chunks[0]
+            options["language"] = pool.submit(
+                _detect_language,
+                audio[int(start * ALIGNMENT_SAMPLE_RATE):int(end * ALIGNMENT_SAMPLE_RATE)],
+                options.get("vad_filter", False)
+            ).result()
+        futures = [submit(*chunk) for chunk in chunks]
+
+        texts: List[str] = []
+        words: List[RawWord] = []
+        for future in futures:
+            chunk_texts, chunk_words = future.result()
+            texts.extend(chunk_texts)
+            words.extend(chunk_words)
+
+    return texts, words, duration, options["language"]
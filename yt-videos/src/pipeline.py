@@ -0,0 +1,440 @@
+"""
+Streaming Render Pipeline
+
+Overlaps transcription and rendering. Subtitle lines are finalized as
+Whisper decodes the audio; once enough lines have accumulated, that
+time range is rendered as a video-only segment in the background while
+transcription continues. Segments are joined without re-encoding and
+the audio is muxed in once at the end.
+
+The same machinery renders an already aligned recording as N segments
+in parallel FFmpeg processes (render_segmented), and re-renders only the
+segments whose subtitles changed since an earlier render
+(render_incremental). With a segment cache, finished segments of a
+streamed or segmented render are kept too, so a rerun after a failed
+encode renders only the segments that were missing.
+"""
+
+import bisect
+import dataclasses
+import math
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+
+from aligner import AlignmentResult, AudioAligner
+from cache import SegmentCache
+from renderer import RenderConfig, VideoRenderer
+from subtitle import LINE_END_BUFFER, SubtitleGenerator
+from timings import WordTiming, WordTimings
+
+# Minimum length of a streamed segment (seconds)
+DEFAULT_SEGMENT_SECONDS = 60.0
+
+# Segment renders running at once while streaming
+STREAM_RENDER_WORKERS = 2
+
+# Shortest segment worth a separate FFmpeg process (seconds)
+MIN_PARALLEL_SEGMENT_SECONDS = 10.0
+
+# Length of cached segments in incremental renders: an edit re-encodes
+# about this much video
+INCREMENTAL_SEGMENT_SECONDS = 20.0
+
+
+@dataclass
+class IncrementalRender:
+    """Outcome of render_incremental."""
+    output_path: str
+    segments: int
+    rendered: int   # Segments encoded in this run (the rest came from the cache)
+
+    @property
+    def reused(self) -> int:
+        return self.segments - self.rendered
+
+
+class StreamingPipeline:
+    """
+    Renders completed time ranges while later audio is still being
+    transcribed.
+
+    Segments are cut only where no subtitle line is on screen, on exact
+    frame and centisecond boundaries, so joins have no visual seams or
+    drift.
+    """
+
+    def __init__(
+        self,
+        generator: SubtitleGenerator,
+        renderer: VideoRenderer,
+        work_dir: str,
+        segment_seconds: float = DEFAULT_SEGMENT_SECONDS,
+        render_workers: int = STREAM_RENDER_WORKERS,
+        on_segment: Optional[Callable[[int, float, float], None]] = None,
+        cache: Optional[SegmentCache] = None
+    ):
+        """
+        Args:
+            generator: Subtitle generator (style and line grouping)
+            renderer: Video renderer (format and encoder settings)
+            work_dir: Directory for segment subtitles and videos
+            segment_seconds: Minimum segment length
+            render_workers: FFmpeg segment renders running at once
+            on_segment: Called with (index, start, end) when a segment
+                is submitted for rendering
+            cache: Optional segment cache; finished segments are stored
+                as they complete and reused by later runs
+        """
+        self.generator = generator
+        self.renderer = renderer
+        self.work_dir = Path(work_dir)
+        self.segment_seconds = segment_seconds
+        self.render_workers = render_workers
+        self.on_segment = on_segment
+        self.cache = cache
+
+    def run(
+        self,
+        words: Iterable[WordTiming],
+        duration: float,
+        audio_path: str,
+        output_path: str
+    ) -> WordTimings:
+        """
+        Consume words as they arrive and render the video.
+
+        Args:
+            words: Word timings, in order (may be a live iterator)
+            duration: Audio duration in seconds
+            audio_path: Path to audio file
+            output_path: Where to save the video
+
+        Returns:
+            All consumed words
+        """
+        fps = self.renderer.config.fps
+        grid = math.gcd(fps, 100)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+
+        all_words: List[WordTiming] = []
+        pending: List[WordTiming] = []       # Words of the unfinished line
+        segment_lines: List[WordTimings] = []
+        segment_start = 0.0
+        futures: List[Future] = []
+
+        with ThreadPoolExecutor(max_workers=self.render_workers) as pool:
+            def submit(lines: List[WordTimings], start: float, end: float):
+                index = len(futures)
+                futures.append(pool.submit(
+                    self._render_segment, index, lines, start, end
+                ))
+                if self.on_segment:
+                    self.on_segment(index, start, end)
+
+            for word in words:
+                all_words.append(word)
+                pending.append(word)
+
+                # All but the last group are final once a later word exists
+                lines = self.generator._group_words(pending)
+                if len(lines) < 2:
+                    continue
+                pending = list(lines[-1])
+
+                for line in lines[:-1]:
+                    segment_lines.append(line)
+                    line_end = line[-1].end + LINE_END_BUFFER
+                    if line_end - segment_start < self.segment_seconds:
+                        continue
+
+                    # Cut before the next line appears, on a time that is a
+                    # whole number of both frames and centiseconds (ASS
+                    # precision), so slices start exactly on a frame
+                    cut = math.ceil(line_end * grid) / grid
+                    next_start = pending[0].start
+                    if cut > next_start:
+                        continue
+
+                    submit(segment_lines, segment_start, cut)
+                    segment_lines = []
+                    segment_start = cut
+
+            if pending:
+                segment_lines.extend(self.generator._group_words(pending))
+
+            # Last segment runs to the end of the audio
+            end = math.ceil(duration * fps) / fps
+            submit(segment_lines, segment_start, max(end, segment_start + 1 / fps))
+
+            segment_paths = [future.result() for future in futures]
+
+        self.renderer.concat_segments(segment_paths, audio_path, output_path)
+        return WordTimings.from_words(all_words)
+
+    def _render_segment(
+        self,
+        index: int,
+        lines: List[WordTimings],
+        start: float,
+        end: float
+    ) -> str:
+        """Write the ASS slice for [start, end) and render it."""
+        subtitle_path = self.work_dir / f"segment_{index:04d}.ass"
+        video_path = self.work_dir / f"segment_{index:04d}.mp4"
+
+        self.generator.generate_lines(lines, str(subtitle_path))
+        if self.cache:
+            key = self.cache.key(str(subtitle_path), self.renderer.config, start, end)
+            cached = self.cache.get(key)
+            if cached:
+                return cached
+
+        path = self.renderer.render_video_segment(
+            str(subtitle_path), str(video_path), end - start, start=start
+        )
+        return self.cache.put(key, path) if self.cache else path
+
+
+def render_segmented(
+    generator: SubtitleGenerator,
+    renderer: VideoRenderer,
+    words: Iterable[WordTiming],
+    duration: float,
+    audio_path: str,
+    output_path: str,
+    work_dir: str,
+    workers: Optional[int] = None,
+    on_segment: Optional[Callable[[int, float, float], None]] = None,
+    cache: Optional[SegmentCache] = None
+) -> str:
+    """
+    Render an aligned recording as parallel segments.
+
+    The timeline is split into about one segment per worker, cut only
+    between subtitle lines on frame boundaries. Each segment is rendered
+    from its own ASS slice by a separate FFmpeg process with the same
+    encoder settings (CPU threads split evenly between them), then the
+    segments are stream-copied together and the audio is encoded once
+    over the whole timeline, so joins have no seams or A/V drift.
+
+    Args:
+        generator: Subtitle generator
+        renderer: Video renderer (format and encoder settings)
+        words: Word timings, in order
+        duration: Audio duration in seconds
+        audio_path: Path to audio file
+        output_path: Where to save the video
+        work_dir: Directory for segment files
+        workers: Parallel FFmpeg processes (default: CPU count)
+        on_segment: Called with (index, start, end) per segment
+        cache: Optional segment cache, so a rerun after a failure
+            reuses the segments that finished
+
+    Returns:
+        Path to rendered video
+    """
+    workers = workers or os.cpu_count() or 1
+    config = _split_threads(renderer.config, workers)
+
+    pipeline = StreamingPipeline(
+        generator,
+        VideoRenderer(config, audio_tracks=renderer.audio_tracks),
+        work_dir,
+        segment_seconds=max(MIN_PARALLEL_SEGMENT_SECONDS, duration / workers),
+        render_workers=workers,
+        on_segment=on_segment,
+        cache=cache
+    )
+    pipeline.run(words, duration, audio_path, output_path)
+    return output_path
+
+
+def plan_cuts(
+    lines: List[WordTimings],
+    duration: float,
+    fps: int,
+    segment_seconds: float
+) -> List[float]:
+    """
+    Segment boundaries anchored to a fixed time grid.
+
+    For each multiple of segment_seconds, the cut goes in the first gap
+    between lines at or after it, on a time that is a whole number of
+    frames and centiseconds. Targets don't depend on earlier cuts, so
+    editing or re-timing a line moves at most the cuts next to it and
+    the rest of the timeline is split exactly as before.
+
+    Args:
+        lines: Display lines (as returned by _group_words)
+        duration: Audio duration in seconds
+        fps: Frame rate
+        segment_seconds: Target segment length
+
+    Returns:
+        Boundaries from 0 to the end of the video, ascending
+    """
+    grid = math.gcd(fps, 100)
+    end = max(math.ceil(duration * fps) / fps, 1 / fps)
+    cuts = [0.0]
+    target = segment_seconds
+
+    for line, following in zip(lines, lines[1:]):
+        line_end = float(line.ends[-1]) + LINE_END_BUFFER
+        if line_end < target:
+            continue
+        cut = math.ceil(line_end * grid) / grid
+        if cut > following.starts[0] or cut <= cuts[-1] or cut >= end:
+            continue
+        cuts.append(cut)
+        target = (math.floor(cut / segment_seconds) + 1) * segment_seconds
+
+    cuts.append(end)
+    return cuts
+
+
+def render_incremental(
+    generator: SubtitleGenerator,
+    renderer: VideoRenderer,
+    words: Iterable[WordTiming],
+    duration: float,
+    audio_path: str,
+    output_path: str,
+    work_dir: str,
+    cache: Optional[SegmentCache] = None,
+    segment_seconds: float = INCREMENTAL_SEGMENT_SECONDS,
+    workers: Optional[int] = None,
+    on_segment: Optional[Callable[[int, float, float], None]] = None
+) -> IncrementalRender:
+    """
+    Render, re-encoding only segments that changed since earlier renders.
+
+    The timeline is cut with plan_cuts and every segment's ASS slice is
+    written. Segments whose slice, render settings and time range match
+    a cached segment are taken from the cache; the others are rendered
+    in parallel and added to it. The output is then rebuilt by stream
+    copy with the audio encoded once, as in render_segmented. After a
+    one-word fix only the segment holding that word is encoded again.
+
+    Args:
+        generator: Subtitle generator
+        renderer: Video renderer (format and encoder settings)
+        words: Word timings, in order
+        duration: Audio duration in seconds
+        audio_path: Path to audio file
+        output_path: Where to save the video
+        work_dir: Directory for segment subtitles and fresh renders
+        cache: Segment cache (default: shared on-disk cache)
+        segment_seconds: Target segment length
+        workers: Parallel FFmpeg processes for changed segments
+            (default: CPU count)
+        on_segment: Called with (index, start, end) per segment that
+            has to be rendered
+
+    Returns:
+        IncrementalRender with segment counts
+    """
+    cache = cache or SegmentCache()
+    workers = workers or os.cpu_count() or 1
+    config = _split_threads(renderer.config, workers)
+    segment_renderer = VideoRenderer(config)
+
+    work = Path(work_dir)
+    work.mkdir(parents=True, exist_ok=True)
+
+    lines = generator._group_words(words)
+    cuts = plan_cuts(lines, duration, config.fps, segment_seconds)
+    line_starts = [float(line.starts[0]) for line in lines]
+    bounds = (
+        [0]
+        + [bisect.bisect_left(line_starts, cut) for cut in cuts[1:-1]]
+        + [len(lines)]
+    )
+
+    segment_paths: List[Optional[str]] = []
+    missing = []
+    for index, (start, end) in enumerate(zip(cuts, cuts[1:])):
+        subtitle_path = str(work / f"segment_{index:04d}.ass")
+        generator.generate_lines(lines[bounds[index]:bounds[index + 1]], subtitle_path)
+        key = cache.key(subtitle_path, config, start, end)
+        segment_paths.append(cache.get(key))
+        if segment_paths[-1] is None:
+            missing.append((index, key, subtitle_path, start, end))
+
+    def render(index: int, key: str, subtitle_path: str, start: float, end: float) -> str:
+        video_path = segment_renderer.render_video_segment(
+            subtitle_path, str(work / f"segment_{index:04d}.mp4"), end - start, start=start
+        )
+        return cache.put(key, video_path)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for index, key, subtitle_path, start, end in missing:
+            futures.append((index, pool.submit(render, index, key, subtitle_path, start, end)))
+            if on_segment:
+                on_segment(index, start, end)
+        for index, future in futures:
+            segment_paths[index] = future.result()
+
+    renderer.concat_segments(segment_paths, audio_path, output_path)
+
+    return IncrementalRender(
+        output_path=output_path,
+        segments=len(segment_paths),
+        rendered=len(missing)
+    )
+
+
+def _split_threads(config: RenderConfig, workers: int) -> RenderConfig:
+    """Copy of config with CPU threads divided between parallel FFmpeg processes."""
+    return dataclasses.replace(
+        config,
+        threads=config.threads or max(1, (os.cpu_count() or 1) // workers)
+    )
+
+
+def render_streaming(
+    aligner: AudioAligner,
+    generator: SubtitleGenerator,
+    renderer: VideoRenderer,
+    audio_path: str,
+    output_path: str,
+    work_dir: str,
+    transcript: Optional[str] = None,
+    **pipeline_options
+) -> AlignmentResult:
+    """
+    Align and render with transcription and rendering overlapped.
+
+    With a transcript, the whole Whisper pass must finish before words
+    can be mapped onto the script, so only the segment renders overlap.
+
+    Args:
+        aligner: Audio aligner
+        generator: Subtitle generator
+        renderer: Video renderer
+        audio_path: Path to audio file
+        output_path: Where to save the video
+        work_dir: Directory for intermediate files
+        transcript: Optional known transcript
+        **pipeline_options: Passed to StreamingPipeline
+
+    Returns:
+        AlignmentResult of the words that were rendered
+    """
+    if transcript:
+        result = aligner.align_with_transcript(audio_path, transcript)
+        duration, words = result.duration, iter(result.words)
+    else:
+        duration, words = aligner.stream(audio_path)
+
+    pipeline = StreamingPipeline(generator, renderer, work_dir, **pipeline_options)
+    rendered = pipeline.run(words, duration, audio_path, output_path)
+
+    return AlignmentResult(
+        words=rendered,
+        duration=duration,
+        transcript=transcript or " ".join(rendered.texts())
+    )
@@ -0,0 +1,201 @@
+"""
+Per-Stage Profiling
+
+Records wall time, CPU time (this process and finished child processes
+such as FFmpeg) and peak memory for each pipeline stage, with real-time
+factors against the audio length. Optionally dumps a cProfile file per
+stage for a closer look.
+"""
+
+import cProfile
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+@dataclass
+class StageStats:
+    """Measurements of one stage."""
+    name: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0            # This process, all threads
+    children_cpu_seconds: float = 0.0   # Child processes that exited (FFmpeg)
+    peak_rss_mb: Optional[float] = None
+    children_peak_rss_mb: Optional[float] = None
+    audio_seconds: Optional[float] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+    profile_path: Optional[str] = None
+
+    @property
+    def real_time_factor(self) -> Optional[float]:
+        """Wall seconds per second of audio (below 1 = faster than real time)."""
+        if not self.audio_seconds:
+            return None
+        return self.wall_seconds / self.audio_seconds
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["real_time_factor"] = self.real_time_factor
+        return {k: _rounded(v) for k, v in data.items()}
+
+
+def _rounded(value):
+    """Round floats for the report (drops float noise like -1e-18)."""
+    if isinstance(value, float):
+        return round(value, 6) + 0.0
+    if isinstance(value, dict):
+        return {k: _rounded(v) for k, v in value.items()}
+    return value
+
+
+def _maxrss_mb(who) -> Optional[float]:
+    """Peak RSS from getrusage (KB on Linux, bytes on macOS)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _reset_peak_rss() -> bool:
+    """Reset this process's peak RSS (Linux only). True on success."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb(reset: bool) -> Optional[float]:
+    """Peak RSS since the last reset, or over the process lifetime."""
+    if reset:
+        try:
+            with open("/proc/self/status") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            pass
+    return _maxrss_mb(resource.RUSAGE_SELF) if resource else None
+
+
+class Profiler:
+    """
+    Collects StageStats for named stages.
+
+    Usage:
+        profiler = Profiler()
+        with profiler.stage("align") as stats:
+            result = aligner.align(audio)
+            stats.audio_seconds = result.duration
+        profiler.write_json("profile.json")
+
+    With reset_peak_rss on Linux, the peak RSS is reset at the start of
+    each stage, so it is per stage; otherwise it is the process peak so
+    far. Child peak RSS is the largest child process that has exited so
+    far.
+    """
+
+    def __init__(self, cprofile_dir: Optional[str] = None, reset_peak_rss: bool = True):
+        """
+        Args:
+            cprofile_dir: If set, dump a cProfile file per stage here
+            reset_peak_rss: Reset the peak RSS per stage (writes
+                /proc/self/clear_refs, which also clears the kernel's
+                referenced bits; only worth it when the stats are used)
+        """
+        self.cprofile_dir = Path(cprofile_dir) if cprofile_dir else None
+        self.reset_peak_rss = reset_peak_rss
+        self.stages: List[StageStats] = []
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str, audio_seconds: Optional[float] = None) -> Iterator[StageStats]:
+        """Measure the enclosed block as one stage."""
+        stats = StageStats(name=name, audio_seconds=audio_seconds)
+        reset = self.reset_peak_rss and _reset_peak_rss()
+        children = resource.getrusage(resource.RUSAGE_CHILDREN) if resource else None
+
+        profile = None
+        if self.cprofile_dir:
+            profile = cProfile.Profile()
+
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        if profile:
+            profile.enable()
+        try:
+            yield stats
+        finally:
+            if profile:
+                profile.disable()
+            stats.wall_seconds = time.perf_counter() - wall
+            stats.cpu_seconds = time.process_time() - cpu
+            stats.peak_rss_mb = _peak_rss_mb(reset)
+            if children is not None:
+                after = resource.getrusage(resource.RUSAGE_CHILDREN)
+                stats.children_cpu_seconds = (
+                    after.ru_utime + after.ru_stime
+                    - children.ru_utime - children.ru_stime
+                )
+                stats.children_peak_rss_mb = _maxrss_mb(resource.RUSAGE_CHILDREN)
+
+            if profile:
+                self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+                path = self.cprofile_dir / f"{len(self.stages):02d}_{name}.prof"
+                profile.dump_stats(str(path))
+                stats.profile_path = str(path)
+
+            self.stages.append(stats)
+
+    def summary(self, audio_seconds: Optional[float] = None) -> dict:
+        """
+        All stages plus totals.
+
+        Args:
+            audio_seconds: Audio length, for the overall real-time factor
+                (defaults to the longest stage audio length)
+        """
+        if audio_seconds is None:
+            audio_seconds = max(
+                (s.audio_seconds for s in self.stages if s.audio_seconds),
+                default=None
+            )
+        wall = time.perf_counter() - self._started
+        return {
+            "stages": [s.to_dict() for s in self.stages],
+            "total": _rounded({
+                "wall_seconds": wall,
+                "stage_wall_seconds": sum(s.wall_seconds for s in self.stages),
+                "cpu_seconds": sum(s.cpu_seconds for s in self.stages),
+                "children_cpu_seconds": sum(s.children_cpu_seconds for s in self.stages),
+                "peak_rss_mb": _maxrss_mb(resource.RUSAGE_SELF) if resource else None,
+                "audio_seconds": audio_seconds,
+                "real_time_factor": wall / audio_seconds if audio_seconds else None,
+                "cpu_count": os.cpu_count(),
+            }),
+        }
+
+    def write_json(self, path: str, audio_seconds: Optional[float] = None, **metadata) -> str:
+        """
+        Write summary() (plus any metadata fields) as JSON.
+
+        Returns:
+            Path to the file
+        """
+        data = dict(metadata)
+        data.update(self.summary(audio_seconds))
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        return str(target)
@@ -4,13 +4,33 @@ Video Renderer using FFmpeg
 Renders final video from audio + subtitles.
 """
 
+import math
 import subprocess
 import shutil
+import tempfile
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from queue import Empty, Queue
+from typing import Callable, List, Optional, Tuple
 from enum import Enum
 
+from audio_store import AudioTrackStore
+from subtitle import KaraokeTimeline
+from vfr import CLIP_SECONDS, plan_frames
+
+# Proxy renders: same subtitles, quarter size, low frame rate
+PROXY_SCALE = 0.25
+PROXY_FPS = 10
+
+# Lines of FFmpeg stderr kept for error messages
+STDERR_TAIL_LINES = 100
+
+# Abort an encode whose output time hasn't advanced for this long (seconds)
+DEFAULT_STALL_TIMEOUT = 300.0
+
 
 class VideoFormat(Enum):
     """Video format/aspect ratio."""
@@ -18,6 +38,14 @@ class VideoFormat(Enum):
     LONG = "long"    # 16:9 (1920x1080) - Standard YouTube
 
 
+# x264 preset and CRF per render quality
+QUALITY_PRESETS = {
+    "fast": ("ultrafast", 28),
+    "medium": ("medium", 23),
+    "high": ("slow", 18)
+}
+
+
 @dataclass
 class RenderConfig:
     """Video rendering configuration."""
@@ -29,14 +57,186 @@ class RenderConfig:
     audio_bitrate: str = "192k"
     crf: int = 23  # Quality (lower = better, 18-28 range)
     preset: str = "medium"  # Encoding speed (ultrafast to veryslow)
+    vfr: bool = False  # Only encode frames where the subtitles change
+    threads: int = 0  # Encoder threads per FFmpeg process (0 = auto)
+    scale: float = 1.0  # Output size relative to the format (proxy renders)
     
     @property
     def width(self) -> int:
-        return 1080 if self.format == VideoFormat.SHORT else 1920
+        return _scaled(1080 if self.format == VideoFormat.SHORT else 1920, self.scale)
     
     @property
     def height(self) -> int:
-        return 1920 if self.format == VideoFormat.SHORT else 1080
+        return _scaled(1920 if self.format == VideoFormat.SHORT else 1080, self.scale)
+
+
+def _scaled(size: int, scale: float) -> int:
+    """Scale a dimension, keeping it even (required by yuv420p)."""
+    return max(2, int(round(size * scale / 2)) * 2)
+
+
+@dataclass
+class RenderProgress:
+    """One FFmpeg progress report."""
+    frame: int = 0
+    fps: float = 0.0
+    speed: float = 0.0        # Encoded seconds per wall-clock second
+    out_time: float = 0.0     # Seconds of output written
+    total: Optional[float] = None   # Expected output length (seconds)
+    elapsed: float = 0.0      # Wall-clock seconds since FFmpeg started
+    done: bool = False
+    
+    @property
+    def fraction(self) -> Optional[float]:
+        if not self.total:
+            return None
+        return min(1.0, self.out_time / self.total)
+    
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds left, from the average speed so far."""
+        if not self.total or self.out_time <= 0:
+            return None
+        return max(0.0, self.total - self.out_time) * self.elapsed / self.out_time
+
+
+def _parse_progress(fields: dict, progress: RenderProgress):
+    """Update progress from one block of FFmpeg -progress key=value lines."""
+    def number(key: str, cast=float):
+        try:
+            return cast(fields[key].strip().rstrip("x"))
+        except (KeyError, ValueError):
+            return None
+    
+    frame = number("frame", int)
+    fps = number("fps")
+    speed = number("speed")
+    out_time_us = number("out_time_us", int)
+    
+    if frame is not None:
+        progress.frame = frame
+    if fps is not None:
+        progress.fps = fps
+    if speed is not None:
+        progress.speed = speed
+    if out_time_us is not None and out_time_us >= 0:
+        progress.out_time = out_time_us / 1e6
+    progress.done = fields.get("progress") == "end"
+
+
+def run_ffmpeg(
+    cmd: List[str],
+    duration: Optional[float] = None,
+    on_progress: Optional[Callable[[RenderProgress], None]] = None,
+    stall_timeout: Optional[float] = DEFAULT_STALL_TIMEOUT
+):
+    """
+    Run an FFmpeg command with live progress and bounded log capture.
+    
+    FFmpeg writes machine-readable progress (-progress) to stdout, which
+    is parsed into RenderProgress reports as they arrive. Only the last
+    STDERR_TAIL_LINES lines of stderr are kept, so memory stays constant
+    however long the encode runs.
+    
+    Args:
+        cmd: FFmpeg command (starting with "ffmpeg")
+        duration: Expected output length, for fraction/ETA
+        on_progress: Called with each progress report
+        stall_timeout: Kill FFmpeg if its output time doesn't advance for
+            this many seconds (None to wait forever)
+    
+    Raises:
+        RuntimeError: If FFmpeg fails or stalls (with the stderr tail)
+    """
+    cmd = [cmd[0], "-nostats", "-progress", "pipe:1"] + cmd[1:]
+    process = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace"
+    )
+    
+    stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+    blocks: Queue = Queue()
+    
+    def read_stderr():
+        for line in process.stderr:
+            stderr_tail.append(line)
+    
+    def read_progress():
+        fields = {}
+        for line in process.stdout:
+            key, _, value = line.strip().partition("=")
+            fields[key] = value
+            if key == "progress":
+                blocks.put(fields)
+                fields = {}
+        blocks.put(None)
+    
+    readers = [
+        threading.Thread(target=read_stderr, daemon=True),
+        threading.Thread(target=read_progress, daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+    
+    started = last_advance = time.monotonic()
+    progress = RenderProgress(total=duration)
+    stalled = False
+    
+    while True:
+        try:
+            fields = blocks.get(timeout=1.0)
+        except Empty:
+            fields = {}
+        if fields is None:
+            break
+        
+        now = time.monotonic()
+        if fields:
+            previous = (progress.frame, progress.out_time)
+            _parse_progress(fields, progress)
+            progress.elapsed = now - started
+            if (progress.frame, progress.out_time) != previous:
+                last_advance = now
+            if on_progress:
+                on_progress(progress)
+        
+        if stall_timeout and now - last_advance > stall_timeout:
+            stalled = True
+            process.kill()
+            break
+    
+    process.wait()
+    for reader in readers:
+        reader.join(timeout=5)
+    
+    tail = "".join(stderr_tail)[-2000:]
+    if stalled:
+        raise RuntimeError(
+            f"FFmpeg stalled (no progress for {stall_timeout:.0f}s):\n{tail}"
+        )
+    if process.returncode != 0:
+        raise RuntimeError(f"FFmpeg failed:\n{tail}")
+
+
+def _escape_filter_path(path: str) -> str:
+    """
+    Escape a file path for use inside an FFmpeg filter argument.
+    
+    On Windows, need to escape colons and backslashes.
+    """
+    return path.replace("\\", "/").replace(":", "\\:")
+
+
+@dataclass
+class RenderVariant:
+    """One output of a multi-variant render."""
+    config: RenderConfig
+    subtitle_path: str
+    output_path: str
 
 
 class VideoRenderer:
@@ -49,8 +249,28 @@ class VideoRenderer:
     - ASS subtitles (burned in)
     """
     
-    def __init__(self, config: Optional[RenderConfig] = None):
+    def __init__(
+        self,
+        config: Optional[RenderConfig] = None,
+        on_progress: Optional[Callable[[RenderProgress], None]] = None,
+        stall_timeout: Optional[float] = DEFAULT_STALL_TIMEOUT,
+        audio_tracks: Optional[AudioTrackStore] = None
+    ):
+        """
+        Args:
+            config: Render settings
+            on_progress: Called with progress reports of the main encode
+                (render, render_vfr, render_video_segment)
+            stall_timeout: Abort FFmpeg runs that stop making progress
+                for this many seconds (None to disable)
+            audio_tracks: If set, audio is stream-copied from the source
+                (when already in the output codec) or from a cached
+                encode instead of being encoded in every render
+        """
         self.config = config or RenderConfig()
+        self.on_progress = on_progress
+        self.stall_timeout = stall_timeout
+        self.audio_tracks = audio_tracks
         self._check_ffmpeg()
     
     def _check_ffmpeg(self):
@@ -68,7 +288,8 @@ class VideoRenderer:
         audio_path: str,
         subtitle_path: str,
         output_path: str,
-        duration: Optional[float] = None
+        duration: Optional[float] = None,
+        timeline: Optional[KaraokeTimeline] = None
     ) -> str:
         """
         Render video with audio and subtitles.
@@ -78,15 +299,23 @@ class VideoRenderer:
             subtitle_path: Path to .ass subtitle file
             output_path: Where to save the video
             duration: Optional duration override (seconds)
+            timeline: Subtitle change points; with config.vfr and a
+                duration, only frames where the picture changes are
+                encoded (see render_vfr)
         
         Returns:
             Path to rendered video
         """
         c = self.config
         
+        if c.vfr and timeline is not None and duration:
+            return self.render_vfr(
+                audio_path, subtitle_path, output_path, duration, timeline
+            )
+        
         # Escape subtitle path for FFmpeg filter
-        # On Windows, need to escape colons and backslashes
-        sub_path_escaped = subtitle_path.replace("\\", "/").replace(":", "\\:")
+        sub_path_escaped = _escape_filter_path(subtitle_path)
+        audio_path, audio_args = self._audio(audio_path)
         
         # Build FFmpeg command
         cmd = [
@@ -99,6 +328,8 @@ class VideoRenderer:
             
             # Input 2: Audio file
             "-i", audio_path,
+            "-map", "0:v:0",
+            "-map", "1:a:0",
             
             # Video filter: burn in subtitles
             "-vf", f"subtitles='{sub_path_escaped}'",
@@ -110,11 +341,11 @@ class VideoRenderer:
             "-c:v", c.video_codec,
             "-preset", c.preset,
             "-crf", str(c.crf),
+            "-threads", str(c.threads),
             "-pix_fmt", "yuv420p",  # Compatibility
             
-            # Audio encoding
-            "-c:a", c.audio_codec,
-            "-b:a", c.audio_bitrate,
+            # Audio encoding (or stream copy)
+            *audio_args,
             
             # Output
             output_path
@@ -126,19 +357,377 @@ class VideoRenderer:
             cmd.insert(2, str(duration + 1))  # Small buffer
         
         # Run FFmpeg
-        print(f"  Running FFmpeg...")
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True
+        if not self.on_progress:
+            print(f"  Running FFmpeg...")
+        self._run(cmd, duration)
+        
+        return output_path
+    
+    def render_vfr(
+        self,
+        audio_path: str,
+        subtitle_path: str,
+        output_path: str,
+        duration: float,
+        timeline: KaraokeTimeline
+    ) -> str:
+        """
+        Render with a variable frame rate.
+        
+        Frames stay on the constant-rate grid, but a frame is only
+        encoded when the subtitles change: static stretches become one
+        long frame and highlight sweeps run at full rate. Keyframes are
+        placed on line changes. The result looks the same as render().
+        
+        Args:
+            audio_path: Path to audio file
+            subtitle_path: Path to .ass subtitle file
+            output_path: Where to save the video
+            duration: Audio duration (seconds)
+            timeline: Change points from SubtitleGenerator.timeline()
+        
+        Returns:
+            Path to rendered video
+        """
+        c = self.config
+        plan = plan_frames(timeline, duration, c.fps)
+        clip_frames = CLIP_SECONDS * c.fps
+        audio_path, audio_args = self._audio(audio_path)
+        
+        with tempfile.TemporaryDirectory(prefix="ytvideo_vfr_") as work_dir:
+            # Blank all-intra clip, so it can be cut at any frame
+            clip_path = str(Path(work_dir) / "blank.mkv")
+            self._run([
+                "ffmpeg",
+                "-y",
+                "-f", "lavfi",
+                "-i", f"color=c={c.background_color}:s={c.width}x{c.height}:r={c.fps}",
+                "-frames:v", str(clip_frames),
+                "-c:v", "libx264",
+                "-preset", "ultrafast",
+                "-qp", "0",
+                "-g", "1",
+                "-pix_fmt", "yuv420p",
+                clip_path
+            ])
+            
+            list_path = plan.write_concat_list(
+                str(Path(work_dir) / "frames.txt"), clip_path, clip_frames
+            )
+            
+            cmd = [
+                "ffmpeg",
+                "-y",
+                "-f", "concat",
+                "-safe", "0",
+                "-i", list_path,
+                "-i", audio_path,
+                "-map", "0:v:0",
+                "-map", "1:a:0",
+                "-vf", f"subtitles='{_escape_filter_path(subtitle_path)}'",
+                
+                # Keep the planned timestamps instead of filling to a fixed rate
+                "-fps_mode", "passthrough",
+                "-enc_time_base", "-1",
+                
+                "-c:v", c.video_codec,
+                "-preset", c.preset,
+                "-crf", str(c.crf),
+                "-threads", str(c.threads),
+                "-pix_fmt", "yuv420p",
+                *audio_args,
+                "-shortest",
+                output_path
+            ]
+            keyframes = plan.keyframe_times()
+            if keyframes:
+                cmd[-1:-1] = ["-force_key_frames", ",".join(keyframes)]
+            
+            if not self.on_progress:
+                print(f"  Running FFmpeg (VFR, {plan.encoded_frames}/{plan.total_frames} frames)...")
+            self._run(cmd, duration)
+        
+        return output_path
+    
+    def render_variants(
+        self,
+        audio_path: str,
+        variants: List[RenderVariant],
+        duration: float
+    ) -> List[str]:
+        """
+        Render several variants (formats, colors, qualities) in one FFmpeg run.
+        
+        Each variant gets its own background and subtitle branch in one
+        filter graph and its own encoder and output. The audio input is
+        read once; with audio_tracks it is copied into every output,
+        so it is also encoded at most once per bitrate (and cached).
+        Variants always use a constant frame rate.
+        
+        Args:
+            audio_path: Path to audio file
+            variants: Outputs to produce, each with its own config
+            duration: Audio duration (seconds)
+        
+        Returns:
+            Output paths, in variant order
+        """
+        # One audio input per distinct track (variants may differ in bitrate)
+        inputs: List[str] = []
+        audio_inputs = []
+        for variant in variants:
+            c = variant.config
+            if self.audio_tracks:
+                track = self.audio_tracks.track(audio_path, c.audio_codec, c.audio_bitrate)
+                audio_args = ["-c:a", "copy"]
+            else:
+                track = audio_path
+                audio_args = ["-c:a", c.audio_codec, "-b:a", c.audio_bitrate]
+            if track not in inputs:
+                inputs.append(track)
+            audio_inputs.append((inputs.index(track), audio_args))
+        
+        graph = ";".join(
+            f"color=c={v.config.background_color}:s={v.config.width}x{v.config.height}"
+            f":r={v.config.fps}:d={duration},"
+            f"subtitles='{_escape_filter_path(v.subtitle_path)}'[v{i}]"
+            for i, v in enumerate(variants)
         )
         
-        if result.returncode != 0:
-            error_msg = result.stderr[-2000:] if len(result.stderr) > 2000 else result.stderr
-            raise RuntimeError(f"FFmpeg failed:\n{error_msg}")
+        cmd = ["ffmpeg", "-y"]
+        for track in inputs:
+            cmd += ["-i", track]
+        cmd += ["-filter_complex", graph]
         
+        for i, (variant, (audio_index, audio_args)) in enumerate(zip(variants, audio_inputs)):
+            c = variant.config
+            cmd += [
+                "-map", f"[v{i}]",
+                "-map", f"{audio_index}:a:0",
+                "-c:v", c.video_codec,
+                "-preset", c.preset,
+                "-crf", str(c.crf),
+                "-threads", str(c.threads),
+                "-pix_fmt", "yuv420p",
+                *audio_args,
+                "-shortest",
+                variant.output_path
+            ]
+        
+        if not self.on_progress:
+            print(f"  Running FFmpeg ({len(variants)} variants)...")
+        self._run(cmd, duration)
+        
+        return [v.output_path for v in variants]
+    
+    def render_video_segment(
+        self,
+        subtitle_path: str,
+        output_path: str,
+        duration: float,
+        start: float = 0.0
+    ) -> str:
+        """
+        Render a video-only slice of the timeline (no audio).
+        
+        The slice is an exact number of frames so consecutive segments
+        join without drift. Subtitle times are absolute: frames are
+        stamped with their timeline position while the subtitles are
+        burned, so libass sees exactly the times it would in a full
+        render (it truncates to milliseconds, so relative times can land
+        an event end one frame off), and restamped from zero afterwards.
+        
+        Args:
+            subtitle_path: Path to .ass file for this slice
+            output_path: Where to save the segment
+            duration: Slice length in seconds
+            start: Slice start in the timeline (a whole number of frames)
+        
+        Returns:
+            Path to rendered segment
+        """
+        c = self.config
+        frames = max(1, round(duration * c.fps))
+        first_frame = round(start * c.fps)
+        
+        burn = f"subtitles='{_escape_filter_path(subtitle_path)}'"
+        if first_frame:
+            burn = f"setpts=PTS+{first_frame},{burn},setpts=PTS-STARTPTS"
+        
+        cmd = [
+            "ffmpeg",
+            "-y",
+            "-f", "lavfi",
+            "-i", f"color=c={c.background_color}:s={c.width}x{c.height}:r={c.fps}",
+            "-vf", burn,
+            "-frames:v", str(frames),
+            "-r", str(c.fps),
+            "-c:v", c.video_codec,
+            "-preset", c.preset,
+            "-crf", str(c.crf),
+            "-threads", str(c.threads),
+            "-pix_fmt", "yuv420p",
+            "-an",
+            output_path
+        ]
+        
+        self._run(cmd, duration)
         return output_path
     
+    def render_frames(
+        self,
+        subtitle_path: str,
+        output_path: str,
+        times: List[float],
+        columns: int = 1,
+        scale: float = 1.0,
+        history: Optional[List[List[float]]] = None
+    ) -> str:
+        """
+        Render still frames of the timeline to an image (no video encode).
+        
+        Each time is snapped to the frame on screen at that moment, and
+        the subtitles are burned onto a background frame stamped with
+        that position (as in render_video_segment). libass fixes a
+        line's position when it appears, moving it clear of lines still
+        on screen, so the frames where earlier lines appeared are
+        rendered first (from history) and dropped. Several times are
+        tiled into a contact sheet, row by row.
+        
+        Args:
+            subtitle_path: .ass file with absolute event times
+            output_path: Image to write (.png or .jpg)
+            times: Timeline positions in seconds
+            columns: Contact sheet columns
+            scale: Size of each frame relative to the video
+            history: For each time, when the lines that can affect its
+                layout appeared (seconds)
+        
+        Returns:
+            Path to the image
+        """
+        c = self.config
+        burn = f"subtitles='{_escape_filter_path(subtitle_path)}'"
+        
+        branches = []
+        for index, t in enumerate(times):
+            frame = int(t * c.fps + 1e-6)
+            appeared = history[index] if history else []
+            # First frame showing each line (libass compares whole milliseconds)
+            frames = sorted(
+                {math.ceil(round(start * 1000) * c.fps / 1000 - 1e-6) for start in appeared}
+                | {frame}
+            )
+            frames = [f for f in frames if f <= frame]
+            picks = "+".join(f"eq(n\\,{f - frames[0]})" for f in frames)
+            branches.append(
+                f"color=c={c.background_color}:s={c.width}x{c.height}:r={c.fps},"
+                f"trim=end_frame={frame - frames[0] + 1},setpts=PTS+{frames[0]},"
+                f"select='{picks}',{burn},"
+                f"trim=start_frame={len(frames) - 1},setpts=PTS-STARTPTS[f{index}]"
+            )
+        
+        sheet = "".join(f"[f{i}]" for i in range(len(times)))
+        sheet += f"concat=n={len(times)}:v=1:a=0"
+        if scale != 1.0:
+            sheet += f",scale=trunc(iw*{scale}/2)*2:trunc(ih*{scale}/2)*2"
+        if len(times) > 1:
+            columns = max(1, min(columns, len(times)))
+            rows = -(-len(times) // columns)
+            sheet += f",tile={columns}x{rows}"
+        
+        cmd = [
+            "ffmpeg",
+            "-y",
+            "-filter_complex", ";".join(branches + [sheet + "[out]"]),
+            "-map", "[out]",
+            "-frames:v", "1",
+            "-update", "1",
+            output_path
+        ]
+        
+        self._run(cmd)
+        return output_path
+    
+    def concat_segments(
+        self,
+        segment_paths: List[str],
+        audio_path: str,
+        output_path: str
+    ) -> str:
+        """
+        Join video segments without re-encoding and add the audio.
+        
+        Segments are stream-copied through the concat demuxer; the audio
+        is encoded once over the whole timeline (or copied, see
+        audio_tracks), so there are no audio seams at segment joins.
+        
+        Args:
+            segment_paths: Segments from render_video_segment, in order
+            audio_path: Path to audio file
+            output_path: Where to save the video
+        
+        Returns:
+            Path to rendered video
+        """
+        audio_path, audio_args = self._audio(audio_path)
+        list_path = Path(output_path).with_suffix(".segments.txt")
+        list_path.write_text(
+            "".join(
+                f"file '{Path(p).resolve().as_posix()}'\n" for p in segment_paths
+            ),
+            encoding="utf-8"
+        )
+        
+        cmd = [
+            "ffmpeg",
+            "-y",
+            "-f", "concat",
+            "-safe", "0",
+            "-i", str(list_path),
+            "-i", audio_path,
+            "-map", "0:v:0",
+            "-map", "1:a:0",
+            "-c:v", "copy",
+            *audio_args,
+            "-shortest",
+            output_path
+        ]
+        
+        try:
+            self._run(cmd)
+        finally:
+            list_path.unlink(missing_ok=True)
+        
+        return output_path
+    
+    def _audio(self, audio_path: str) -> Tuple[str, List[str]]:
+        """
+        Audio input and codec arguments for a render.
+        
+        With audio_tracks, the input is a track in the output codec and
+        is copied; otherwise the audio is encoded.
+        """
+        c = self.config
+        if self.audio_tracks:
+            track = self.audio_tracks.track(audio_path, c.audio_codec, c.audio_bitrate)
+            return track, ["-c:a", "copy"]
+        return audio_path, ["-c:a", c.audio_codec, "-b:a", c.audio_bitrate]
+    
+    def _run(self, cmd: List[str], duration: Optional[float] = None):
+        """
+        Run an FFmpeg command, raising with the tail of stderr on failure.
+        
+        Progress is reported to on_progress only when the expected output
+        duration is given (the main encodes, not helper steps).
+        """
+        run_ffmpeg(
+            cmd,
+            duration=duration,
+            on_progress=self.on_progress if duration else None,
+            stall_timeout=self.stall_timeout
+        )
+    
     def render_simple(
         self,
         audio_path: str,
@@ -173,17 +762,16 @@ class VideoRenderer:
             output_path
         ]
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            raise RuntimeError(f"FFmpeg failed: {result.stderr}")
+        self._run(cmd)
         
         return output_path
 
 
 def create_render_config(
     format: str = "short",
-    quality: str = "medium"
+    quality: str = "medium",
+    vfr: bool = False,
+    proxy: bool = False
 ) -> RenderConfig:
     """
     Create render config.
@@ -191,24 +779,34 @@ def create_render_config(
     Args:
         format: "short" or "long"
         quality: "fast", "medium", or "high"
+        vfr: Variable frame rate (encode only changing frames)
+        proxy: Low-resolution review render (overrides quality). The
+            subtitle file is the same; libass scales it from PlayResX/Y
+            to the smaller frame, fonts and outlines included.
     
     Returns:
         RenderConfig
     """
     video_format = VideoFormat.SHORT if format == "short" else VideoFormat.LONG
     
-    preset_map = {
-        "fast": ("ultrafast", 28),
-        "medium": ("medium", 23),
-        "high": ("slow", 18)
-    }
+    if proxy:
+        return RenderConfig(
+            format=video_format,
+            fps=PROXY_FPS,
+            preset="ultrafast",
+            crf=30,
+            audio_bitrate="64k",
+            vfr=vfr,
+            scale=PROXY_SCALE
+        )
     
-    preset, crf = preset_map.get(quality, ("medium", 23))
+    preset, crf = QUALITY_PRESETS.get(quality, QUALITY_PRESETS["medium"])
     
     return RenderConfig(
         format=video_format,
         preset=preset,
-        crf=crf
+        crf=crf,
+        vfr=vfr
     )
 
 
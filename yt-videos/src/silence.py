@@ -0,0 +1,312 @@
+"""
+Silence Compression
+
+Shortens long pauses in a recording. Pauses are found from the word
+timings: wherever the gap between one word's end and the next word's
+start (or the start and end of the recording) is longer than a maximum,
+the middle of the gap is cut so that exactly that maximum is left.
+
+The result is an edit list of the source spans that are kept. It maps
+word timings onto the shorter timeline (for the subtitles) and back to
+the source (for anything that refers to the original recording), and
+drives the audio trim, so the video is rendered at the compressed
+length.
+"""
+
+import json
+import shutil
+import struct
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from timings import WordTiming, WordTimings
+
+# Fade applied on both sides of each cut, so joins don't click (seconds)
+FADE_SECONDS = 0.01
+
+# Pauses only just over the maximum aren't worth a join (seconds)
+MIN_CUT_SECONDS = 0.05
+
+# Samples copied per write when trimming audio
+CHUNK_FRAMES = 1 << 20
+
+
+@dataclass
+class EditList:
+    """
+    Source spans kept by silence compression, in order.
+
+    Span i covers source_starts[i]..source_ends[i] of the recording and
+    starts at output_starts[i] in the compressed timeline.
+    """
+    source_starts: np.ndarray
+    source_ends: np.ndarray
+    output_starts: np.ndarray
+    source_duration: float
+
+    @property
+    def duration(self) -> float:
+        """Length of the compressed timeline (seconds)."""
+        return float(np.sum(self.source_ends - self.source_starts))
+
+    @property
+    def removed(self) -> float:
+        """Seconds of silence cut."""
+        return self.source_duration - self.duration
+
+    def to_output(self, times: np.ndarray) -> np.ndarray:
+        """
+        Map source times onto the compressed timeline.
+
+        Times inside a cut land on the join it leaves.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        span = np.clip(np.searchsorted(self.source_starts, times, side="right") - 1, 0, None)
+        within = np.clip(times, self.source_starts[span], self.source_ends[span])
+        return self.output_starts[span] + within - self.source_starts[span]
+
+    def to_source(self, times: np.ndarray) -> np.ndarray:
+        """Map compressed-timeline times back to the source."""
+        times = np.asarray(times, dtype=np.float64)
+        span = np.clip(np.searchsorted(self.output_starts, times, side="right") - 1, 0, None)
+        return self.source_starts[span] + times - self.output_starts[span]
+
+    def apply(self, words: Union[WordTimings, Iterable[WordTiming]]) -> WordTimings:
+        """Word timings on the compressed timeline."""
+        words = WordTimings.coerce(words)
+        return WordTimings(
+            self.to_output(words.starts),
+            self.to_output(words.ends),
+            words.word_ids,
+            words.vocab,
+            words.probabilities
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "source_duration": self.source_duration,
+            "duration": self.duration,
+            "spans": [
+                [round(start, 6), round(end, 6), round(output, 6)]
+                for start, end, output in zip(
+                    self.source_starts.tolist(),
+                    self.source_ends.tolist(),
+                    self.output_starts.tolist()
+                )
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EditList":
+        spans = np.asarray(data["spans"], dtype=np.float64).reshape(-1, 3)
+        return cls(spans[:, 0], spans[:, 1], spans[:, 2], data["source_duration"])
+
+    def save(self, path: str) -> str:
+        """Write the edit list as JSON."""
+        Path(path).write_text(json.dumps(self.to_dict()), encoding="utf-8")
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "EditList":
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+def plan_silence_cuts(
+    words: Union[WordTimings, Iterable[WordTiming]],
+    duration: float,
+    max_pause: float
+) -> EditList:
+    """
+    Edit list that shortens every pause to at most max_pause.
+
+    Half of the remaining pause stays after the word before it and half
+    before the word after it; leading and trailing silence keep half.
+
+    Args:
+        words: Word timings of the recording
+        duration: Length of the recording (seconds)
+        max_pause: Longest pause to keep (seconds)
+
+    Returns:
+        EditList (a single span when nothing is cut)
+    """
+    words = WordTimings.coerce(words)
+    pad = max_pause / 2
+
+    if len(words) == 0:
+        cut_starts = np.empty(0)
+        cut_ends = np.empty(0)
+    else:
+        # Overlapping words: a pause starts after the latest end so far
+        ends = np.maximum.accumulate(words.ends)
+        gap_starts = np.concatenate(([-pad], ends))
+        gap_ends = np.concatenate((words.starts, [duration + pad]))
+        long = gap_ends - gap_starts > max_pause
+        cut_starts = np.maximum(gap_starts[long] + pad, 0.0)
+        cut_ends = np.minimum(gap_ends[long] - pad, duration)
+        keep = cut_ends - cut_starts >= MIN_CUT_SECONDS
+        cut_starts, cut_ends = cut_starts[keep], cut_ends[keep]
+
+    source_starts = np.concatenate(([0.0], cut_ends))
+    source_ends = np.concatenate((cut_starts, [duration]))
+    keep = source_ends > source_starts
+    source_starts, source_ends = source_starts[keep], source_ends[keep]
+    if len(source_starts) == 0:
+        source_starts, source_ends = np.zeros(1), np.zeros(1)
+
+    lengths = source_ends - source_starts
+    return EditList(
+        source_starts=source_starts,
+        source_ends=source_ends,
+        output_starts=np.cumsum(lengths) - lengths,
+        source_duration=duration
+    )
+
+
+def compress_silences(
+    words: Union[WordTimings, Iterable[WordTiming]],
+    duration: float,
+    max_pause: float
+) -> Tuple[WordTimings, EditList]:
+    """
+    Shorten pauses longer than max_pause.
+
+    Args:
+        words: Word timings of the recording
+        duration: Length of the recording (seconds)
+        max_pause: Longest pause to keep (seconds)
+
+    Returns:
+        (word timings on the compressed timeline, edit list)
+    """
+    edits = plan_silence_cuts(words, duration, max_pause)
+    return edits.apply(words), edits
+
+
+def _read_wav(path: str) -> Tuple[np.ndarray, int]:
+    """
+    Samples of a 16-bit PCM WAV (or RF64) file, memory-mapped.
+
+    Returns:
+        (int16 array of shape (frames, channels), sample rate)
+    """
+    size = Path(path).stat().st_size
+    with open(path, "rb") as f:
+        riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+        if riff not in (b"RIFF", b"RF64") or wave != b"WAVE":
+            raise RuntimeError(f"Not a WAV file: {path}")
+
+        channels = rate = bits = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise RuntimeError(f"No audio data in {path}")
+            chunk, length = struct.unpack("<4sI", header)
+            if chunk == b"fmt ":
+                fmt = f.read(length)
+                _, channels, rate = struct.unpack("<HHI", fmt[:8])
+                bits = struct.unpack("<H", fmt[14:16])[0]
+                f.seek(length % 2, 1)
+            elif chunk == b"data":
+                offset = f.tell()
+                # RF64 leaves the 32-bit size at its maximum; the data runs to the end
+                if length == 0xFFFFFFFF or offset + length > size:
+                    length = size - offset
+                break
+            else:
+                f.seek(length + length % 2, 1)
+
+    if bits != 16:
+        raise RuntimeError(f"Expected 16-bit PCM in {path}, got {bits}-bit")
+    frames = length // (2 * channels)
+    samples = np.memmap(path, dtype="<i2", mode="r", offset=offset, shape=(frames, channels))
+    return samples, rate
+
+
+def trim_audio(audio_path: str, edits: EditList, output_path: str) -> str:
+    """
+    Write the kept spans of a recording as one WAV file.
+
+    Each join gets a short fade out and in so cuts don't click.
+
+    Args:
+        audio_path: 16-bit PCM WAV of the recording (PCMStore playback track)
+        edits: Spans to keep
+        output_path: Where to write the trimmed WAV
+
+    Returns:
+        Path to the trimmed audio
+    """
+    if not shutil.which("ffmpeg"):
+        raise RuntimeError("FFmpeg not found; it is needed to write audio.")
+
+    samples, rate = _read_wav(audio_path)
+    fade = max(1, int(FADE_SECONDS * rate))
+
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-v", "error",
+        "-f", "s16le",
+        "-ar", str(rate),
+        "-ac", str(samples.shape[1]),
+        "-i", "pipe:0",
+        "-c:a", "pcm_s16le",
+        "-rf64", "auto",
+        output_path
+    ]
+    process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        last = len(edits.source_starts) - 1
+        for index, (start, end) in enumerate(zip(edits.source_starts, edits.source_ends)):
+            first = min(int(round(start * rate)), len(samples))
+            stop = min(int(round(end * rate)), len(samples))
+            for chunk_start in range(first, stop, CHUNK_FRAMES):
+                chunk = np.array(samples[chunk_start:min(chunk_start + CHUNK_FRAMES, stop)])
+                gain = _fade_gain(
+                    chunk_start - first, len(chunk), stop - first, fade,
+                    fade_in=index > 0, fade_out=index < last
+                )
+                if gain is not None:
+                    chunk = (chunk * gain[:, None]).astype(np.int16)
+                process.stdin.write(chunk.tobytes())
+        process.stdin.close()
+    except BrokenPipeError:
+        pass  # FFmpeg exited; its error is reported below
+    finally:
+        stderr = process.stderr.read().decode("utf-8", "replace")
+        process.wait()
+
+    if process.returncode != 0:
+        raise RuntimeError(f"FFmpeg audio trim failed:\n{stderr[-2000:]}")
+    return output_path
+
+
+def _fade_gain(
+    offset: int,
+    count: int,
+    length: int,
+    fade: int,
+    fade_in: bool,
+    fade_out: bool
+) -> Optional[np.ndarray]:
+    """
+    Gain for count frames at offset into a span of length frames, or
+    None when they are clear of both fades.
+    """
+    near_start = fade_in and offset < fade
+    near_end = fade_out and offset + count > length - fade
+    if not (near_start or near_end):
+        return None
+
+    positions = np.arange(offset, offset + count, dtype=np.float32)
+    gain = np.ones(count, dtype=np.float32)
+    if near_start:
+        gain = np.minimum(gain, positions / fade)
+    if near_end:
+        gain = np.minimum(gain, (length - 1 - positions) / fade)
+    return np.clip(gain, 0.0, 1.0)
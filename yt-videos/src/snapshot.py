@@ -0,0 +1,165 @@
+"""
+Timing Snapshots
+
+Renders the exact frame a full render would show at a given time (or a
+contact sheet of several times) in a fraction of a second, for
+checking a line's highlight timing without rendering the video.
+
+Lines are indexed by time once. For each requested time the index
+finds the few lines that can be on screen, plus the run of overlapping
+lines before them: libass places a line clear of the lines still on
+screen when it appears and keeps it there, so those decide where it
+sits. Only these lines are written to a small subtitle file (event
+times stay absolute, so libass decides what is visible exactly as in
+the full render), and FFmpeg burns them onto background frames placed
+at the moments the lines appeared and at the requested time, keeping
+only the last.
+"""
+
+import os
+import tempfile
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+
+from renderer import RenderConfig, VideoRenderer
+from subtitle import SubtitleGenerator
+from timings import WordTiming, WordTimings
+
+
+class LineIndex:
+    """Display lines of a transcript, searchable by time."""
+
+    def __init__(
+        self,
+        generator: SubtitleGenerator,
+        words: Union[WordTimings, Iterable[WordTiming]]
+    ):
+        self.lines = generator._group_words(words)
+        timeline = generator.timeline(words)
+        self.starts = timeline.line_starts
+        # Latest end among each line and those before it, so a line that
+        # stays up while later ones appear is still found
+        self.reach = np.maximum.accumulate(timeline.line_ends)
+
+        # First line of the run of overlapping lines each line belongs to
+        index = np.arange(len(self.lines))
+        alone = np.ones(len(self.lines), dtype=bool)
+        alone[1:] = self.starts[1:] >= self.reach[:-1]
+        self.run_firsts = np.maximum.accumulate(np.where(alone, index, 0))
+
+    def around(self, start: float, end: float) -> List[int]:
+        """
+        Indexes of lines that may be on screen between start and end.
+
+        Args:
+            start: Window start (seconds)
+            end: Window end (seconds)
+
+        Returns:
+            Line indexes, ascending (a superset of the visible lines)
+        """
+        first = int(np.searchsorted(self.reach, int(start * 100), side="right"))
+        last = int(np.searchsorted(self.starts, int(end * 100) + 1, side="left"))
+        return list(range(first, max(first, last)))
+
+    def layout(self, time: float, margin: float) -> List[int]:
+        """
+        Lines that decide the picture at a time: those that may be on
+        screen and the overlapping lines that appeared before them.
+
+        Args:
+            time: Position in seconds
+            margin: Seconds either side to allow for the frame grid
+
+        Returns:
+            Line indexes, ascending
+        """
+        lines = self.around(time - margin, time + margin)
+        if not lines:
+            return []
+        return list(range(int(self.run_firsts[lines[0]]), lines[-1] + 1))
+
+    def appeared(self, lines: List[int]) -> List[float]:
+        """When lines first appear (seconds)."""
+        return [int(self.starts[line]) / 100 for line in lines]
+
+
+class SnapshotRenderer:
+    """
+    Single frames of a karaoke video, rendered on demand.
+    """
+
+    def __init__(
+        self,
+        generator: SubtitleGenerator,
+        words: Union[WordTimings, Iterable[WordTiming]],
+        render_config: Optional[RenderConfig] = None
+    ):
+        """
+        Args:
+            generator: Subtitle generator with the video's settings
+            words: Word timings of the whole video
+            render_config: Render settings (size, fps, background)
+        """
+        self.generator = generator
+        self.renderer = VideoRenderer(render_config)
+        self.index = LineIndex(generator, words)
+
+    def frame(self, time: float, output_path: str) -> str:
+        """
+        Render the frame on screen at a time.
+
+        Args:
+            time: Position in seconds
+            output_path: Image to write (.png or .jpg)
+
+        Returns:
+            Path to the image
+        """
+        return self.contact_sheet([time], output_path, columns=1, scale=1.0)
+
+    def contact_sheet(
+        self,
+        times: List[float],
+        output_path: str,
+        columns: int = 4,
+        scale: float = 0.25
+    ) -> str:
+        """
+        Render the frames at several times, tiled row by row.
+
+        Args:
+            times: Positions in seconds
+            output_path: Image to write (.png or .jpg)
+            columns: Frames per row
+            scale: Size of each frame relative to the video
+
+        Returns:
+            Path to the image
+        """
+        if not times:
+            raise ValueError("no snapshot times given")
+
+        # One frame either side covers rounding to the frame grid
+        margin = 1 / self.renderer.config.fps
+        layouts = [self.index.layout(time, margin) for time in times]
+        selected = sorted({line for lines in layouts for line in lines})
+
+        fd, subtitle_path = tempfile.mkstemp(suffix=".ass")
+        os.close(fd)
+        try:
+            self.generator.generate_lines(
+                [self.index.lines[line] for line in selected],
+                subtitle_path
+            )
+            return self.renderer.render_frames(
+                subtitle_path,
+                output_path,
+                times,
+                columns=columns,
+                scale=scale,
+                history=[self.index.appeared(lines) for lines in layouts]
+            )
+        finally:
+            os.unlink(subtitle_path)
@@ -5,16 +5,19 @@ Generates .ass subtitle files with word-by-word highlighting effects.
 """
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple, Union
 from pathlib import Path
 
+import numpy as np
 
-@dataclass
-class WordTiming:
-    """Single word with timing."""
-    word: str
-    start: float
-    end: float
+from timings import WordTiming, WordTimings
+
+
+# Seconds each line stays on screen after its last word
+LINE_END_BUFFER = 0.3
+
+# Gap between words that starts a new line (seconds)
+PAUSE_THRESHOLD = 0.5
 
 
 @dataclass
@@ -44,6 +47,21 @@ class SubtitleConfig:
     shadow: int = 0
 
 
+@dataclass
+class KaraokeTimeline:
+    """
+    Visual change points of a subtitle file, in centiseconds.
+    
+    Lines appear at line_starts and disappear at line_ends; each word's
+    highlight sweeps from sweep_starts to sweep_ends. Between those
+    points the picture does not change.
+    """
+    line_starts: np.ndarray
+    line_ends: np.ndarray
+    sweep_starts: np.ndarray
+    sweep_ends: np.ndarray
+
+
 class SubtitleGenerator:
     """
     Generates ASS subtitles with karaoke-style word highlighting.
@@ -54,24 +72,34 @@ class SubtitleGenerator:
     
     def generate(
         self, 
-        words: List[WordTiming], 
+        words: Union[WordTimings, Iterable[WordTiming]], 
         output_path: str
     ) -> str:
         """
         Generate ASS subtitle file.
         
         Args:
-            words: List of words with timing
+            words: Word timings (WordTimings, or any iterable of WordTiming)
             output_path: Where to save the .ass file
         
         Returns:
             Path to generated file
         """
-        content = self._build_header()
-        content += self._build_styles()
-        content += self._build_events(words)
-        
-        Path(output_path).write_text(content, encoding='utf-8')
+        words = WordTimings.coerce(words)
+        return self._write(words, self._line_ends(words), output_path)
+    
+    def _write(
+        self,
+        words: WordTimings,
+        line_ends: np.ndarray,
+        output_path: str,
+        offset: float = 0.0
+    ) -> str:
+        """Write header, styles and events through one buffered writer."""
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(self._build_header())
+            f.write(self._build_styles())
+            f.writelines(self._event_lines(words, line_ends, offset))
         return output_path
     
     def _build_header(self) -> str:
@@ -95,116 +123,236 @@ Style: Default,{c.font_name},{c.font_size},{c.normal_color},{c.highlight_color},
 
 """
     
-    def _build_events(self, words: List[WordTiming]) -> str:
-        """Build ASS events (dialogue lines) with karaoke effects."""
-        events = "[Events]\n"
-        events += "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+    def generate_lines(
+        self,
+        lines: List[WordTimings],
+        output_path: str,
+        offset: float = 0.0
+    ) -> str:
+        """
+        Generate an ASS file from already grouped lines.
         
-        # Group words into lines
-        lines = self._group_words(words)
+        Args:
+            lines: Display lines (as returned by _group_words)
+            output_path: Where to save the .ass file
+            offset: Seconds subtracted from every event time (for
+                rendering a slice of the timeline on its own); rounded
+                to whole centiseconds
+        
+        Returns:
+            Path to generated file
+        """
+        words, line_ends = _join_lines(lines)
+        return self._write(words, line_ends, output_path, offset)
+    
+    def _event_lines(
+        self,
+        words: WordTimings,
+        line_ends: np.ndarray,
+        offset: float = 0.0
+    ) -> List[str]:
+        """
+        Build the [Events] section as a list of text lines.
         
-        for line_words in lines:
-            if not line_words:
-                continue
-            
-            # Line timing
-            line_start = line_words[0].start
-            line_end = line_words[-1].end + 0.3  # Small buffer
-            
-            # Build karaoke text
-            karaoke_text = self._build_karaoke_line(line_words, line_start)
-            
-            # Format times
-            start_str = self._format_time(line_start)
-            end_str = self._format_time(line_end)
-            
-            events += f"Dialogue: 0,{start_str},{end_str},Default,,0,0,0,,{karaoke_text}\n"
+        Gaps, \\kf centisecond durations and line times are computed for
+        all words at once; only the final string assembly is per item.
+        Each word's silence before it (within its line) becomes its own
+        \\kf tag when over 10 ms; \\kf values and event times are
+        truncated to whole centiseconds (at least 1 for \\kf).
         
-        return events
+        Args:
+            words: All words, in order
+            line_ends: Exclusive end index of each display line
+            offset: Seconds subtracted from every event time
+        
+        The offset is applied after times are truncated to centiseconds,
+        so a slice shows each line exactly when the full file would.
+        """
+        out = [
+            "[Events]\n",
+            "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n",
+        ]
+        if len(words) == 0:
+            return out
+        
+        line_firsts, gaps, gap_cs, duration_cs = self._karaoke_columns(words, line_ends)
+        starts = words.starts
+        ends = words.ends
+        
+        tokens = [
+            f"{{\\kf{g}}}{{\\kf{d}}}{w}" if has_gap else f"{{\\kf{d}}}{w}"
+            for g, has_gap, d, w in zip(
+                gap_cs.tolist(),
+                (gaps > 0.01).tolist(),
+                duration_cs.tolist(),
+                words.texts()
+            )
+        ]
+        
+        # Line timing
+        offset_cs = int(round(offset * 100))
+        start_strs = self._format_centiseconds(
+            self._centiseconds(starts[line_firsts]) - offset_cs
+        )
+        end_strs = self._format_centiseconds(
+            self._centiseconds(ends[line_ends - 1] + LINE_END_BUFFER) - offset_cs
+        )
+        
+        for start_str, end_str, first, last in zip(
+            start_strs, end_strs, line_firsts.tolist(), line_ends.tolist()
+        ):
+            karaoke_text = " ".join(tokens[first:last])
+            out.append(f"Dialogue: 0,{start_str},{end_str},Default,,0,0,0,,{karaoke_text}\n")
+        
+        return out
     
-    def _group_words(self, words: List[WordTiming]) -> List[List[WordTiming]]:
+    def _karaoke_columns(
+        self,
+        words: WordTimings,
+        line_ends: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
         """
-        Group words into display lines.
+        Per-word karaoke values for non-empty words.
         
-        Groups by:
-        1. Max words per line
-        2. Natural pauses (gaps > 0.5s)
+        Returns:
+            (line_firsts, gaps, gap_cs, duration_cs): index of each line's
+            first word, silence before each word (seconds) and the gap and
+            word \\kf values in centiseconds
         """
-        lines = []
-        current_line = []
+        n = len(words)
+        starts = words.starts
+        ends = words.ends
+        line_firsts = np.empty_like(line_ends)
+        line_firsts[0] = 0
+        line_firsts[1:] = line_ends[:-1]
         
-        for i, word in enumerate(words):
-            current_line.append(word)
-            
-            # Check if we should break
-            should_break = False
-            
-            # Max words reached
-            if len(current_line) >= self.config.max_words_per_line:
-                should_break = True
-            
-            # Natural pause (gap before next word)
-            if i < len(words) - 1:
-                gap = words[i + 1].start - word.end
-                if gap > 0.5:
-                    should_break = True
-            
-            if should_break:
-                lines.append(current_line)
-                current_line = []
+        # Silence before each word: from the previous word's end, or
+        # zero for the first word of a line
+        previous = np.empty(n)
+        previous[0] = starts[0]
+        previous[1:] = ends[:-1]
+        previous[line_firsts] = starts[line_firsts]
+        gaps = starts - previous
         
-        # Don't forget last line
-        if current_line:
-            lines.append(current_line)
+        gap_cs = np.maximum(1, (gaps * 100).astype(np.int64))
+        duration_cs = np.maximum(1, ((ends - starts) * 100).astype(np.int64))
+        return line_firsts, gaps, gap_cs, duration_cs
+    
+    def timeline(
+        self,
+        words: Union[WordTimings, Iterable[WordTiming]]
+    ) -> KaraokeTimeline:
+        """
+        When the rendered picture changes, as generate() would write it.
+        
+        Times are the exact centisecond values in the ASS events, so a
+        renderer can tell static stretches from highlight sweeps.
+        """
+        words = WordTimings.coerce(words)
+        if len(words) == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return KaraokeTimeline(empty, empty, empty, empty)
+        
+        line_ends = self._line_ends(words)
+        line_firsts, gaps, gap_cs, duration_cs = self._karaoke_columns(words, line_ends)
         
-        return lines
+        line_starts = self._centiseconds(words.starts[line_firsts])
+        line_stops = self._centiseconds(words.ends[line_ends - 1] + LINE_END_BUFFER)
+        
+        # Each word's sweep begins after everything before it in the line
+        advance = np.where(gaps > 0.01, gap_cs, 0) + duration_cs
+        elapsed = np.cumsum(advance) - advance
+        line_index = np.repeat(np.arange(len(line_ends)), np.diff(line_ends, prepend=0))
+        elapsed -= elapsed[line_firsts][line_index]
+        sweep_ends = line_starts[line_index] + elapsed + advance
+        
+        return KaraokeTimeline(
+            line_starts=line_starts,
+            line_ends=line_stops,
+            sweep_starts=sweep_ends - duration_cs,
+            sweep_ends=sweep_ends
+        )
     
-    def _build_karaoke_line(
-        self, 
-        words: List[WordTiming], 
-        line_start: float
-    ) -> str:
+    def _line_ends(self, words: WordTimings) -> np.ndarray:
         """
-        Build karaoke text with \\kf tags.
+        Exclusive end index of each display line.
         
-        \\kf = smooth fill karaoke effect
-        Number after \\kf = duration in centiseconds
+        Breaks after a pause (gap > 0.5s) and every max_words_per_line
+        words since the last break.
         """
-        parts = []
-        current_time = line_start
+        n = len(words)
+        if n == 0:
+            return np.empty(0, dtype=np.intp)
         
-        for i, word in enumerate(words):
-            # Gap before word (silence)
-            gap = word.start - current_time
-            if gap > 0.01:  # Only if significant gap
-                gap_cs = max(1, int(gap * 100))
-                parts.append(f"{{\\kf{gap_cs}}}")
-            
-            # Word duration
-            duration = word.end - word.start
-            duration_cs = max(1, int(duration * 100))
-            
-            # Add word with karaoke tag
-            parts.append(f"{{\\kf{duration_cs}}}{word.word}")
-            
-            # Add space (except last word)
-            if i < len(words) - 1:
-                parts.append(" ")
-            
-            current_time = word.end
+        pause = np.zeros(n, dtype=bool)
+        pause[:-1] = (words.starts[1:] - words.ends[:-1]) > PAUSE_THRESHOLD
         
-        return "".join(parts)
+        # Position of each word within its pause-delimited run
+        index = np.arange(n)
+        run_start = np.zeros(n, dtype=np.intp)
+        run_start[1:] = np.where(pause[:-1], index[1:], 0)
+        run_start = np.maximum.accumulate(run_start)
+        position = index - run_start
+        
+        max_words = max(1, self.config.max_words_per_line)
+        breaks = pause | ((position + 1) % max_words == 0)
+        breaks[-1] = True
+        return np.flatnonzero(breaks) + 1
     
-    def _format_time(self, seconds: float) -> str:
+    def _group_words(
+        self,
+        words: Union[WordTimings, Iterable[WordTiming]]
+    ) -> List[WordTimings]:
         """
-        Format time for ASS: H:MM:SS.cc (centiseconds)
+        Group words into display lines.
+        
+        Groups by:
+        1. Max words per line
+        2. Natural pauses (gaps > 0.5s)
+        
+        Returns:
+            One WordTimings view per line
         """
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        centisecs = int((seconds % 1) * 100)
+        words = WordTimings.coerce(words)
+        line_ends = self._line_ends(words).tolist()
+        return [
+            words[first:last]
+            for first, last in zip([0] + line_ends[:-1], line_ends)
+        ]
+    
+    def _time_parts(self, seconds: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """(hours, minutes, secs, centisecs) of times, each truncated."""
+        hours = (seconds // 3600).astype(np.int64)
+        minutes = ((seconds % 3600) // 60).astype(np.int64)
+        secs = (seconds % 60).astype(np.int64)
+        centisecs = ((seconds % 1) * 100).astype(np.int64)
+        return hours, minutes, secs, centisecs
+    
+    def _centiseconds(self, seconds: np.ndarray) -> np.ndarray:
+        """Times as written to the ASS file, in whole centiseconds."""
+        hours, minutes, secs, centisecs = self._time_parts(seconds)
+        return ((hours * 60 + minutes) * 60 + secs) * 100 + centisecs
+    
+    def _format_centiseconds(self, centiseconds: np.ndarray) -> List[str]:
+        """ASS time strings (H:MM:SS.cc) for whole centiseconds."""
+        hours = centiseconds // 360000
+        minutes = centiseconds // 6000 % 60
+        secs = centiseconds // 100 % 60
+        centisecs = centiseconds % 100
         
-        return f"{hours}:{minutes:02d}:{secs:02d}.{centisecs:02d}"
+        return [
+            f"{h}:{m:02d}:{s:02d}.{cs:02d}"
+            for h, m, s, cs in zip(
+                hours.tolist(), minutes.tolist(), secs.tolist(), centisecs.tolist()
+            )
+        ]
+
+
+def _join_lines(lines: List[WordTimings]) -> Tuple[WordTimings, np.ndarray]:
+    """Flatten grouped lines into one container plus line end indexes."""
+    lines = [line for line in lines if len(line)]
+    lengths = np.array([len(line) for line in lines], dtype=np.intp)
+    return WordTimings.concat(lines), np.cumsum(lengths)
 
 
 def create_subtitle_config(
@@ -0,0 +1,287 @@
+"""
+Transcript-to-Whisper Word Alignment
+
+Pairs the words of a known transcript with the words Whisper heard,
+tolerating insertions, deletions and substitutions. Used to put
+Whisper's timings onto the correct script text.
+
+Runs in near-linear time: unique trigrams shared by both sides act as
+anchors, and only the short stretches between anchors are aligned with
+a banded edit-distance pass.
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+
+# Edit costs
+MATCH_COST = 0.0
+NEAR_COST = 0.5   # Similar tokens (shared stem, one contains the other)
+SUB_COST = 1.0
+GAP_COST = 1.0
+
+ANCHOR_NGRAM = 3
+DEFAULT_BAND = 32
+
+
+_ONES = [
+    "zero", "one", "two", "three", "four", "five", "six", "seven", "eight",
+    "nine", "ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen",
+    "sixteen", "seventeen", "eighteen", "nineteen",
+]
+_TENS = [
+    "", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy",
+    "eighty", "ninety",
+]
+_SCALES = [
+    (1_000_000_000, "billion"),
+    (1_000_000, "million"),
+    (1_000, "thousand"),
+    (100, "hundred"),
+]
+_ORDINAL_ENDINGS = {
+    "one": "first", "two": "second", "three": "third", "five": "fifth",
+    "eight": "eighth", "nine": "ninth", "twelve": "twelfth",
+}
+
+_NUMBER_RE = re.compile(
+    r"^(?P<cur>[$£€])?(?P<num>\d[\d,]*)(?:\.(?P<frac>\d+))?"
+    r"(?P<ord>st|nd|rd|th)?(?P<pct>%)?$"
+)
+
+
+def number_to_words(n: int) -> str:
+    """Spell out a non-negative integer (no spaces): 21 -> 'twentyone'."""
+    if n < 20:
+        return _ONES[n]
+    if n < 100:
+        tens, ones = divmod(n, 10)
+        return _TENS[tens] + (_ONES[ones] if ones else "")
+    for value, name in _SCALES:
+        if n >= value:
+            head, rest = divmod(n, value)
+            return number_to_words(head) + name + (number_to_words(rest) if rest else "")
+    return str(n)
+
+
+def _ordinal(words: str) -> str:
+    """Turn a spelled-out cardinal into an ordinal: 'twentyone' -> 'twentyfirst'."""
+    for ending, ordinal in _ORDINAL_ENDINGS.items():
+        if words.endswith(ending):
+            return words[:-len(ending)] + ordinal
+    if words.endswith("y"):
+        return words[:-1] + "ieth"
+    return words + "th"
+
+
+def normalize_token(word: str) -> str:
+    """
+    Normalize a word for comparison.
+
+    Lowercases, drops punctuation and accents, and spells out numbers so
+    that "21st," and "twentyfirst" or "$5" and "five dollars" line up.
+    """
+    w = unicodedata.normalize("NFKD", word)
+    w = "".join(ch for ch in w if not unicodedata.combining(ch)).lower()
+    w = w.strip(".,!?;:\"'()[]{}…“”‘’«»—–-")
+
+    match = _NUMBER_RE.match(w)
+    if match:
+        digits = match.group("num").replace(",", "")
+        if len(digits) <= 12:
+            spoken = number_to_words(int(digits))
+            if match.group("frac"):
+                spoken += "point" + "".join(_ONES[int(d)] for d in match.group("frac"))
+            if match.group("ord"):
+                spoken = _ordinal(spoken)
+            if match.group("pct"):
+                spoken += "percent"
+            if match.group("cur"):
+                spoken += "dollars" if match.group("cur") == "$" else ""
+            return spoken
+
+    return re.sub(r"[\W_]+", "", w)
+
+
+def _sub_cost(a: str, b: str) -> float:
+    """Cost of pairing two normalized tokens."""
+    if a == b:
+        return MATCH_COST
+    if not a or not b:
+        return SUB_COST
+    if a[:4] == b[:4] or (len(a) >= 4 and len(b) >= 4 and (a in b or b in a)):
+        return NEAR_COST
+    return SUB_COST
+
+
+def _find_anchors(ref: List[str], hyp: List[str], n: int = ANCHOR_NGRAM) -> List[Tuple[int, int]]:
+    """
+    Positions (i, j) where an n-gram occurring exactly once on each side
+    starts, reduced to the longest chain increasing in both i and j.
+    """
+    def unique_ngrams(tokens: List[str]) -> Dict[tuple, int]:
+        seen: Dict[tuple, int] = {}
+        for i in range(len(tokens) - n + 1):
+            gram = tuple(tokens[i:i + n])
+            if not all(gram):
+                continue
+            seen[gram] = -1 if gram in seen else i
+        return {g: i for g, i in seen.items() if i >= 0}
+
+    ref_grams = unique_ngrams(ref)
+    hyp_grams = unique_ngrams(hyp)
+    candidates = sorted(
+        (i, hyp_grams[g]) for g, i in ref_grams.items() if g in hyp_grams
+    )
+
+    # Longest strictly increasing subsequence on j (patience sorting)
+    tails: List[int] = []       # index into candidates of chain tail per length
+    parents: List[int] = [-1] * len(candidates)
+    for idx, (_, j) in enumerate(candidates):
+        lo, hi = 0, len(tails)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if candidates[tails[mid]][1] < j:
+                lo = mid + 1
+            else:
+                hi = mid
+        parents[idx] = tails[lo - 1] if lo else -1
+        if lo == len(tails):
+            tails.append(idx)
+        else:
+            tails[lo] = idx
+
+    chain = []
+    idx = tails[-1] if tails else -1
+    while idx >= 0:
+        chain.append(candidates[idx])
+        idx = parents[idx]
+    return chain[::-1]
+
+
+def _banded_align(ref: List[str], hyp: List[str], band: int) -> List[Optional[int]]:
+    """
+    Edit-distance alignment restricted to a band around the diagonal.
+
+    Returns, for each ref token, the index of the hyp token it is paired
+    with (match or substitution), or None if it has no counterpart.
+    """
+    n, m = len(ref), len(hyp)
+    pairs: List[Optional[int]] = [None] * n
+    if n == 0 or m == 0:
+        return pairs
+
+    # Widen the band by the slope so consecutive rows always overlap
+    width = band + m // n + 1
+    inf = float("inf")
+
+    lows: List[int] = []
+    rows: List[List[float]] = []
+    moves: List[bytearray] = []   # 0 = diagonal, 1 = up (ref gap), 2 = left (hyp gap)
+
+    for i in range(n + 1):
+        center = (i * m + n // 2) // n
+        lo = 0 if i == 0 else max(0, center - width)
+        hi = m if i == n else min(m, center + width)
+        row = [inf] * (hi - lo + 1)
+        move = bytearray(hi - lo + 1)
+
+        if i == 0:
+            for k in range(len(row)):
+                row[k] = k * GAP_COST
+                move[k] = 2
+        else:
+            prev_lo = lows[-1]
+            prev = rows[-1]
+            prev_len = len(prev)
+            r = ref[i - 1]
+            for k in range(len(row)):
+                j = lo + k
+                best = inf
+                step = 0
+                pk = j - 1 - prev_lo
+                if j > 0 and 0 <= pk < prev_len:
+                    best = prev[pk] + _sub_cost(r, hyp[j - 1])
+                pk = j - prev_lo
+                if 0 <= pk < prev_len and prev[pk] + GAP_COST < best:
+                    best = prev[pk] + GAP_COST
+                    step = 1
+                if k > 0 and row[k - 1] + GAP_COST < best:
+                    best = row[k - 1] + GAP_COST
+                    step = 2
+                row[k] = best
+                move[k] = step
+
+        lows.append(lo)
+        rows.append(row)
+        moves.append(move)
+
+    # Trace back from (n, m)
+    i, j = n, m
+    while i > 0:
+        step = moves[i][j - lows[i]] if j >= lows[i] else 1
+        if step == 0:
+            pairs[i - 1] = j - 1
+            i -= 1
+            j -= 1
+        elif step == 1:
+            i -= 1
+        else:
+            j -= 1
+
+    return pairs
+
+
+def align_tokens(
+    ref: List[str],
+    hyp: List[str],
+    band: int = DEFAULT_BAND
+) -> List[Optional[int]]:
+    """
+    Align two normalized token sequences.
+
+    Args:
+        ref: Reference tokens (the known transcript)
+        hyp: Hypothesis tokens (what Whisper heard)
+        band: Half-width of the edit-distance band between anchors
+
+    Returns:
+        For each ref token, the paired hyp index or None
+    """
+    pairs: List[Optional[int]] = [None] * len(ref)
+    prev_i, prev_j = 0, 0
+
+    for i, j in _find_anchors(ref, hyp) + [(len(ref), len(hyp))]:
+        gap = _banded_align(ref[prev_i:i], hyp[prev_j:j], band)
+        for k, paired in enumerate(gap):
+            if paired is not None:
+                pairs[prev_i + k] = prev_j + paired
+        if i < len(ref):
+            pairs[i] = j
+        prev_i, prev_j = i + 1, j + 1
+
+    return pairs
+
+
+def align_words(
+    transcript_words: List[str],
+    whisper_words: List[str],
+    band: int = DEFAULT_BAND
+) -> List[Optional[int]]:
+    """
+    Align raw transcript words with raw Whisper words.
+
+    Args:
+        transcript_words: Words of the known script
+        whisper_words: Words recognized by Whisper
+        band: Half-width of the edit-distance band
+
+    Returns:
+        For each transcript word, the index of its Whisper word or None
+    """
+    return align_tokens(
+        [normalize_token(w) for w in transcript_words],
+        [normalize_token(w) for w in whisper_words],
+        band=band
+    )
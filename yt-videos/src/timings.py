@@ -0,0 +1,300 @@
+"""
+Columnar Word Timings
+
+Word timings stored as parallel NumPy arrays (start, end, optional
+probability) plus an interned word table, instead of one Python object
+per word. Slices are views, time lookups are binary searches, and the
+binary form can be loaded without copying.
+"""
+
+import json
+import struct
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+@dataclass
+class WordTiming:
+    """Single word with timing information."""
+    word: str
+    start: float  # seconds
+    end: float    # seconds
+    probability: Optional[float] = None
+
+
+_MAGIC = b"YTWT"
+_VERSION = 1
+
+
+class WordTimings:
+    """
+    Columnar container of word timings.
+
+    Attributes:
+        starts: float64 start times (seconds)
+        ends: float64 end times (seconds)
+        word_ids: int32 indexes into vocab
+        vocab: Interned word table (shared between slices)
+        probabilities: Optional float32 per-word probability
+
+    Indexing with an int returns a WordTiming; indexing with a slice
+    returns a WordTimings view sharing the same arrays.
+    """
+
+    __slots__ = ("starts", "ends", "word_ids", "vocab", "probabilities")
+
+    def __init__(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        word_ids: np.ndarray,
+        vocab: List[str],
+        probabilities: Optional[np.ndarray] = None
+    ):
+        self.starts = starts
+        self.ends = ends
+        self.word_ids = word_ids
+        self.vocab = vocab
+        self.probabilities = probabilities
+
+    # Construction
+
+    @classmethod
+    def empty(cls) -> "WordTimings":
+        return cls.from_lists([], [], [])
+
+    @classmethod
+    def from_lists(
+        cls,
+        words: Sequence[str],
+        starts: Sequence[float],
+        ends: Sequence[float],
+        probabilities: Optional[Sequence[Optional[float]]] = None
+    ) -> "WordTimings":
+        """Build from parallel lists, interning the words."""
+        index: Dict[str, int] = {}
+        vocab: List[str] = []
+        ids = np.empty(len(words), dtype=np.int32)
+        for i, word in enumerate(words):
+            word_id = index.get(word)
+            if word_id is None:
+                word_id = index[word] = len(vocab)
+                vocab.append(word)
+            ids[i] = word_id
+
+        probs = None
+        if probabilities is not None and len(probabilities) == len(words):
+            probs = np.array(
+                [np.nan if p is None else p for p in probabilities],
+                dtype=np.float32
+            )
+
+        return cls(
+            np.asarray(starts, dtype=np.float64),
+            np.asarray(ends, dtype=np.float64),
+            ids,
+            vocab,
+            probs
+        )
+
+    @classmethod
+    def from_words(cls, words: Iterable[WordTiming]) -> "WordTimings":
+        """Build from WordTiming objects."""
+        words = list(words)
+        probs = [w.probability for w in words]
+        return cls.from_lists(
+            [w.word for w in words],
+            [w.start for w in words],
+            [w.end for w in words],
+            probs if any(p is not None for p in probs) else None
+        )
+
+    @classmethod
+    def coerce(cls, words: Union["WordTimings", Iterable[WordTiming]]) -> "WordTimings":
+        """Return words as WordTimings (no copy if it already is one)."""
+        if isinstance(words, WordTimings):
+            return words
+        return cls.from_words(words)
+
+    @classmethod
+    def concat(cls, parts: Sequence["WordTimings"]) -> "WordTimings":
+        """Join several containers in order."""
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            return parts[0]
+        return cls.from_lists(
+            [w for p in parts for w in p.texts()],
+            np.concatenate([p.starts for p in parts]),
+            np.concatenate([p.ends for p in parts]),
+            (
+                np.concatenate([p.probabilities for p in parts])
+                if all(p.probabilities is not None for p in parts) else None
+            )
+        )
+
+    # Sequence protocol
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return WordTimings(
+                self.starts[index],
+                self.ends[index],
+                self.word_ids[index],
+                self.vocab,
+                None if self.probabilities is None else self.probabilities[index]
+            )
+        return WordTiming(
+            word=self.vocab[self.word_ids[index]],
+            start=float(self.starts[index]),
+            end=float(self.ends[index]),
+            probability=self._probability(index)
+        )
+
+    def __iter__(self) -> Iterator[WordTiming]:
+        vocab = self.vocab
+        probs = self.probabilities
+        for i, (word_id, start, end) in enumerate(zip(
+            self.word_ids.tolist(), self.starts.tolist(), self.ends.tolist()
+        )):
+            yield WordTiming(
+                word=vocab[word_id],
+                start=start,
+                end=end,
+                probability=None if probs is None else self._probability(i)
+            )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, WordTimings):
+            return NotImplemented
+        return (
+            self.texts() == other.texts()
+            and np.array_equal(self.starts, other.starts)
+            and np.array_equal(self.ends, other.ends)
+        )
+
+    def __repr__(self) -> str:
+        return f"WordTimings({len(self)} words)"
+
+    def _probability(self, index: int) -> Optional[float]:
+        if self.probabilities is None:
+            return None
+        p = float(self.probabilities[index])
+        return None if np.isnan(p) else p
+
+    # Columns and lookups
+
+    def texts(self) -> List[str]:
+        """Words as a list of strings."""
+        vocab = self.vocab
+        return [vocab[i] for i in self.word_ids.tolist()]
+
+    def text(self, index: int) -> str:
+        """Word at index."""
+        return self.vocab[self.word_ids[index]]
+
+    def range_indices(self, start: float, end: float) -> Tuple[int, int]:
+        """
+        Index range [first, last) of words overlapping [start, end).
+
+        Uses binary search, so words must be in time order.
+        """
+        first = int(np.searchsorted(self.ends, start, side="right"))
+        last = int(np.searchsorted(self.starts, end, side="left"))
+        return first, max(first, last)
+
+    def between(self, start: float, end: float) -> "WordTimings":
+        """Words overlapping [start, end), as a view."""
+        first, last = self.range_indices(start, end)
+        return self[first:last]
+
+    def index_at(self, t: float) -> Optional[int]:
+        """Index of the word being spoken at time t, or None."""
+        i = int(np.searchsorted(self.starts, t, side="right")) - 1
+        if i >= 0 and self.ends[i] >= t:
+            return i
+        return None
+
+    def shifted(self, offset: float) -> "WordTimings":
+        """Copy with all times moved by offset seconds."""
+        return WordTimings(
+            self.starts + offset,
+            self.ends + offset,
+            self.word_ids,
+            self.vocab,
+            self.probabilities
+        )
+
+    def clipped(self, start: float, end: float) -> "WordTimings":
+        """Copy with all times clamped to [start, end]."""
+        return WordTimings(
+            np.clip(self.starts, start, end),
+            np.clip(self.ends, start, end),
+            self.word_ids,
+            self.vocab,
+            self.probabilities
+        )
+
+    # Serialization
+
+    def to_bytes(self) -> bytes:
+        """
+        Binary form: magic, version, header length, JSON header (count,
+        vocab), then raw little-endian arrays, each 8-byte aligned.
+        """
+        header = json.dumps({
+            "count": len(self),
+            "vocab": self.vocab,
+            "probabilities": self.probabilities is not None,
+        }).encode("utf-8")
+        header += b" " * (-(len(header) + 12) % 8)
+
+        parts = [
+            _MAGIC,
+            struct.pack("<II", _VERSION, len(header)),
+            header,
+            np.ascontiguousarray(self.starts, dtype="<f8").tobytes(),
+            np.ascontiguousarray(self.ends, dtype="<f8").tobytes(),
+        ]
+        ids = np.ascontiguousarray(self.word_ids, dtype="<i4").tobytes()
+        parts.append(ids + b"\0" * (-len(ids) % 8))
+        if self.probabilities is not None:
+            parts.append(np.ascontiguousarray(self.probabilities, dtype="<f4").tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data) -> "WordTimings":
+        """
+        Load from to_bytes() output.
+
+        Arrays are read-only views over data (bytes, memoryview or mmap),
+        not copies.
+        """
+        buffer = memoryview(data)
+        if bytes(buffer[:4]) != _MAGIC:
+            raise ValueError("Not a word timings buffer")
+        version, header_len = struct.unpack_from("<II", buffer, 4)
+        if version != _VERSION:
+            raise ValueError(f"Unsupported word timings version: {version}")
+
+        header = json.loads(bytes(buffer[12:12 + header_len]))
+        n = header["count"]
+        offset = 12 + header_len
+
+        starts = np.frombuffer(buffer, dtype="<f8", count=n, offset=offset)
+        offset += 8 * n
+        ends = np.frombuffer(buffer, dtype="<f8", count=n, offset=offset)
+        offset += 8 * n
+        ids = np.frombuffer(buffer, dtype="<i4", count=n, offset=offset)
+        offset += 4 * n + (-4 * n % 8)
+        probs = None
+        if header["probabilities"]:
+            probs = np.frombuffer(buffer, dtype="<f4", count=n, offset=offset)
+
+        return cls(starts, ends, ids, header["vocab"], probs)
@@ -0,0 +1,140 @@
+"""
+Variable Frame Rate Planning
+
+On a plain background the picture only changes when a subtitle line
+appears or disappears and while a word's \\kf highlight sweeps. A frame
+plan keeps the constant-rate frame grid but drops every frame that
+would be identical to the one before it, so static stretches become a
+single long frame and only highlight sweeps are rendered at full rate.
+
+The plan is written as an FFmpeg concat list over a short blank clip:
+each run of kept frames is a slice of the clip, held on screen until
+the next run starts.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from subtitle import KaraokeTimeline
+
+# Length of the blank source clip; longer runs use several slices of it
+CLIP_SECONDS = 2
+
+# Keyframes go on line changes, at most one per this many seconds
+KEYFRAME_MIN_SECONDS = 2
+
+
+@dataclass
+class FramePlan:
+    """Frames of a constant-rate timeline that actually need rendering."""
+    fps: int
+    total_frames: int
+    frames: np.ndarray      # Indexes of kept frames, ascending
+    keyframes: np.ndarray   # Kept frames where a subtitle line appears
+
+    @property
+    def encoded_frames(self) -> int:
+        return len(self.frames)
+
+    def frame_times(self, frames: np.ndarray) -> np.ndarray:
+        """Frame indexes to whole microseconds."""
+        return (np.asarray(frames, dtype=np.int64) * 1_000_000 + self.fps // 2) // self.fps
+
+    def keyframe_times(self) -> List[str]:
+        """Keyframe times in seconds, for -force_key_frames."""
+        return [f"{us / 1e6:.6f}" for us in self.frame_times(self.keyframes).tolist()]
+
+    def write_concat_list(self, path: str, clip_path: str, clip_frames: int) -> str:
+        """
+        Write an ffconcat list that plays this plan from a blank clip.
+
+        Each entry takes up to clip_frames frames from the clip and lasts
+        until the next entry starts, so the last frame of a run is held
+        through the static stretch after it. Durations are whole
+        microseconds on the frame grid, so timestamps never drift.
+
+        Args:
+            path: Where to write the list
+            clip_path: Blank clip with at least clip_frames frames
+            clip_frames: Frames in the clip
+
+        Returns:
+            Path to the list
+        """
+        frames = self.frames
+
+        # Runs of consecutive kept frames, split where longer than the clip
+        run_starts = np.flatnonzero(np.diff(frames, prepend=-2) != 1).tolist()
+        run_ends = run_starts[1:] + [len(frames)]
+        entries = [
+            (start, min(clip_frames, last - start))
+            for first, last in zip(run_starts, run_ends)
+            for start in range(first, last, clip_frames)
+        ]
+
+        first_frames = frames[[start for start, _ in entries]]
+        times = self.frame_times(np.append(first_frames, self.total_frames))
+
+        # Clip timestamps are rounded, so cut half a frame after the last
+        # wanted frame rather than exactly on the next one
+        clip = Path(clip_path).resolve().as_posix()
+        lines = ["ffconcat version 1.0\n"]
+        for (_, length), duration in zip(entries, np.diff(times).tolist()):
+            lines.append(
+                f"file '{clip}'\n"
+                f"outpoint {(length - 0.5) / self.fps:.6f}\n"
+                f"duration {duration / 1e6:.6f}\n"
+            )
+
+        Path(path).write_text("".join(lines), encoding="utf-8")
+        return path
+
+
+def plan_frames(timeline: KaraokeTimeline, duration: float, fps: int) -> FramePlan:
+    """
+    Pick the frames that differ from their predecessor.
+
+    A frame is kept if it is the first or last frame, the first frame at
+    or after a line start/end or sweep start/end, or falls inside a
+    sweep. Frame times are rounded to milliseconds, as libass sees them.
+
+    Args:
+        timeline: Change points from SubtitleGenerator.timeline()
+        duration: Video length in seconds
+        fps: Frame rate of the equivalent constant-rate render
+
+    Returns:
+        FramePlan
+    """
+    total = max(1, int(np.ceil(duration * fps)))
+    frame_ms = (np.arange(total, dtype=np.int64) * 1000 + fps // 2) // fps
+
+    keep = np.zeros(total, dtype=bool)
+    keep[[0, -1]] = True
+
+    # First frame showing each discrete change
+    points = np.concatenate([
+        timeline.line_starts, timeline.line_ends,
+        timeline.sweep_starts, timeline.sweep_ends,
+    ]) * 10
+    changed = np.searchsorted(frame_ms, points, side="left")
+    keep[changed[changed < total]] = True
+
+    # Every frame strictly inside a sweep
+    inside = np.zeros(total + 1, dtype=np.int64)
+    np.add.at(inside, np.searchsorted(frame_ms, timeline.sweep_starts * 10, side="right"), 1)
+    np.add.at(inside, np.searchsorted(frame_ms, timeline.sweep_ends * 10, side="left"), -1)
+    keep |= np.cumsum(inside[:total]) > 0
+
+    frames = np.flatnonzero(keep)
+    line_frames = np.searchsorted(frame_ms, timeline.line_starts * 10, side="left")
+    line_frames = np.unique(line_frames[line_frames < total])
+    _, first_in_bucket = np.unique(
+        line_frames // (KEYFRAME_MIN_SECONDS * fps), return_index=True
+    )
+    keyframes = line_frames[first_in_bucket]
+
+    return FramePlan(fps=fps, total_frames=total, frames=frames, keyframes=keyframes)
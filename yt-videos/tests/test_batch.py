@@ -0,0 +1,97 @@
+import json
+import os
+
+import pytest
+
+from batch import BatchJob, BatchRunner, is_up_to_date, job_settings, load_manifest, settings_path
+
+
+def write_manifest(tmp_path, rows):
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text("\n".join(json.dumps(row) for row in rows), encoding="utf-8")
+    return str(manifest)
+
+
+def test_manifest_resolves_paths_and_defaults(tmp_path):
+    path = write_manifest(tmp_path, [{"audio": "a.mp3", "quality": "high"}])
+    [job] = load_manifest(path, {"format": "long", "quality": "fast"})
+    assert job.audio == str(tmp_path / "a.mp3")
+    assert job.output == str(tmp_path / "a.mp4")
+    assert (job.format, job.quality) == ("long", "high")
+
+
+@pytest.mark.parametrize("row, message", [
+    ({"audio": "b.mp3", "format": "square"}, "row 2 has format 'square'"),
+    ({"audio": "b.mp3", "quality": "ultra"}, "row 2 has quality 'ultra'"),
+    ({"audio": "b.mp3", "font_size": "big"}, "row 2 has font_size 'big'"),
+    ({"format": "short"}, "row 2 has no 'audio'"),
+])
+def test_manifest_rejects_invalid_rows(tmp_path, row, message):
+    path = write_manifest(tmp_path, [{"audio": "a.mp3"}, row])
+    with pytest.raises(ValueError, match=message):
+        load_manifest(path)
+
+
+def test_csv_manifest_is_validated(tmp_path):
+    manifest = tmp_path / "jobs.csv"
+    manifest.write_text("audio,quality\na.mp3,medium\nb.mp3,best\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="row 2 has quality 'best'"):
+        load_manifest(str(manifest))
+
+
+def rendered_job(tmp_path, **fields):
+    audio = tmp_path / "a.mp3"
+    audio.write_bytes(b"audio")
+    job = BatchJob(audio=str(audio), output=str(tmp_path / "a.mp4"), **fields)
+    output = tmp_path / "a.mp4"
+    output.write_bytes(b"video")
+    os.utime(audio, (1000, 1000))
+    settings_path(job).write_text(json.dumps(job_settings(job, vfr=False)))
+    return job
+
+
+def test_up_to_date_with_same_settings(tmp_path):
+    job = rendered_job(tmp_path)
+    assert is_up_to_date(job, job_settings(job, vfr=False))
+
+
+@pytest.mark.parametrize("change", [
+    {"format": "long"},
+    {"quality": "high"},
+    {"color": "cyan"},
+    {"model": "small"},
+])
+def test_changed_job_settings_rerender(tmp_path, change):
+    job = rendered_job(tmp_path)
+    for name, value in change.items():
+        setattr(job, name, value)
+    assert not is_up_to_date(job, job_settings(job, vfr=False))
+
+
+def test_changed_runner_options_rerender(tmp_path):
+    job = rendered_job(tmp_path)
+    assert not is_up_to_date(job, job_settings(job, vfr=True))
+
+
+def test_changed_aligner_options_rerender(tmp_path):
+    job = rendered_job(tmp_path)
+    draft = BatchRunner(aligner_options={"speed": "draft", "cpu_threads": 2})
+    settings_path(job).write_text(json.dumps(draft._settings(job)))
+    assert is_up_to_date(job, draft._settings(job))
+
+    # Thread counts don't change the output, the speed profile does
+    threads = BatchRunner(aligner_options={"speed": "draft", "cpu_threads": 8})
+    assert is_up_to_date(job, threads._settings(job))
+    accurate = BatchRunner(aligner_options={"speed": "accurate", "cpu_threads": 2})
+    assert not is_up_to_date(job, accurate._settings(job))
+
+
+def test_missing_sidecar_or_newer_input_rerenders(tmp_path):
+    job = rendered_job(tmp_path)
+    os.utime(job.audio)  # touched after the render
+    os.utime(job.output, (1000, 1000))
+    assert not is_up_to_date(job, job_settings(job, vfr=False))
+
+    job = rendered_job(tmp_path)
+    settings_path(job).unlink()
+    assert not is_up_to_date(job, job_settings(job, vfr=False))
@@ -0,0 +1,33 @@
+import os
+import time
+
+from cache import SegmentCache
+
+
+def write_segment(tmp_path, name, size):
+    path = tmp_path / name
+    path.write_bytes(b"\0" * size)
+    return str(path)
+
+
+def test_segment_put_evicts_least_recently_used(tmp_path):
+    cache = SegmentCache(str(tmp_path / "segments"), max_size_mb=2.5 / 1024)
+    now = time.time()
+    for age, key in zip([30, 20, 10], ["a", "b", "c"]):
+        stored = cache.put(key, write_segment(tmp_path, f"{key}.mp4", 1024))
+        os.utime(stored, (now - age, now - age))
+
+    # Each store trims the oldest segments back under 2.5 KB
+    cache.put("d", write_segment(tmp_path, "d.mp4", 1024))
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.get("d") is not None
+
+
+def test_segment_put_moves_file(tmp_path):
+    cache = SegmentCache(str(tmp_path / "segments"))
+    source = write_segment(tmp_path, "segment.mp4", 16)
+    stored = cache.put("key", source)
+    assert not os.path.exists(source)
+    assert cache.get("key") == stored
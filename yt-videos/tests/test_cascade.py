@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from aligner import AlignmentResult, AudioAligner
+from cascade import low_confidence_windows, splice
+import models
+from models import ModelRegistry
+from timings import WordTimings
+
+
+def first_pass():
+    return WordTimings.from_lists(
+        ["w0", "w1", "w2", "w3", "w4", "w5"],
+        [0.0, 1.0, 2.0, 3.0, 10.0, 11.0],
+        [0.5, 1.5, 2.5, 3.5, 10.5, 11.5],
+        [0.9, 0.9, 0.2, 0.9, 0.9, 0.3]
+    )
+
+
+def words(texts, starts, ends):
+    return WordTimings.from_lists(texts, starts, ends)
+
+
+def test_windows_edges_sit_in_gaps():
+    windows = low_confidence_windows(first_pass(), 15.0, context=0.5)
+    # The last window runs to the end of the audio
+    assert windows == [(2, 3, 1.75, 2.75), (5, 6, 10.75, 15.0)]
+
+
+def test_nearby_windows_are_merged():
+    windows = low_confidence_windows(first_pass(), 15.0, context=0.5, merge_gap=10.0)
+    assert windows == [(2, 6, 1.75, 15.0)]
+
+
+def test_windows_snap_to_whole_words():
+    # 1.2 s of context reaches into w1 and past w3's end: both are taken whole
+    [window] = low_confidence_windows(first_pass()[:4], 4.0, context=1.2)
+    assert window == (1, 4, 0.75, 4.0)
+
+
+def test_window_at_start_begins_at_zero():
+    timings = WordTimings.from_lists(["a", "b"], [0.2, 3.0], [0.6, 3.5], [0.1, 0.9])
+    assert low_confidence_windows(timings, 5.0, context=0.5) == [(0, 1, 0.0, 1.8)]
+
+
+def test_no_windows_without_unsure_words():
+    assert low_confidence_windows(first_pass(), 15.0, threshold=0.1) == []
+    unknown = words(["a"], [0.0], [1.0])
+    assert low_confidence_windows(unknown, 2.0) == []
+    assert low_confidence_windows(WordTimings.empty(), 2.0) == []
+
+
+def test_splice_replaces_window_words():
+    windows = low_confidence_windows(first_pass(), 15.0, context=0.5)
+    spliced = splice(first_pass(), windows, [
+        words(["x", "y"], [1.8, 2.2], [2.1, 2.7]),
+        words(["z"], [11.0], [11.4]),
+    ])
+    assert spliced.texts() == ["w0", "w1", "x", "y", "w3", "w4", "z"]
+    assert np.all(np.diff(spliced.starts) >= 0)
+
+
+def test_splice_keeps_words_for_empty_replacement():
+    windows = low_confidence_windows(first_pass(), 15.0, context=0.5)
+    spliced = splice(first_pass(), windows, [WordTimings.empty(), words(["z"], [11.0], [11.4])])
+    assert spliced.texts() == ["w0", "w1", "w2", "w3", "w4", "z"]
+
+    assert splice(first_pass(), windows, [WordTimings.empty()] * 2) == first_pass()
+
+
+class ClipModel:
+    """Stub cascade model: two words per clip, the last ending past the clip."""
+
+    def transcribe(self, samples, **options):
+        length = len(samples) / 16000
+        segment = SimpleNamespace(words=[
+            SimpleNamespace(word=" x", start=0.0, end=length / 2, probability=0.9),
+            SimpleNamespace(word=" y", start=length / 2, end=length + 0.8, probability=0.9),
+        ])
+        return iter([segment]), SimpleNamespace(language="en")
+
+
+@pytest.fixture
+def cascade_aligner(monkeypatch):
+    registry = ModelRegistry()
+    registry.register(ClipModel(), "clip-stub")
+    monkeypatch.setattr(models, "_registry", registry)
+    aligner = AudioAligner(model_size="clip-stub", cascade_model="clip-stub", language="en")
+    monkeypatch.setattr(aligner, "_samples", lambda path: np.zeros(15 * 16000, dtype=np.float32))
+    return aligner
+
+
+def test_escalated_words_stay_inside_their_window(cascade_aligner):
+    result = AlignmentResult(words=first_pass(), duration=15.0, transcript="", language="en")
+    escalated = cascade_aligner._escalate("audio.wav", result, {"language": "en"})
+
+    # Windows are 0.75..6.75 and 6.75..15; the stub ends each window's
+    # last word 0.8 s past it, which is clamped to the window
+    assert escalated.words.texts() == ["w0", "x", "y", "x", "y"]
+    np.testing.assert_allclose(escalated.words.starts, [0.0, 0.75, 3.75, 6.75, 10.875])
+    np.testing.assert_allclose(escalated.words.ends, [0.5, 3.75, 6.75, 10.875, 15.0])
+    assert escalated.cascade.windows == 2
@@ -0,0 +1,102 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from governor import ALIGN_MAX_THREADS, RENDER_MAX_THREADS, ResourceGovernor
+
+
+@pytest.fixture
+def governor(tmp_path):
+    return ResourceGovernor(cores=8, memory_mb=4000, ledger_path=str(tmp_path / "g.json"))
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_leases_add_up_and_release(governor):
+    first = governor.try_acquire("align", 4, memory_mb=1000)
+    second = governor.try_acquire("render", 4, memory_mb=1000)
+    assert (first.cores, second.cores) == (4, 4)
+    assert governor.usage() == (8, 2000)
+
+    governor.release(first)
+    assert governor.usage() == (4, 1000)
+
+
+def test_refuses_oversubscribed_cores(governor):
+    governor.try_acquire("align", 6)
+    assert governor.try_acquire("render", 4) is None
+    assert governor.usage() == (6, 0)
+
+
+def test_refuses_oversubscribed_memory(governor):
+    governor.try_acquire("align", 1, memory_mb=3000)
+    assert governor.try_acquire("render", 1, memory_mb=1500) is None
+
+
+def test_request_is_capped_at_budget(governor):
+    lease = governor.try_acquire("render", 64, memory_mb=99999)
+    assert (lease.cores, lease.memory_mb) == (8, 4000)
+
+
+def test_min_cores_takes_partial_grant(governor):
+    governor.try_acquire("align", 5)
+    lease = governor.try_acquire("render", 4, min_cores=2)
+    assert lease.cores == 3
+    assert governor.try_acquire("render", 4, min_cores=2) is None
+
+
+def test_shared_between_instances(governor, tmp_path):
+    other = ResourceGovernor(cores=8, memory_mb=4000, ledger_path=str(tmp_path / "g.json"))
+    governor.try_acquire("align", 8)
+    assert other.try_acquire("render", 1) is None
+
+
+def test_leases_of_dead_processes_are_pruned(governor, tmp_path):
+    ledger = tmp_path / "g.json"
+    ledger.write_text(json.dumps([{
+        "id": "stale",
+        "kind": "render",
+        "cores": 8,
+        "memory_mb": 4000,
+        "pid": dead_pid(),
+        "since": 0.0,
+    }]))
+
+    assert governor.usage() == (0, 0)
+    lease = governor.try_acquire("align", 8)
+    assert lease.cores == 8
+    assert [entry["pid"] for entry in json.loads(ledger.read_text())] == [os.getpid()]
+
+
+def test_lease_times_out(governor):
+    governor.try_acquire("align", 8)
+    with pytest.raises(TimeoutError):
+        with governor.lease("render", 1, timeout=0):
+            pass
+
+
+def test_lease_context_releases(governor):
+    with governor.lease("render", 8) as lease:
+        assert lease.cores == 8
+    assert governor.usage() == (0, 0)
+
+
+@pytest.mark.parametrize("cores, jobs, expected", [
+    (8, (1, 1), (4, 4)),
+    (32, (1, 1), (ALIGN_MAX_THREADS, RENDER_MAX_THREADS)),
+    (12, (1, 2), (4, 4)),
+    (4, (1, 0), (4, 0)),
+    (64, (1, 0), (ALIGN_MAX_THREADS, 0)),
+    (2, (2, 2), (1, 1)),
+    (6, (0, 2), (0, 3)),
+])
+def test_split(tmp_path, cores, jobs, expected):
+    governor = ResourceGovernor(cores=cores, ledger_path=str(tmp_path / "g.json"))
+    assert governor.split(*jobs) == expected
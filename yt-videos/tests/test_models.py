@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+import models
+from models import ModelRegistry, estimate_model_mb
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Record every model load; loaded models are (size, compute_type, kwargs)."""
+    calls = []
+
+    def load(model_size, device, compute_type, **kwargs):
+        calls.append((model_size, compute_type, kwargs))
+        time.sleep(0.05)
+        return (model_size, compute_type, kwargs)
+
+    monkeypatch.setattr(models, "_load_whisper_model", load)
+    return calls
+
+
+def test_get_loads_once_and_reuses(loads):
+    registry = ModelRegistry(memory_budget_mb=4096)
+    first = registry.get("base", compute_type="int8")
+    assert registry.get("base", compute_type="int8") is first
+    assert len(loads) == 1
+    assert registry.memory_mb == estimate_model_mb("base", "int8")
+
+
+def test_key_separates_compute_type_and_options(loads):
+    registry = ModelRegistry(memory_budget_mb=4096)
+    registry.get("base", compute_type="int8")
+    registry.get("base", compute_type="float32")
+    registry.get("base", compute_type="int8", cpu_threads=4)
+    registry.get("base", compute_type="int8", cpu_threads=4)
+    assert len(loads) == 3
+    assert len(registry.loaded()) == 3
+
+
+def test_least_recently_used_model_is_evicted(loads):
+    # At int8 base is 74 MB, tiny 39 MB and small 244 MB: all three
+    # don't fit in 330 MB, so the least recently used one (tiny) goes
+    registry = ModelRegistry(memory_budget_mb=330)
+    registry.get("base", compute_type="int8")
+    registry.get("tiny", compute_type="int8")
+    registry.get("base", compute_type="int8")
+    registry.get("small", compute_type="int8")
+
+    assert [key[0] for key in registry.loaded()] == ["base", "small"]
+    assert registry.memory_mb <= 330
+
+
+def test_requested_model_is_kept_over_budget(loads):
+    registry = ModelRegistry(memory_budget_mb=10)
+    model = registry.get("small", compute_type="int8")
+    assert registry.get("small", compute_type="int8") is model
+    assert len(loads) == 1
+
+
+def test_registered_model_is_returned_without_loading(loads):
+    registry = ModelRegistry()
+    stub = object()
+    registry.register(stub, "base", compute_type="int8")
+    assert registry.get("base", compute_type="int8") is stub
+    assert loads == []
+
+
+def test_concurrent_gets_load_once(loads):
+    registry = ModelRegistry(memory_budget_mb=4096)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def get():
+        barrier.wait()
+        results.append(registry.get("base", compute_type="int8"))
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert len(results) == 8
+    assert all(result is results[0] for result in results)
+    assert registry._loading == {}
+
+
+def test_failed_load_can_be_retried(monkeypatch):
+    attempts = []
+
+    def load(model_size, device, compute_type, **kwargs):
+        attempts.append(model_size)
+        if len(attempts) == 1:
+            raise RuntimeError("download failed")
+        return object()
+
+    monkeypatch.setattr(models, "_load_whisper_model", load)
+    registry = ModelRegistry()
+    with pytest.raises(RuntimeError):
+        registry.get("base")
+    assert registry._loading == {}
+    assert registry.get("base") is not None
+    assert len(attempts) == 2
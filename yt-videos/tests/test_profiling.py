@@ -0,0 +1,25 @@
+import profiling
+from profiling import Profiler
+
+
+def test_stages_are_recorded():
+    profiler = Profiler()
+    with profiler.stage("align", audio_seconds=10.0) as stats:
+        stats.extra["words"] = 3
+    [stage] = profiler.stages
+    assert stage.name == "align"
+    assert stage.extra == {"words": 3}
+    assert stage.real_time_factor == stage.wall_seconds / 10.0
+
+
+def test_peak_rss_is_reset_only_when_asked(monkeypatch):
+    resets = []
+    monkeypatch.setattr(profiling, "_reset_peak_rss", lambda: resets.append(1) or False)
+
+    with Profiler(reset_peak_rss=False).stage("render"):
+        pass
+    assert resets == []
+
+    with Profiler().stage("render"):
+        pass
+    assert resets == [1]
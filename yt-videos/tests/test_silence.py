@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from silence import EditList, compress_silences, plan_silence_cuts
+from timings import WordTimings
+
+
+def words(*spans, probabilities=None):
+    return WordTimings.from_lists(
+        [f"w{index}" for index in range(len(spans))],
+        [start for start, _ in spans],
+        [end for _, end in spans],
+        probabilities
+    )
+
+
+def test_cuts_leading_middle_and_trailing_silence():
+    edits = plan_silence_cuts(words((1.0, 2.0), (5.0, 6.0)), duration=10.0, max_pause=1.0)
+
+    # Leading and trailing silence keep half the pause, inner pauses all of it
+    np.testing.assert_allclose(edits.source_starts, [0.5, 4.5])
+    np.testing.assert_allclose(edits.source_ends, [2.5, 6.5])
+    np.testing.assert_allclose(edits.output_starts, [0.0, 2.0])
+    assert edits.duration == pytest.approx(4.0)
+    assert edits.removed == pytest.approx(6.0)
+
+
+def test_recording_starting_and_ending_with_speech():
+    edits = plan_silence_cuts(words((0.0, 2.0), (5.0, 6.0)), duration=6.0, max_pause=1.0)
+    np.testing.assert_allclose(edits.source_starts, [0.0, 4.5])
+    np.testing.assert_allclose(edits.source_ends, [2.5, 6.0])
+
+
+def test_short_pauses_are_kept():
+    # 0.5 s inner pause, 0.2 s trailing; only the leading 1.5 s is cut
+    edits = plan_silence_cuts(words((1.5, 2.0), (2.5, 3.0)), duration=3.2, max_pause=1.0)
+    np.testing.assert_allclose(edits.source_starts, [1.0])
+    np.testing.assert_allclose(edits.source_ends, [3.2])
+
+
+def test_pause_just_over_maximum_is_not_cut():
+    edits = plan_silence_cuts(words((0.0, 1.0), (2.03, 3.0)), duration=3.0, max_pause=1.0)
+    assert len(edits.source_starts) == 1
+    assert edits.removed == 0.0
+
+
+def test_overlapping_words_do_not_open_a_pause():
+    edits = plan_silence_cuts(words((0.0, 4.0), (1.0, 2.0), (4.2, 5.0)), duration=5.0, max_pause=1.0)
+    assert edits.removed == 0.0
+
+
+@pytest.mark.parametrize("duration", [0.0, 3.0])
+def test_no_words_cuts_nothing(duration):
+    edits = plan_silence_cuts(words(), duration=duration, max_pause=1.0)
+    assert len(edits.source_starts) == 1
+    assert edits.duration == duration
+
+
+def test_to_output_and_to_source_are_inverses():
+    edits = plan_silence_cuts(words((1.0, 2.0), (5.0, 6.0)), duration=10.0, max_pause=1.0)
+
+    # Spans are half-open: a span's end is the same output time as the
+    # next span's start, which maps back to the later one
+    kept = np.concatenate([
+        np.linspace(start, end, 6, endpoint=False)
+        for start, end in zip(edits.source_starts, edits.source_ends)
+    ] + [edits.source_ends[-1:]])
+    np.testing.assert_allclose(edits.to_source(edits.to_output(kept)), kept)
+
+    output = np.linspace(0.0, edits.duration, 17)
+    np.testing.assert_allclose(edits.to_output(edits.to_source(output)), output)
+
+
+def test_times_inside_a_cut_land_on_the_join():
+    edits = plan_silence_cuts(words((1.0, 2.0), (5.0, 6.0)), duration=10.0, max_pause=1.0)
+    np.testing.assert_allclose(edits.to_output([0.2, 3.0, 4.4, 9.0]), [0.0, 2.0, 2.0, 4.0])
+
+
+def test_apply_keeps_words_and_probabilities():
+    source = words((1.0, 2.0), (5.0, 6.0), probabilities=[0.9, 0.4])
+    compressed, edits = compress_silences(source, duration=10.0, max_pause=1.0)
+
+    np.testing.assert_allclose(compressed.starts, [0.5, 2.5])
+    np.testing.assert_allclose(compressed.ends, [1.5, 3.5])
+    assert [word.word for word in compressed] == ["w0", "w1"]
+    np.testing.assert_allclose(compressed.probabilities, source.probabilities)
+    np.testing.assert_allclose(edits.to_source(compressed.starts), source.starts)
+
+
+def test_save_and_load(tmp_path):
+    edits = plan_silence_cuts(words((1.0, 2.0), (5.0, 6.0)), duration=10.0, max_pause=1.0)
+    path = edits.save(str(tmp_path / "edits.json"))
+    loaded = EditList.load(path)
+
+    np.testing.assert_allclose(loaded.source_starts, edits.source_starts)
+    np.testing.assert_allclose(loaded.source_ends, edits.source_ends)
+    np.testing.assert_allclose(loaded.output_starts, edits.output_starts)
+    assert loaded.source_duration == edits.source_duration
+    assert loaded.duration == pytest.approx(edits.duration)
@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from subtitle import SubtitleGenerator, SubtitleConfig
+from timings import WordTiming, WordTimings
+
+
+# The original word-by-word implementation, kept as the reference the
+# vectorized event builder must reproduce exactly
+
+def reference_format_time(seconds):
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    secs = int(seconds % 60)
+    centisecs = int((seconds % 1) * 100)
+    return f"{hours}:{minutes:02d}:{secs:02d}.{centisecs:02d}"
+
+
+def reference_group_words(words, max_words):
+    lines, current = [], []
+    for i, word in enumerate(words):
+        current.append(word)
+        should_break = len(current) >= max_words
+        if i < len(words) - 1 and words[i + 1].start - word.end > 0.5:
+            should_break = True
+        if should_break:
+            lines.append(current)
+            current = []
+    if current:
+        lines.append(current)
+    return lines
+
+
+def reference_karaoke_line(words, line_start):
+    parts = []
+    current_time = line_start
+    for i, word in enumerate(words):
+        gap = word.start - current_time
+        if gap > 0.01:
+            parts.append(f"{{\\kf{max(1, int(gap * 100))}}}")
+        parts.append(f"{{\\kf{max(1, int((word.end - word.start) * 100))}}}{word.word}")
+        if i < len(words) - 1:
+            parts.append(" ")
+        current_time = word.end
+    return "".join(parts)
+
+
+def reference_events(words, max_words):
+    events = [
+        "[Events]\n",
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n",
+    ]
+    for line in reference_group_words(words, max_words):
+        start = reference_format_time(line[0].start)
+        end = reference_format_time(line[-1].end + 0.3)
+        text = reference_karaoke_line(line, line[0].start)
+        events.append(f"Dialogue: 0,{start},{end},Default,,0,0,0,,{text}\n")
+    return events
+
+
+def random_words(seed, count):
+    rng = random.Random(seed)
+    words, t = [], rng.uniform(0, 2)
+    for i in range(count):
+        duration = rng.choice([0.004, 0.05, 0.2, 0.37, 0.8])
+        words.append(WordTiming(f"w{i % 50}", round(t, 3), round(t + duration, 3)))
+        t += duration + rng.choice([0.0, 0.005, 0.011, 0.1, 0.49, 0.51, 1.5, 70.0])
+    return words
+
+
+def events_of(generator, words):
+    words = WordTimings.coerce(words)
+    return generator._event_lines(words, generator._line_ends(words))
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("max_words", [1, 3, 5])
+def test_events_match_reference(seed, max_words):
+    words = random_words(seed, 400)
+    generator = SubtitleGenerator(SubtitleConfig(max_words_per_line=max_words))
+    assert events_of(generator, words) == reference_events(words, max_words)
+
+
+def test_hour_long_times_match_reference():
+    words = [WordTiming("late", 3599.995, 3600.27), WordTiming("later", 7322.5, 7323.1)]
+    generator = SubtitleGenerator()
+    assert events_of(generator, words) == reference_events(
+        words, generator.config.max_words_per_line
+    )
+
+
+def test_empty_words_give_only_the_header():
+    assert events_of(SubtitleGenerator(), []) == reference_events([], 4)
+
+
+def test_generate_writes_reference_events(tmp_path):
+    words = random_words(9, 50)
+    generator = SubtitleGenerator()
+    path = generator.generate(words, str(tmp_path / "out.ass"))
+    text = open(path, encoding="utf-8").read()
+    expected = reference_events(words, generator.config.max_words_per_line)
+    assert text.endswith("".join(expected))
+
+
+def test_slice_events_are_shifted_full_events(tmp_path):
+    words = random_words(3, 60)
+    generator = SubtitleGenerator()
+    lines = generator._group_words(words)
+
+    full = [e for e in events_of(generator, words) if e.startswith("Dialogue")]
+    path = generator.generate_lines(lines[4:], str(tmp_path / "slice.ass"), offset=10.0)
+    sliced = [
+        line for line in open(path, encoding="utf-8") if line.startswith("Dialogue")
+    ]
+
+    def times(event):
+        start, end = event.split(",")[1:3]
+        return [
+            int(h) * 360000 + int(m) * 6000 + round(float(s) * 100)
+            for h, m, s in (t.split(":") for t in (start, end))
+        ]
+
+    assert len(sliced) == len(full) - 4
+    for whole, part in zip(full[4:], sliced):
+        assert [t - 1000 for t in times(whole)] == times(part)
+        assert whole.split(",", 9)[9] == part.split(",", 9)[9]
@@ -0,0 +1,139 @@
+import random
+
+import pytest
+
+from textalign import align_tokens, align_words, normalize_token, number_to_words
+
+
+def paired(pairs):
+    return [j for j in pairs if j is not None]
+
+
+def assert_monotonic(pairs):
+    hyp = paired(pairs)
+    assert hyp == sorted(set(hyp))
+
+
+@pytest.mark.parametrize("word, expected", [
+    ("Hello,", "hello"),
+    ('"Wait!"', "wait"),
+    ("Café", "cafe"),
+    ("twenty-one", "twentyone"),
+    ("21", "twentyone"),
+    ("100", "onehundred"),
+    ("1,000", "onethousand"),
+    ("2024", "twothousandtwentyfour"),
+    ("3.14", "threepointonefour"),
+    ("50%", "fiftypercent"),
+    ("$5", "fivedollars"),
+    ("€5", "five"),
+    ("1st", "first"),
+    ("2nd", "second"),
+    ("3rd", "third"),
+    ("12th", "twelfth"),
+    ("21st,", "twentyfirst"),
+    ("90th", "ninetieth"),
+    ("...", ""),
+])
+def test_normalize_token(word, expected):
+    assert normalize_token(word) == expected
+
+
+def test_number_to_words_large():
+    assert number_to_words(1_000_000) == "onemillion"
+    assert number_to_words(1_234_567_890) == (
+        "onebilliontwohundredthirtyfourmillionfivehundredsixtyseventhousand"
+        "eighthundredninety"
+    )
+
+
+def test_overlong_numbers_are_left_as_digits():
+    assert normalize_token("1234567890123") == "1234567890123"
+
+
+def test_empty_inputs():
+    assert align_words([], []) == []
+    assert align_words([], ["hello"]) == []
+    assert align_words(["hello", "world"], []) == [None, None]
+
+
+def test_identical():
+    words = "the best part is no part".split()
+    assert align_words(words, words) == list(range(len(words)))
+
+
+def test_insertion_in_whisper_output():
+    pairs = align_words("the quick brown fox".split(), "the quick red brown fox".split())
+    assert pairs == [0, 1, 3, 4]
+
+
+def test_deletion_from_whisper_output():
+    pairs = align_words("the quick brown fox".split(), "the brown fox".split())
+    assert pairs == [0, None, 1, 2]
+
+
+def test_substitution_keeps_position():
+    pairs = align_words("we met in paris today".split(), "we met in parrot today".split())
+    assert pairs == [0, 1, 2, 3, 4]
+
+
+def test_numerals_match_spoken_forms():
+    pairs = align_words(
+        "It cost 5 dollars on the 21st".split(),
+        "it cost five dollars on the twenty-first".split()
+    )
+    assert pairs == [0, 1, 2, 3, 4, 5, 6]
+
+
+def test_numerals_split_across_words():
+    pairs = align_words(
+        "I paid $5 on the 21st of May".split(),
+        "i paid five dollars on the twenty first of may".split()
+    )
+    assert pairs[:2] == [0, 1]
+    assert pairs[3:5] == [4, 5]
+    assert pairs[-2:] == [8, 9]
+    assert_monotonic(pairs)
+
+
+def test_repeated_phrases_stay_monotonic():
+    ref = "no part no part no part the best part".split()
+    hyp = "no part no no part the best part".split()
+    pairs = align_words(ref, hyp)
+    assert_monotonic(pairs)
+    assert pairs[-3:] == [5, 6, 7]
+
+
+def test_long_input_with_edits():
+    rng = random.Random(7)
+    vocab = [f"word{i}" for i in range(400)]
+    ref = [rng.choice(vocab) for _ in range(5000)]
+
+    # Whisper output: random deletions, insertions and substitutions
+    hyp, origin = [], []
+    for i, token in enumerate(ref):
+        roll = rng.random()
+        if roll < 0.03:
+            continue
+        if roll < 0.06:
+            hyp.append("uh")
+            origin.append(None)
+        hyp.append("wrongword" if roll > 0.97 else token)
+        origin.append(i)
+
+    pairs = align_tokens(ref, hyp)
+
+    assert len(pairs) == len(ref)
+    assert_monotonic(pairs)
+    correct = sum(
+        1 for i, j in enumerate(pairs)
+        if j is not None and origin[j] == i
+    )
+    assert correct / len(ref) > 0.9
+
+
+def test_narrow_band_still_monotonic():
+    ref = "a b c d e f g h i j".split()
+    hyp = "x x x x x a b c d e f g h i j".split()
+    pairs = align_tokens(ref, hyp, band=1)
+    assert_monotonic(pairs)
@@ -0,0 +1,173 @@
+import mmap
+
+import numpy as np
+import pytest
+
+from timings import WordTiming, WordTimings
+
+
+def sample(probabilities=True):
+    return WordTimings.from_lists(
+        ["the", "best", "part", "is", "no", "part"],
+        [0.0, 0.5, 1.0, 2.0, 2.5, 3.0],
+        [0.4, 0.9, 1.5, 2.3, 2.9, 3.6],
+        [0.9, None, 0.8, 0.7, 0.6, 0.5] if probabilities else None
+    )
+
+
+def test_from_lists_interns_words():
+    words = sample()
+    assert words.vocab == ["the", "best", "part", "is", "no"]
+    assert words.word_ids.tolist() == [0, 1, 2, 3, 4, 2]
+    assert words.texts() == ["the", "best", "part", "is", "no", "part"]
+
+
+def test_items_and_iteration_match():
+    words = sample()
+    assert words[1] == WordTiming("best", 0.5, 0.9, None)
+    assert words[2].probability == pytest.approx(0.8)
+    assert list(words)[1] == words[1]
+    assert [w.word for w in words] == words.texts()
+
+
+def test_from_words_roundtrip():
+    words = sample()
+    assert WordTimings.from_words(list(words)) == words
+    assert WordTimings.coerce(words) is words
+
+
+def test_slices_are_views():
+    words = sample()
+    view = words[2:4]
+    assert len(view) == 2
+    assert view.texts() == ["part", "is"]
+    assert view.vocab is words.vocab
+    assert np.shares_memory(view.starts, words.starts)
+    assert view[0] == words[2]
+
+
+def test_empty():
+    empty = WordTimings.empty()
+    assert len(empty) == 0
+    assert list(empty) == []
+    assert empty.range_indices(0, 10) == (0, 0)
+    assert empty.index_at(1.0) is None
+    assert WordTimings.from_bytes(empty.to_bytes()) == empty
+
+
+@pytest.mark.parametrize("start, end, expected", [
+    (0.0, 0.5, (0, 1)),      # end is exclusive: "best" starts at 0.5
+    (0.4, 0.6, (1, 2)),      # a word ending exactly at start is excluded
+    (0.45, 0.6, (1, 2)),
+    (1.6, 1.9, (3, 3)),      # a gap between words
+    (-5.0, 0.1, (0, 1)),
+    (3.5, 100.0, (5, 6)),
+    (10.0, 20.0, (6, 6)),
+    (0.0, 100.0, (0, 6)),
+])
+def test_range_indices_boundaries(start, end, expected):
+    assert sample().range_indices(start, end) == expected
+
+
+def test_between_is_a_view_of_the_range():
+    words = sample()
+    assert words.between(0.95, 2.1).texts() == ["part", "is"]
+    assert len(words.between(1.6, 1.9)) == 0
+
+
+@pytest.mark.parametrize("t, expected", [
+    (-1.0, None),
+    (0.0, 0),
+    (0.4, 0),       # ends are inclusive
+    (0.45, None),   # between words
+    (0.5, 1),
+    (3.6, 5),
+    (3.7, None),
+])
+def test_index_at(t, expected):
+    assert sample().index_at(t) == expected
+
+
+def test_shifted():
+    words = sample()
+    moved = words.shifted(10.0)
+    assert moved.starts.tolist() == [s + 10.0 for s in words.starts.tolist()]
+    assert words.starts[0] == 0.0
+
+
+def test_clipped():
+    words = sample().clipped(0.45, 3.0)
+    assert words.starts.tolist() == [0.45, 0.5, 1.0, 2.0, 2.5, 3.0]
+    assert words.ends.tolist() == [0.45, 0.9, 1.5, 2.3, 2.9, 3.0]
+    assert words.texts() == sample().texts()
+
+
+def test_concat():
+    words = sample()
+    joined = WordTimings.concat([words[:2], WordTimings.empty(), words[2:]])
+    assert joined == words
+    assert joined.probabilities[2] == pytest.approx(0.8)
+
+    # Probabilities are dropped unless every part has them
+    mixed = WordTimings.concat([words[:2], sample(probabilities=False)[2:]])
+    assert mixed.texts() == words.texts()
+    assert mixed.probabilities is None
+
+    assert len(WordTimings.concat([])) == 0
+    assert WordTimings.concat([words]) is words
+
+
+@pytest.mark.parametrize("probabilities", [True, False])
+def test_bytes_roundtrip(probabilities):
+    words = sample(probabilities)
+    loaded = WordTimings.from_bytes(words.to_bytes())
+    assert loaded == words
+    assert loaded.vocab == words.vocab
+    assert loaded.word_ids.tolist() == words.word_ids.tolist()
+    if probabilities:
+        np.testing.assert_array_equal(loaded.probabilities, words.probabilities)
+        assert loaded[1].probability is None
+    else:
+        assert loaded.probabilities is None
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 7])
+def test_bytes_alignment(count):
+    # Odd word counts need padding after the 4-byte ids
+    words = WordTimings.from_lists(
+        [f"w{i}" for i in range(count)],
+        np.arange(count, dtype=float),
+        np.arange(count, dtype=float) + 0.5,
+        [0.5] * count
+    )
+    data = words.to_bytes()
+    # The float32 probabilities, last in the buffer, start 8-byte aligned
+    assert (len(data) - 4 * count) % 8 == 0
+    assert WordTimings.from_bytes(data) == words
+
+
+def test_roundtrip_of_a_slice():
+    words = sample()[1:4]
+    assert WordTimings.from_bytes(words.to_bytes()) == words
+
+
+def test_from_bytes_over_mmap(tmp_path):
+    path = tmp_path / "words.bin"
+    path.write_bytes(sample().to_bytes())
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        loaded = WordTimings.from_bytes(mapped)
+        assert loaded == sample()
+        assert not loaded.starts.flags.writeable
+        del loaded
+        mapped.close()
+
+
+def test_from_bytes_rejects_other_data():
+    with pytest.raises(ValueError, match="Not a word timings buffer"):
+        WordTimings.from_bytes(b"JUNK" + b"\0" * 16)
+
+    data = bytearray(sample().to_bytes())
+    data[4] = 99
+    with pytest.raises(ValueError, match="Unsupported word timings version"):
+        WordTimings.from_bytes(bytes(data))